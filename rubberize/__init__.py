@@ -6,6 +6,7 @@ from rubberize.config import config
 
 from rubberize.latexer import (
     latexer,
+    LatexTemplate,
     ExprLatex,
     StmtLatex,
     register_block_converter,
@@ -17,16 +18,37 @@ from rubberize.render import render
 
 from rubberize.calcsheet import CalcSheet
 
-from rubberize.jupyter.export_notebook import export_notebook
+from rubberize.batch import render_batch
 
-try:
+# Imported on first access, so that `import rubberize` (and with it the
+# CLI) does not import IPython or Pint. The names are not available if
+# the requirement in the comment is missing.
+_lazy_attrs = {
+    "build_script": "rubberize.builder",
+    "clear_export_cache": "rubberize.jupyter.export_notebook",
+    "export_notebook": "rubberize.jupyter.export_notebook",
     # requires Jupyter
-    from rubberize.jupyter.ipython_extension import load_ipython_extension
-except ImportError:
-    pass
-
-try:
+    "load_ipython_extension": "rubberize.jupyter.ipython_extension",
     # requires Pint
-    from rubberize.latexer import register_units_latex
-except ImportError:
-    pass
+    "register_units_latex": "rubberize.latexer",
+}
+
+
+def __getattr__(name: str) -> object:
+    module_name = _lazy_attrs.get(name)
+
+    if module_name is not None:
+        # pylint: disable-next=import-outside-toplevel
+        import importlib
+
+        try:
+            # rubberize.latexer is shadowed here by the latexer() function
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}"
+            ) from e
+
+        return getattr(module, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,117 @@
+"""Functions to render the same code with many namespaces."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING
+
+from rubberize._exceptions import RubberizeValueError
+from rubberize.config import config
+from rubberize.latexer import LatexTemplate
+from rubberize.render import render
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+
+def render_batch(
+    code: str,
+    namespaces: Iterable[dict[str, object]],
+    *,
+    setup: str | None = None,
+    grid: bool = False,
+    jobs: int = 1,
+) -> list[str]:
+    """Render the same code to HTML with each of many namespaces, e.g.
+    a calc sheet for each member of a structure.
+
+    The code is parsed once into a `LatexTemplate`, so each namespace
+    only builds the substitution and result forms of its statements.
+
+    The namespaces are rendered in order, and are not run: each should
+    already hold the values computed by the code. The names shared by
+    all namespaces, such as imported modules and a unit registry, can
+    be defined by `setup` instead.
+
+    Args:
+        code: The code to render.
+        namespaces: Name and object mappings, one for each render.
+        setup: Optional code run once to define names shared by all
+            namespaces. A namespace overrides a shared name.
+        grid: If True, render in a grid without descriptions.
+        jobs: Number of processes to render in. With more than one,
+            the namespaces are pickled to a pool of `jobs` processes,
+            each of which runs `setup` and parses the code once, with
+            the current config.
+
+    Returns:
+        The HTML for each namespace.
+
+    Raises:
+        RubberizeValueError: If `jobs` is less than 1.
+    """
+
+    if jobs < 1:
+        raise RubberizeValueError(f"jobs must be at least 1, not {jobs}")
+
+    namespaces = list(namespaces)
+
+    if jobs == 1 or len(namespaces) < 2:
+        renderer = _BatchRenderer(code, setup, grid)
+        return [renderer.render(ns) for ns in namespaces]
+
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(namespaces) // (jobs * 4))
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(code, setup, grid, asdict(config)),
+    ) as pool:
+        htmls = pool.map(_render_in_worker, namespaces, chunksize=chunksize)
+        return list(htmls)
+
+
+class _BatchRenderer:
+    """Renders a template with namespaces on top of the setup names."""
+
+    def __init__(self, code: str, setup: str | None, grid: bool) -> None:
+        self.template = LatexTemplate(code)
+        self.grid = grid
+        self.shared: dict[str, object] = {}
+
+        if setup:
+            exec(setup, self.shared)  # pylint: disable=exec-used
+            self.shared.pop("__builtins__", None)
+
+    def render(self, ns: dict[str, object]) -> str:
+        """Render the template with ns."""
+
+        if self.shared:
+            ns = {**self.shared, **ns}
+
+        return render(self.template.latex(ns), ns, grid=self.grid)
+
+
+_worker_renderer: _BatchRenderer | None = None
+
+
+def _init_worker(
+    code: str,
+    setup: str | None,
+    grid: bool,
+    cfg: dict[str, object],
+) -> None:
+    # pylint: disable-next=global-statement
+    global _worker_renderer
+
+    # a spawned process starts with the default config
+    config.set(**cfg)  # type: ignore
+    _worker_renderer = _BatchRenderer(code, setup, grid)
+
+
+def _render_in_worker(ns: dict[str, object]) -> str:
+    assert _worker_renderer is not None
+    return _worker_renderer.render(ns)
@@ -0,0 +1,3 @@
+"""Builds percent format scripts into documents, without Jupyter."""
+
+from rubberize.builder.build_script import build_script, build_html
@@ -0,0 +1,398 @@
+"""Functions to build a percent format script into a document."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import html
+import io
+import logging
+import os
+import re
+import shlex
+import sys
+import tempfile
+from importlib.resources import files
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+import rubberize.vendor.ast_comments as ast_c
+from rubberize import pdf
+from rubberize._exceptions import RubberizeRuntimeError, RubberizeValueError
+from rubberize.config import config, parse_modifiers
+from rubberize.jupyter.cells import (
+    compute_block_starts,
+    group_blocks,
+    split_percent_fmt,
+)
+from rubberize.latexer import latex_from_ast, parse_code
+from rubberize.render import render, render_markdown
+
+if TYPE_CHECKING:
+    from typing import Iterator, Literal
+
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logger(verbose: bool) -> None:
+    """Configure the logging of the build and of the PDF printing."""
+
+    for log in (logger, pdf.logger):
+        log.setLevel(logging.DEBUG if verbose else logging.INFO)
+        if not log.handlers:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            log.addHandler(handler)
+
+
+def build_script(
+    path: str | Path,
+    output: str | Path | None = None,
+    *,
+    fmt: Literal["pdf", "html"] = "pdf",
+    render_timeout: int = 10000,
+    mathjax: str | Path | None = None,
+) -> None:
+    """Build a percent format script into a PDF or HTML document,
+    without a Jupyter kernel or nbconvert.
+
+    The script is split into chunks on lines that begin with `# %%`,
+    the same as for `%taploads`. The chunks are run in order in one
+    namespace and rendered to a single HTML file:
+    - `# %%` or `# %% tap [ARGS]` => run and render as with `%%tap`
+    - `# %% py` or `# %% code` => run only
+    - `# %% [markdown]` => render as Markdown
+
+    If a directory is supplied as input, all scripts in the directory
+    are built, and the PDFs are printed with one shared headless
+    browser. A script that fails to build is logged, and the others are
+    still built. The failures are then raised together.
+
+    Args:
+        path: The path to the script or directory to build.
+        output: Optional output path. If None, uses the input path but
+            with file extension changed to that of `fmt`, or if input
+            path is a directory, the output will be saved in a new
+            sibling dir named <directory>_<fmt>.
+        fmt: The format to build to.
+        render_timeout: Maximum time to wait for MathJax and the fonts
+            to finish rendering before PDF conversion, in milliseconds.
+        mathjax: The URL or the path of the MathJax script of the page.
+            See `build_html()`.
+
+    Raises:
+        RubberizeValueError: If `fmt` is not supported, or if the
+            MathJax script cannot be read.
+        RubberizeRuntimeError: If a chunk of the script raised an
+            exception, or if scripts of a directory failed to build.
+    """
+
+    if fmt not in ("pdf", "html"):
+        raise RubberizeValueError(f"Unsupported format: {fmt}")
+
+    path = Path(path)
+    script = _mathjax_script(mathjax)
+
+    if path.is_dir():
+        if not output:
+            output = path.parent / f"{path.name}_{fmt}"
+        output = Path(output)
+        output.mkdir(parents=True, exist_ok=True)
+
+        scripts = sorted(path.glob("*.py"))
+
+        logger.info("Building %d scripts in: %s", len(scripts), path)
+
+        if not scripts:
+            logger.warning("No scripts found in %s", path.name)
+            return
+
+        failed = _build_scripts(
+            scripts, output, fmt, render_timeout, script
+        )
+
+        if failed:
+            raise RubberizeRuntimeError(
+                f"{len(failed)} of {len(scripts)} scripts in {path.name} "
+                "failed to build: " + ", ".join(s.name for s in failed)
+            )
+
+        logger.info(
+            "All scripts in %s built. Saved to: %s", path.name, output
+        )
+
+    elif path.is_file() and path.suffix == ".py":
+        output = Path(output) if output else path.with_suffix(f".{fmt}")
+        _build_one(path, output, fmt, render_timeout, script, None)
+
+    else:
+        logger.error("Invalid input: %s is not a script or directory.", path)
+
+
+def _build_scripts(
+    scripts: list[Path],
+    output: Path,
+    fmt: str,
+    render_timeout: int,
+    mathjax_script: str,
+) -> list[Path]:
+    """Build scripts one by one, and return those that failed."""
+
+    failed: list[Path] = []
+
+    shared = pdf.shared_browser() if fmt == "pdf" else contextlib.nullcontext()
+    with shared as browser:
+        for script in scripts:
+            target = output / script.with_suffix(f".{fmt}").name
+            try:
+                _build_one(
+                    script,
+                    target,
+                    fmt,
+                    render_timeout,
+                    mathjax_script,
+                    browser,
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("  Build failed: %s: %s", type(e).__name__, e)
+                failed.append(script)
+
+    return failed
+
+
+def _build_one(
+    path: Path,
+    output: Path,
+    fmt: str,
+    render_timeout: int,
+    mathjax_script: str,
+    browser: object | None,
+) -> None:
+    """Build a single script, printing with the browser of a batch build
+    if given.
+    """
+
+    logger.info("Building script: %s", path)
+
+    page = _build_page(path, mathjax_script)
+
+    if fmt == "html":
+        output.write_text(page, encoding="utf-8")
+        logger.info("  HTML saved to: %s", output)
+        return
+
+    # create a temp file for the HTML page, so that an HTML build of the
+    # script next to it is not overwritten
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".html", encoding="utf-8", delete=False
+    ) as tmp:
+        tmp.write(page)
+        html_path = Path(tmp.name)
+
+    try:
+        if browser is None:
+            ready = pdf.html_to_pdf(html_path, output, render_timeout)
+        else:
+            ready = pdf.print_page(
+                browser, html_path, output, render_timeout  # type: ignore
+            )
+    finally:
+        html_path.unlink(missing_ok=True)
+
+    if not ready:
+        logger.warning(
+            "  Render timeout reached, the math may not be typeset. Is the "
+            "MathJax script reachable?"
+        )
+
+    logger.info("  PDF saved to: %s", output)
+
+
+def build_html(path: str | Path, *, mathjax: str | Path | None = None) -> str:
+    """Run a percent format script and render it to an HTML page.
+
+    The page loads MathJax from `mathjax`, a URL or the path of a local
+    MathJax script. A local script is inlined in the page, like the
+    styles, so that the page is self-contained and can be printed to
+    PDF offline. Use a MathJax 3 `tex-svg-full.js`, which has its fonts
+    built in. If None, the path or URL in the `RUBBERIZE_MATHJAX`
+    environment variable is used, or else MathJax from jsDelivr.
+
+    Args:
+        path: The path to the script.
+        mathjax: The URL or the path of the MathJax script.
+
+    Raises:
+        RubberizeValueError: If the MathJax script cannot be read.
+        RubberizeRuntimeError: If a chunk of the script raised an
+            exception.
+    """
+
+    return _build_page(Path(path), _mathjax_script(mathjax))
+
+
+def _build_page(path: Path, mathjax_script: str) -> str:
+
+    src = path.read_text(encoding="utf-8")
+    ns: dict[str, object] = {
+        "__name__": "__main__",
+        "__file__": str(path.resolve()),
+    }
+
+    parts: list[str] = []
+    with _script_context(path):
+        for i, (marker, body) in enumerate(split_percent_fmt(src), 1):
+            if not body.strip():
+                continue
+            try:
+                parts.extend(_build_chunk(marker, body, ns, path))
+            except Exception as e:
+                raise RubberizeRuntimeError(
+                    f"Chunk {i} of {path.name} raised "
+                    f"{type(e).__name__}: {e}"
+                ) from e
+
+    return _PAGE_TEMPLATE.format(
+        title=html.escape(path.stem),
+        mathjax=mathjax_script,
+        css=(files("rubberize.jupyter") / "styles.css").read_text("utf-8"),
+        body="\n".join(parts),
+    )
+
+
+def _mathjax_script(mathjax: str | Path | None) -> str:
+    """Return the script element that loads MathJax, with the script
+    inlined if it is a local file.
+    """
+
+    if mathjax is None:
+        mathjax = os.environ.get("RUBBERIZE_MATHJAX") or _MATHJAX_URL
+
+    # a URL scheme has more than one letter, unlike a Windows drive
+    if isinstance(mathjax, str) and re.match(r"[a-zA-Z][\w+.-]+:|//", mathjax):
+        return f'<script src="{html.escape(mathjax)}" async></script>'
+
+    try:
+        js = Path(mathjax).read_text(encoding="utf-8")
+    except OSError as e:
+        raise RubberizeValueError(
+            f"Cannot read the MathJax script {mathjax}: {e}"
+        ) from e
+
+    # the script must not end the element early
+    js = js.replace("</script", "<\\/script")
+    return f"<script>\n{js}\n</script>"
+
+
+@contextlib.contextmanager
+def _script_context(path: Path) -> Iterator[None]:
+    """Put the script directory on `sys.path`, as when running the
+    script with `python`.
+    """
+
+    script_dir = str(path.resolve().parent)
+    sys.path.insert(0, script_dir)
+    try:
+        yield
+    finally:
+        with contextlib.suppress(ValueError):
+            sys.path.remove(script_dir)
+
+
+def _build_chunk(
+    marker: str, body: str, ns: dict[str, object], path: Path
+) -> list[str]:
+    """Run a chunk and return its rendered HTML blocks."""
+
+    if "[markdown]" in marker:
+        return [_wrap(render_markdown(body, ns))]
+
+    if marker.startswith(("py", "code")):
+        _exec(body, ns, path)
+        return []
+
+    args = _tap_parser.parse_args(
+        shlex.split(marker[3:]) if marker.startswith("tap") else []
+    )
+    cfg = parse_modifiers(args.modifiers)
+    if "hide" in cfg:
+        return []
+
+    local_ns: dict[str, object] | None = ns
+    if args.dead:
+        local_ns = None
+    else:
+        _exec(body, ns, path)
+
+    tree = cast(ast_c.Module, parse_code(body, mode="exec"))
+    with config.override_validated(cfg):
+        latexes = latex_from_ast(tree, local_ns)
+    blocks = group_blocks(latexes, tree.body, compute_block_starts(body))
+
+    return [_wrap(render(b, local_ns, grid=args.grid)) for b in blocks]
+
+
+def _exec(body: str, ns: dict[str, object], path: Path) -> None:
+    """Run the code of a chunk, discarding its printed output like
+    `%%tap`.
+    """
+
+    code = compile(body, str(path), "exec")
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+        exec(code, ns)  # pylint: disable=exec-used
+
+
+def _wrap(block: str) -> str:
+    return f'<div class="jp-RenderedHTMLCommon">\n{block}\n</div>'
+
+
+def _parser_error(message: str) -> None:
+    raise RubberizeValueError(f"Invalid tap arguments: {message}")
+
+
+# the arguments of `%%tap`, except `--html` that is only for debugging
+_tap_parser = argparse.ArgumentParser(prog="tap", add_help=False)
+_tap_parser.add_argument("modifiers", nargs="*")
+_tap_parser.add_argument("-g", "--grid", action="store_true")
+_tap_parser.add_argument("-d", "--dead", action="store_true")
+_tap_parser.error = _parser_error  # type: ignore
+
+_MATHJAX_URL = "https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-chtml-full.js"
+
+_PAGE_TEMPLATE = """\
+<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script>
+window.MathJax = {{
+    tex: {{
+        inlineMath: [["$", "$"], ["\\\\(", "\\\\)"]],
+        displayMath: [["$$", "$$"], ["\\\\[", "\\\\]"]],
+        processEscapes: true
+    }}
+}};
+</script>
+{mathjax}
+<style>
+body {{
+    font-family: system-ui, -apple-system, "Segoe UI", Roboto, sans-serif;
+    font-size: 14px;
+    line-height: 1.5;
+    max-width: 50em;
+    margin: 0 auto;
+    padding: 1em;
+}}
+</style>
+<style>
+{css}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
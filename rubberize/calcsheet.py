@@ -7,8 +7,6 @@ from __future__ import annotations
 from dataclasses import asdict, dataclass, field, KW_ONLY
 from typing import TYPE_CHECKING
 
-from titlecase import titlecase
-
 if TYPE_CHECKING:
     from typing import Any
 
@@ -124,6 +122,9 @@ class _Meta:
             f"({self.notes})" if self.notes else None,
         ]
 
+        # pylint: disable-next=import-outside-toplevel
+        from titlecase import titlecase
+
         self.title = titlecase(" ".join(p for p in parts if p))
 
     def to_dict(self) -> dict[str, Any]:
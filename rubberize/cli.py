@@ -2,8 +2,6 @@
 
 import argparse
 
-from rubberize.jupyter.export_notebook import configure_logger, export_notebook
-
 
 def main() -> None:
     """The main CLI."""
@@ -13,6 +11,7 @@ def main() -> None:
     sub = parser.add_subparsers(dest="command", required=True)
 
     register_export_cli(sub)
+    register_build_cli(sub)
 
     args = parser.parse_args()
     args.func(args)
@@ -26,6 +25,9 @@ def register_export_cli(subparsers: argparse._SubParsersAction) -> None:
         rubberize export notebook.ipynb output.pdf
         rubberize export notebook.ipynb --to html
         rubberize export notebook.ipynb --show-input
+        rubberize export notebooks/ --jobs 4
+        rubberize export notebooks/ --force
+        rubberize export notebooks/ --clear-cache
     """
 
     export: argparse.ArgumentParser = subparsers.add_parser(
@@ -63,14 +65,37 @@ def register_export_cli(subparsers: argparse._SubParsersAction) -> None:
         "--render-timeout",
         type=int,
         metavar="INT",
-        default=100,
+        default=10000,
+        help=(
+            "Maximum time to wait for MathJax and fonts to finish rendering "
+            "before PDF conversion, in milliseconds (default: %(default)s). "
+            "The page is printed as soon as it is ready."
+        ),
+    )
+    export.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        default=1,
         help=(
-            "Time to wait for the page to render before PDF conversion, in "
-            "milliseconds (default: %(default)s). Increase this value if the "
-            "notebook has a lot of complex JavaScript output that needs more "
-            "time to load."
+            "Number of notebooks to export in parallel when the input path is "
+            "a directory (default: %(default)s)."
         ),
     )
+    export.add_argument(
+        "--force",
+        action="store_true",
+        help=(
+            "If given, export PDFs again even if they are unchanged in the "
+            "export cache."
+        ),
+    )
+    export.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="If given, delete all PDFs in the export cache before exporting.",
+    )
     export.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging"
     )
@@ -79,13 +104,103 @@ def register_export_cli(subparsers: argparse._SubParsersAction) -> None:
 
 
 def _cmd_export(args: argparse.Namespace) -> None:
+    # imported here, so that `--help` and argument errors return quickly
+    # pylint: disable-next=import-outside-toplevel
+    from rubberize.jupyter.export_notebook import (
+        clear_export_cache,
+        configure_logger,
+        export_notebook,
+    )
+
     configure_logger(args.verbose)
+    if args.clear_cache:
+        clear_export_cache()
     export_notebook(
         args.input_path,
         args.output_path,
         fmt=args.to,
         show_input=args.show_input,
         render_timeout=args.render_timeout,
+        jobs=args.jobs,
+        force=args.force,
+    )
+
+
+def register_build_cli(subparsers: argparse._SubParsersAction) -> None:
+    """Register the build command cli to subparsers.
+
+    Examples:
+        rubberize build script.py
+        rubberize build script.py output.pdf
+        rubberize build script.py --to html
+        rubberize build scripts/
+        rubberize build script.py --mathjax tex-svg-full.js
+    """
+
+    build: argparse.ArgumentParser = subparsers.add_parser(
+        "build",
+        help=(
+            "Run a percent format script or a directory of scripts and build "
+            "the rendered calculations to a specified format, without Jupyter."
+        ),
+    )
+    build.add_argument(
+        "input_path", help="The path to the script or directory to build."
+    )
+    build.add_argument(
+        "output_path",
+        nargs="?",
+        help=(
+            "Optional output path. If not provided, uses the input path but "
+            "with file extension changed to that of the format, or if input "
+            "path is a directory, the output will be saved in a new sibling "
+            "directory named <directory>_<format>."
+        ),
+    )
+    build.add_argument(
+        "--to",
+        choices=["pdf", "html"],
+        default="pdf",
+        help="The format to build to (default: %(default)s).",
+    )
+    build.add_argument(
+        "--render-timeout",
+        type=int,
+        metavar="INT",
+        default=10000,
+        help=(
+            "Maximum time to wait for MathJax and fonts to finish rendering "
+            "before PDF conversion, in milliseconds (default: %(default)s). "
+            "The page is printed as soon as it is ready."
+        ),
+    )
+    build.add_argument(
+        "--mathjax",
+        metavar="PATH_OR_URL",
+        help=(
+            "The MathJax script of the page. A local file, such as MathJax's "
+            "tex-svg-full.js, is inlined so that the build works offline "
+            "(default: $RUBBERIZE_MATHJAX, or else MathJax from jsDelivr)."
+        ),
+    )
+    build.add_argument(
+        "-v", "--verbose", action="store_true", help="Enable verbose logging"
+    )
+
+    build.set_defaults(func=_cmd_build)
+
+
+def _cmd_build(args: argparse.Namespace) -> None:
+    # pylint: disable-next=import-outside-toplevel
+    from rubberize.builder.build_script import build_script, configure_logger
+
+    configure_logger(args.verbose)
+    build_script(
+        args.input_path,
+        args.output_path,
+        fmt=args.to,
+        render_timeout=args.render_timeout,
+        mathjax=args.mathjax,
     )
 
 
@@ -8,7 +8,7 @@ from contextlib import contextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 
 from rubberize._exceptions import (
     RubberizeAttributeError,
@@ -18,7 +18,7 @@ from rubberize._exceptions import (
 )
 
 if TYPE_CHECKING:
-    from typing import Literal, Iterable
+    from typing import Hashable, Literal, Iterable, Mapping
 
 
 @dataclass
@@ -56,6 +56,8 @@ class _DefaultConfig:
     show_tuple_as_array: bool = False
     show_1d_as_col: bool = True
     array_delimiter: Literal["pmatrix", "bmatrix"] = "bmatrix"
+    max_array_rows: int = 0
+    max_array_cols: int = 0
 
     # expressions
     wrap_indices: bool = True
@@ -78,25 +80,67 @@ class _DefaultConfig:
     use_fif_units: bool = False
     fif_prec: int = 16
 
+    # performance
+    use_render_cache: bool = False
+
+
+_FIELD_NAMES = frozenset(f.name for f in fields(_DefaultConfig))
+_SET_FIELDS = frozenset({"greek_starts", "hidden_modules", "math_constants"})
+
 
 class _Config(_DefaultConfig):
 
     def __init__(self):
+        self._version = 0
+        self._snapshot: tuple[int, tuple] | None = None
         super().__init__()
         self.load()
 
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        if name in _FIELD_NAMES:
+            self._bump()
+
+    def _bump(self) -> None:
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        """A counter that increases whenever a config value is changed
+        through this object. Mutating a set value directly (e.g.,
+        `config.greek_starts.add()`) is not tracked; use the
+        `add_*()` and `remove_*()` methods instead.
+        """
+
+        return self._version
+
+    def snapshot(self) -> tuple[tuple[str, Hashable], ...]:
+        """Return the current config values as a hashable, immutable
+        tuple of (key, value) pairs. Set values are frozen.
+
+        The snapshot is rebuilt only when `version` changes.
+        """
+
+        cached = self._snapshot
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        snap = tuple(
+            (k, frozenset(v) if k in _SET_FIELDS else v)
+            for k, v in self.__dict__.items()
+            if k in _FIELD_NAMES
+        )
+        self._snapshot = (self._version, snap)
+
+        return snap
+
     def set(self, **kwargs: bool | int | Iterable[str]) -> None:
         """Update multiple config values passed as kwargs."""
 
-        for k, v in kwargs.items():
-            if not hasattr(self, k):
-                raise RubberizeAttributeError(f"Invalid config key: {k}")
-
-            if k in ("greek_starts", "hidden_modules", "math_constants"):
-                if not isinstance(v, (set, list, tuple)):
-                    raise RubberizeTypeError(f"Invalid {k} type: {type(v)}")
-                v = set(v)
+        self._apply(_validate(kwargs))
 
+    def _apply(self, cfg: Mapping[str, object]) -> None:
+        for k, v in cfg.items():
             setattr(self, k, v)
 
     def load(self, *args: str, path: str | Path | None = None) -> None:
@@ -130,43 +174,84 @@ class _Config(_DefaultConfig):
         """Add one or more greek letters to greek_starts."""
 
         self.greek_starts.update(greeks)
+        self._bump()
 
     def remove_greek_start(self, *greeks: str) -> None:
         """Remove one or more greek letters from greek_starts."""
 
         self.greek_starts.difference_update(greeks)
+        self._bump()
 
     def add_hidden_module(self, *modules: str) -> None:
         """Add one or more modules to hidden_modules."""
 
         self.hidden_modules.update(modules)
+        self._bump()
 
     def remove_hidden_module(self, *modules: str) -> None:
         """Remove one or more modules from hidden_modules."""
 
         self.hidden_modules.difference_update(modules)
+        self._bump()
 
     def add_math_constant(self, *constants: str) -> None:
         """Add one or more constants to math_constants."""
 
         self.math_constants.update(constants)
+        self._bump()
 
     def remove_math_constant(self, *constants: str) -> None:
         """Remove one or more constants from math_constants."""
 
         self.math_constants.difference_update(constants)
+        self._bump()
 
     @contextmanager
     def override(self, **kwargs: bool | int | Iterable[str]):
         """Temporarily override config values within a context."""
 
-        original = {k: getattr(self, k) for k in kwargs}
+        with self.override_validated(_validate(kwargs)):
+            yield
+
+    @contextmanager
+    def override_validated(self, cfg: Mapping[str, object]):
+        """Like `override()`, but skip validating cfg.
+
+        Use this only for a cfg that has already been validated, such
+        as the output of `parse_modifiers()`.
+        """
+
+        if not cfg:
+            yield
+            return
+
+        original = {k: getattr(self, k) for k in cfg}
 
         try:
-            self.set(**kwargs)
+            self._apply(cfg)
             yield
         finally:
-            self.set(**original)
+            self._apply(original)
+
+
+def _validate(
+    cfg: Mapping[str, bool | int | Iterable[str]],
+) -> dict[str, object]:
+    """Check the keys and normalize the values of a config dict."""
+
+    valid = {}
+    for k, v in cfg.items():
+        if k not in _FIELD_NAMES:
+            raise RubberizeAttributeError(f"Invalid config key: {k}")
+
+        if k in _SET_FIELDS:
+            if not isinstance(v, (set, list, tuple)):
+                raise RubberizeTypeError(f"Invalid {k} type: {type(v)}")
+            v = set(v)
+
+        valid[k] = v
+
+    return valid
 
 
 config = _Config()
@@ -202,7 +287,11 @@ _SHORTCUTS: dict[str, dict[str, bool | int | Iterable[str]]] = {
 def parse_modifiers(
     modifiers: list[str],
 ) -> dict[str, bool | int | Iterable[str]]:
-    """Parse a list of modifiers to a config dict."""
+    """Parse a list of modifiers to a config dict.
+
+    The returned keys and values are validated, so the dict can be
+    passed to `config.override_validated()`.
+    """
 
     cfg = {}
     for m in modifiers:
@@ -222,4 +311,4 @@ def parse_modifiers(
         else:
             raise RubberizeKeyError(f"Unknown keyword: {m}")
 
-    return cfg
+    return _validate(cfg)
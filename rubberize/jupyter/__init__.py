@@ -1,3 +1,13 @@
 """Contains code for running the library as an extension in Jupyter."""
 
-from rubberize.jupyter.ipython_extension import load_ipython_extension
+
+def __getattr__(name: str) -> object:
+    if name == "load_ipython_extension":
+        # imported on first access, so that the export functions can be
+        # used without importing IPython
+        # pylint: disable-next=import-outside-toplevel
+        from rubberize.jupyter.ipython_extension import load_ipython_extension
+
+        return load_ipython_extension
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
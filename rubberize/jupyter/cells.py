@@ -0,0 +1,108 @@
+"""Functions to split cells into chunks and blocks. They do not need
+IPython, so they are shared by the magics and `rubberize build`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import rubberize.vendor.ast_comments as ast_c
+    from rubberize.latexer import StmtLatex
+
+
+def split_percent_fmt(src: str) -> list[tuple[str, str]]:
+    """Split a percent format snippet into (marker, body) chunks, on
+    lines that begin with `# %%`. The marker is the rest of that line,
+    in lowercase.
+    """
+
+    lines = src.splitlines()
+    chunks: list[tuple[str, list[str]]] = []
+    cur_marker = ""
+    cur_body: list[str] = []
+    saw_percent = False
+
+    for line in lines:
+        # ignore leading blank lines
+        if not cur_body and line.strip() == "":
+            continue
+
+        stripped = line.lower().lstrip()
+        if stripped.startswith("# %%"):
+            # commit previous chunk
+            if cur_body or saw_percent:
+                chunks.append((cur_marker, cur_body))
+                cur_body = []
+
+            # parse marker: remove `# %%` and trim the rest
+            cur_marker = stripped.removeprefix("# %%").strip()
+            saw_percent = True
+        else:
+            cur_body.append(line)
+    chunks.append((cur_marker, cur_body))
+
+    return [(m, "\n".join(b).rstrip()) for m, b in chunks]
+
+
+def compute_block_starts(cell: str) -> set[int]:
+    """Get the indices of the lines that start a new block of a cell: a
+    top-level statement after a blank line.
+    """
+
+    lines = cell.splitlines()
+
+    starts: set[int] = set()
+    saw_code = False
+    saw_blank = False
+
+    for i, line in enumerate(lines):
+        # ignore leading blank lines
+        if not saw_code and line.strip() == "":
+            continue
+
+        # ignore magics or commented magics
+        if line.lstrip().startswith(("%", "# %")):
+            continue
+
+        if line.strip() == "":
+            saw_blank = True
+            continue
+
+        if (
+            saw_code
+            and saw_blank
+            and line == line.lstrip(" ")
+            and not line.lstrip().startswith(
+                ("elif ", "else", "except", "finally")
+            )
+        ):
+            starts.add(i)
+
+        saw_code = True
+        saw_blank = False
+
+    return starts
+
+
+def group_blocks(
+    latexes: list[StmtLatex], stmts: list[ast_c.stmt], block_starts: set[int]
+) -> list[list[StmtLatex]]:
+    """Group the StmtLatex of a cell by the blocks their statements
+    belong to.
+    """
+
+    blocks: list[list[StmtLatex]] = []
+    current: list[StmtLatex] = []
+
+    for stmt, latex in zip(stmts, latexes):
+        if stmt.lineno - 1 in block_starts and current:
+            blocks.append(current)
+            current = []
+
+        current.append(latex)
+
+    if current:
+        blocks.append(current)
+
+    return blocks
@@ -2,30 +2,45 @@
 
 from __future__ import annotations
 
-import asyncio
+import hashlib
+import json
 import logging
+import os
+import re
 import subprocess
 import shutil
 import sys
 import tempfile
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
+from urllib.parse import unquote
+
+from rubberize import __version__, pdf
+from rubberize._exceptions import RubberizeRuntimeError, RubberizeValueError
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from nbconvert import HTMLExporter
     from typing import Literal
+    from playwright.sync_api import Browser
 
 
 logger = logging.getLogger(__name__)
 
+# The export cache is pruned to this size, in bytes, after each save.
+_CACHE_MAX_SIZE = 512 * 1024 * 1024
+
 
 def configure_logger(verbose: bool) -> None:
-    """Configure rubberize.logging"""
+    """Configure the logging of the export and of the PDF printing."""
 
-    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
-    if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(logging.Formatter("%(message)s"))
-        logger.addHandler(handler)
+    for log in (logger, pdf.logger):
+        log.setLevel(logging.DEBUG if verbose else logging.INFO)
+        if not log.handlers:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            log.addHandler(handler)
 
     logging.getLogger("asyncio").setLevel(logging.WARNING)
 
@@ -36,7 +51,9 @@ def export_notebook(
     *,
     fmt: Literal["pdf", "html"],
     show_input: bool = False,
-    render_timeout: int = 100,
+    render_timeout: int = 10000,
+    jobs: int = 1,
+    force: bool = False,
 ) -> None:
     """Export a Jupyter notebook to specified fmt.
 
@@ -48,10 +65,12 @@ def export_notebook(
             named <directory>_pdf.
         fmt: The format to export to.
         show_input: If True, include input cells in the output.
-        render_timeout: Time to wait for the page to render before PDF
-            conversion, in milliseconds. Increase this value if the
-            notebook has a lot of complex JavaScript output that needs
-            more time to load.
+        render_timeout: Maximum time to wait for MathJax and the fonts
+            to finish rendering before PDF conversion, in milliseconds.
+            The page is printed as soon as it is ready.
+        jobs: Number of notebooks of a directory to export in parallel.
+        force: If True, export PDFs even if they are in the export
+            cache.
     """
 
     if fmt == "html":
@@ -59,7 +78,12 @@ def export_notebook(
 
     if fmt == "pdf":
         return export_notebook_to_pdf(
-            path, output, show_input=show_input, render_timeout=render_timeout
+            path,
+            output,
+            show_input=show_input,
+            render_timeout=render_timeout,
+            jobs=jobs,
+            force=force,
         )
 
     return None
@@ -73,6 +97,10 @@ def export_notebook_to_html(
 ) -> None:
     """Export a Jupyter notebook to HTML using nbconvert.
 
+    The notebook is converted in-process by an `nbconvert.HTMLExporter`,
+    built once and reused for every notebook this process exports. If
+    nbconvert cannot be imported, `jupyter nbconvert` is run instead.
+
     Args:
         path: The path to the notebook to convert.
         output: Optional output path. If None, uses the input path but
@@ -80,12 +108,27 @@ def export_notebook_to_html(
         show_input: If True, include input cells in the output.
     """
 
-    if shutil.which("jupyter") is None:
-        raise RuntimeError("Jupyter nbconvert is required for HTML export")
-
     path = Path(path)
     output = Path(output) if output else path.with_suffix(".html")
 
+    exporter = _html_exporter(show_input)
+    if exporter is not None:
+        logger.debug("Exporting notebook to HTML in-process")
+
+        try:
+            body, _ = exporter.from_filename(str(path))
+        except Exception:
+            logger.error("  nbconvert failed!")
+            raise
+
+        # like `jupyter nbconvert --output`, always with .html
+        html_path = output.parent / f"{output.stem}.html"
+        html_path.write_text(body, encoding="utf-8")
+        return
+
+    if shutil.which("jupyter") is None:
+        raise RuntimeError("Jupyter nbconvert is required for HTML export")
+
     logger.debug("Exporting notebook to HTML")
 
     cmd = [
@@ -132,16 +175,66 @@ def export_notebook_to_html(
         raise
 
 
+_html_exporters: dict[bool, HTMLExporter | None] = {}
+
+
+def _html_exporter(show_input: bool) -> HTMLExporter | None:
+    """Get the HTML exporter for show_input, or None if nbconvert
+    cannot be imported. The exporter loads its template on first use,
+    and keeps it for the next notebooks.
+    """
+
+    try:
+        return _html_exporters[show_input]
+    except KeyError:
+        pass
+
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from nbconvert import HTMLExporter
+    except ImportError:
+        logger.debug("nbconvert not importable, using jupyter nbconvert")
+        exporter = None
+    else:
+        if show_input:
+            exporter = HTMLExporter()
+        else:
+            # same as `jupyter nbconvert --no-input`
+            exporter = HTMLExporter(
+                exclude_input=True,
+                exclude_input_prompt=True,
+                exclude_output_prompt=True,
+            )
+
+    _html_exporters[show_input] = exporter
+    return exporter
+
+
 def export_notebook_to_pdf(
     path: str | Path,
     output: str | Path | None = None,
     *,
     show_input: bool = False,
-    render_timeout: int = 100,
+    render_timeout: int = 10000,
+    jobs: int = 1,
+    force: bool = False,
 ) -> None:
     """Export a Jupyter notebook to PDF using nbconvert and Playwright.
     if a directory is supplied as input, all notebooks in the directory
-    will be exported.
+    will be exported, printed with one shared headless browser.
+
+    A notebook of a directory that fails to export is logged, and the
+    others are still exported. The failures are then raised together.
+
+    Exported PDFs are kept in an export cache, keyed by the notebook
+    content, the local files it references (e.g., images), the export
+    options, and the versions of rubberize, nbconvert and Playwright. A
+    notebook that has not changed since its last export is copied from
+    the cache instead of being exported again. The cache is in the
+    directory set by the `RUBBERIZE_CACHE_DIR` environment variable, or
+    else in `rubberize/export` under `XDG_CACHE_HOME` or `~/.cache`. It
+    is kept under 512 MiB by deleting the least recently used exports,
+    and can be emptied with `clear_export_cache()`.
 
     Args:
         path: The path to the notebook or directory to convert.
@@ -150,19 +243,31 @@ def export_notebook_to_pdf(
             directory, the output will be saved in a new sibling dir
             named {{dir}}_pdf.
         show_input: If True, include input cells in the output.
-        render_timeout: Time to wait for the page to render before PDF
-            conversion, in milliseconds. Increase this value if the
-            notebook has a lot of complex JavaScript output that needs
-            more time to load.
+        render_timeout: Maximum time to wait for MathJax and the fonts
+            to finish rendering before PDF conversion, in milliseconds.
+            The page is printed as soon as it is ready.
+        jobs: Number of notebooks of a directory to export in parallel.
+            The HTML conversions run in a pool of `jobs` processes, and
+            up to `jobs` pages of one browser print the PDFs.
+        force: If True, export even if the PDF is in the export cache.
+            The cache is still updated.
+
+    Raises:
+        RubberizeValueError: If `jobs` is less than 1.
+        RubberizeRuntimeError: If notebooks of a directory failed to
+            export.
     """
 
+    if jobs < 1:
+        raise RubberizeValueError(f"jobs must be at least 1, not {jobs}")
+
     path = Path(path)
 
     if path.is_dir():
         output = Path(output) if output else path.parent / f"{path.name}_pdf"
         output.mkdir(parents=True, exist_ok=True)
 
-        notebooks = list(path.glob("*.ipynb"))
+        notebooks = sorted(path.glob("*.ipynb"))
 
         logger.info("Exporting %d notebooks in: %s", len(notebooks), path)
 
@@ -170,13 +275,23 @@ def export_notebook_to_pdf(
             logger.warning("No notebooks found in %s", path.name)
             return
 
-        for notebook in notebooks:
-            output_pdf = output / notebook.with_suffix(".pdf").name
-            export_notebook_to_pdf(
-                notebook,
-                output_pdf,
-                show_input=show_input,
-                render_timeout=render_timeout,
+        outputs = [output / nb.with_suffix(".pdf").name for nb in notebooks]
+
+        if jobs > 1:
+            logger.info("Exporting with %d jobs", jobs)
+
+            failed = _export_pdfs_parallel(
+                notebooks, outputs, show_input, render_timeout, jobs, force
+            )
+        else:
+            failed = _export_pdfs(
+                notebooks, outputs, show_input, render_timeout, force
+            )
+
+        if failed:
+            raise RubberizeRuntimeError(
+                f"{len(failed)} of {len(notebooks)} notebooks in {path.name} "
+                "failed to export: " + ", ".join(nb.name for nb in failed)
             )
 
         logger.info(
@@ -187,168 +302,430 @@ def export_notebook_to_pdf(
 
     elif path.is_file() and path.suffix == ".ipynb":
         output = Path(output) if output else path.with_suffix(".pdf")
+        _export_pdf(path, output, show_input, render_timeout, None, force)
 
-        logger.info("Exporting notebook to PDF: %s", path)
+    else:
+        logger.error("Invalid input: %s is not a notebook or directory.", path)
 
-        # create a temp file for the HTML output
-        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
 
-        try:
-            export_notebook_to_html(path, tmp_path, show_input=show_input)
-            _html_to_pdf(tmp_path, output, render_timeout)
+def _export_pdf(
+    path: Path,
+    output: Path,
+    show_input: bool,
+    render_timeout: int,
+    browser: Browser | None,
+    force: bool,
+) -> None:
+    """Export a single notebook to PDF, printing with the browser of a
+    batch export if given.
+    """
 
-            logger.info("PDF saved as: %s", output)
-        finally:
-            logger.debug("Temporary file deleted")
+    logger.info("Exporting notebook to PDF: %s", path)
 
-            tmp_path.unlink(missing_ok=True)
+    key = _cache_key(path, "pdf", show_input, render_timeout)
+    if not force and _copy_from_cache(key, output):
+        logger.info("Notebook unchanged, PDF copied from cache: %s", output)
+        return
 
-    else:
-        logger.error("Invalid input: %s is not a notebook or directory.", path)
+    # create a temp file for the HTML output
+    with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as tmp:
+        tmp_path = Path(tmp.name)
 
+    try:
+        export_notebook_to_html(path, tmp_path, show_input=show_input)
 
-def _html_to_pdf(
-    path: str | Path, output: str | Path | None, render_timeout: int
-) -> None:
-    """Export an HTML file to PDF."""
+        if browser is not None:
+            logger.debug("Converting HTML to PDF with the shared browser")
+            ready = pdf.print_page(browser, tmp_path, output, render_timeout)
+        else:
+            ready = pdf.html_to_pdf(tmp_path, output, render_timeout)
 
-    path = Path(path)
-    output = Path(output) if output else path.with_suffix(".pdf")
+        # a page printed before it was ready may be incomplete
+        if ready:
+            _save_to_cache(key, output)
 
-    logger.debug("Converting HTML to PDF")
-    logger.debug("  Input HTML: %s", path)
-    logger.debug("  Output PDF: %s", output)
-    logger.debug("  Render timeout: %d ms", render_timeout)
+        logger.info("PDF saved as: %s", output)
+    finally:
+        logger.debug("Temporary file deleted")
 
-    try:
-        logger.debug("  Attempting synchronous Playwright conversion")
+        tmp_path.unlink(missing_ok=True)
 
-        _html_to_pdf_sync(path, output, render_timeout)
-    except Exception:  # pylint: disable=broad-exception-caught
-        logger.debug("  Sync Playwright failed, falling back to async path")
 
-        if sys.platform.startswith("win"):
-            # fix for windows (probably)
-            asyncio.set_event_loop_policy(
-                asyncio.WindowsSelectorEventLoopPolicy()  # type: ignore
-            )
+def _export_pdfs(
+    notebooks: list[Path],
+    outputs: list[Path],
+    show_input: bool,
+    render_timeout: int,
+    force: bool,
+) -> list[Path]:
+    """Export notebooks to PDF one after another.
 
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+    When an event loop is already running, as in Jupyter, the sync
+    Playwright API cannot be used, so the notebooks are exported by the
+    async path of a parallel export with one job, which also shares one
+    browser.
+
+    Returns:
+        The notebooks that failed to export.
+    """
 
-        if loop.is_running():
-            logger.debug("  Existing event loop detected")
+    if _event_loop_running():
+        logger.debug("Event loop running, sharing an async browser")
 
-            # Use nest_asyncio to allow nested loops (e.g. in Jupyter)
+        return _export_pdfs_parallel(
+            notebooks, outputs, show_input, render_timeout, 1, force
+        )
+
+    failed = []
+
+    with pdf.shared_browser() as browser:
+        for notebook, output in zip(notebooks, outputs):
             try:
-                # pylint: disable-next=import-outside-toplevel
-                import nest_asyncio
-            except ImportError as e:
-                raise RuntimeError(
-                    "Running PDF export inside Jupyter requires nest_asyncio"
-                ) from e
-
-            nest_asyncio.apply()
-
-            new_loop = asyncio.new_event_loop()
-            new_loop.run_until_complete(
-                _html_to_pdf_async(path, output, render_timeout)
-            )
-            new_loop.close()
+                _export_pdf(
+                    notebook,
+                    output,
+                    show_input,
+                    render_timeout,
+                    browser,
+                    force,
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("  Export failed: %s: %s", type(e).__name__, e)
+                failed.append(notebook)
+
+    return failed
+
+
+def _export_pdfs_parallel(
+    notebooks: list[Path],
+    outputs: list[Path],
+    show_input: bool,
+    render_timeout: int,
+    jobs: int,
+    force: bool,
+) -> list[Path]:
+    """Export notebooks to PDF in parallel.
+
+    Returns:
+        The notebooks that failed to export.
+    """
 
-        else:
-            loop.run_until_complete(
-                _html_to_pdf_async(path, output, render_timeout)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        htmls = [Path(tmp_dir) / f"{i}.html" for i in range(len(notebooks))]
+
+        with _html_pool(jobs) as pool:
+            return pdf.run_coroutine(
+                _export_pdfs_async(
+                    notebooks,
+                    htmls,
+                    outputs,
+                    show_input,
+                    render_timeout,
+                    jobs,
+                    force,
+                    pool,
+                )
             )
 
 
-def _html_to_pdf_sync(
-    path: Path, output: str | Path, render_timeout: int
-) -> None:
+def _html_pool(jobs: int) -> Executor:
+    """Create the worker pool for the HTML conversions of a parallel
+    export. A single job converts in a thread, as a process would only
+    add its startup time.
+    """
+
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if jobs == 1:
+        return ThreadPoolExecutor(max_workers=1)
+
+    return ProcessPoolExecutor(max_workers=jobs)
+
+
+def _event_loop_running() -> bool:
+    """Check if an event loop is running in this thread."""
+
+    # without asyncio imported, no loop can be running
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        return False
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+
+    return True
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+async def _export_pdfs_async(
+    notebooks: list[Path],
+    htmls: list[Path],
+    outputs: list[Path],
+    show_input: bool,
+    render_timeout: int,
+    jobs: int,
+    force: bool,
+    pool: Executor,
+) -> list[Path]:
+    """Convert the notebooks to HTML in the pool, and print each to PDF
+    as soon as its HTML is ready, in at most `jobs` pages of one browser.
+
+    The results are awaited in order of the notebooks, so that progress
+    is logged in that order while the exports run in parallel.
+
+    Returns:
+        The notebooks that failed to export.
+    """
+
+    # pylint: disable-next=import-outside-toplevel
+    import asyncio
+
     try:
         # pylint: disable-next=import-outside-toplevel
-        from playwright.sync_api import sync_playwright
+        from playwright.async_api import async_playwright
     except ImportError as e:
-        raise RuntimeError("Playwright is required for PDF export") from e
+        raise RuntimeError("PDF export requires Playwright") from e
+
+    loop = asyncio.get_running_loop()
+    pages = asyncio.Semaphore(jobs)
+
+    async with async_playwright() as p:
+        browser = await pdf.launch_chromium_async(p)
+
+        async def export_one(notebook: Path, html: Path, output: Path) -> bool:
+            key = _cache_key(notebook, "pdf", show_input, render_timeout)
+            if not force and _copy_from_cache(key, output):
+                return True
+
+            await loop.run_in_executor(
+                pool,
+                partial(
+                    export_notebook_to_html,
+                    notebook,
+                    html,
+                    show_input=show_input,
+                ),
+            )
+            async with pages:
+                ready = await pdf.print_page_async(
+                    browser, html, output, render_timeout
+                )
+
+            if ready:
+                _save_to_cache(key, output)
+            return False
+
+        tasks = [
+            asyncio.ensure_future(export_one(*args))
+            for args in zip(notebooks, htmls, outputs)
+        ]
+        failed = []
 
-    with sync_playwright() as p:
         try:
-            logger.debug("    Launching headless Chromium")
+            for notebook, output, task in zip(notebooks, outputs, tasks):
+                logger.info("Exporting notebook to PDF: %s", notebook)
+
+                try:
+                    cached = await task
+                # pylint: disable-next=broad-exception-caught
+                except Exception as e:
+                    logger.error(
+                        "  Export failed: %s: %s", type(e).__name__, e
+                    )
+                    failed.append(notebook)
+                else:
+                    if cached:
+                        logger.info(
+                            "Notebook unchanged, PDF copied from cache: %s",
+                            output,
+                        )
+                    else:
+                        logger.info("PDF saved as: %s", output)
+        finally:
+            for task in tasks:
+                task.cancel()
 
-            browser = p.chromium.launch(headless=True)
-        except Exception as e:
-            raise RuntimeError(
-                "    No suitable chromium executable found. "
-                "Install using 'playwright install chromium'."
-            ) from e
+            logger.debug("Closing shared browser")
 
+            await browser.close()
+
+    return failed
+
+
+def _cache_dir() -> Path:
+    cache_dir = os.environ.get("RUBBERIZE_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "rubberize" / "export"
+
+
+def _cache_key(
+    path: Path, fmt: str, show_input: bool, render_timeout: int
+) -> str:
+    """Hash the notebook content, with its outputs, the local files it
+    references, the options that affect the export, and the versions
+    of the packages that export it. A Playwright release pins the
+    version of its Chromium, so that version is keyed by Playwright's.
+    """
+
+    data = path.read_bytes()
+    key = hashlib.sha256(data)
+
+    options = [fmt, show_input, render_timeout, __version__]
+    options += [_package_version(p) for p in ("nbconvert", "playwright")]
+    key.update(json.dumps(options).encode())
+
+    for resource in _get_resources(path, data):
+        key.update(str(resource).encode())
         try:
-            url = f"file:///{path.resolve().as_posix()}"
+            key.update(hashlib.sha256(resource.read_bytes()).digest())
+        except OSError:
+            key.update(b"missing")
 
-            logger.debug("    Opening URL: %s", url)
+    return key.hexdigest()
 
-            page = browser.new_page()
-            page.set_default_timeout(0)  # Large notebooks might load for >30s
-            page.emulate_media(media="print")
-            page.wait_for_timeout(100)
-            page.goto(url, wait_until="networkidle")
 
-            logger.debug("    Waiting %d ms for page rendering", render_timeout)
+def _package_version(name: str) -> str | None:
+    # pylint: disable-next=import-outside-toplevel
+    from importlib.metadata import PackageNotFoundError, version
 
-            page.wait_for_timeout(render_timeout)
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
 
-            logger.debug("    Generating PDF")
 
-            page.pdf(path=output, prefer_css_page_size=True, outline=True)
-        finally:
-            logger.debug("    Closing browser")
+# src and href attributes of HTML, and the targets of Markdown links and
+# images, up to an optional title
+_RESOURCE_RE = re.compile(
+    r"""(?:src|href)\s*=\s*["']([^"']+)["']|\]\(\s*<?([^)\s>]+)"""
+)
 
-            browser.close()
 
+def _get_resources(path: Path, data: bytes) -> list[Path]:
+    """Get the local files referenced by the Markdown cells and the HTML
+    outputs of a notebook, such as images and stylesheets, sorted.
+    """
 
-async def _html_to_pdf_async(
-    path: Path, output: str | Path, render_timeout: int
-) -> None:
     try:
-        # pylint: disable-next=import-outside-toplevel
-        from playwright.async_api import async_playwright
-    except ImportError as e:
-        raise RuntimeError("PDF export requires Playwright") from e
+        cells = json.loads(data).get("cells", [])
+    except (ValueError, AttributeError):
+        return []
+
+    texts = []
+    for cell in cells:
+        if cell.get("cell_type") == "markdown":
+            texts.append(cell.get("source", ""))
+        for output in cell.get("outputs", []):
+            texts.append(output.get("data", {}).get("text/html", ""))
+
+    resources = set()
+    for text in texts:
+        if isinstance(text, list):
+            text = "".join(text)
+        for match in _RESOURCE_RE.finditer(text):
+            ref = (match.group(1) or match.group(2)).split("#")[0]
+            if not ref or re.match(r"[a-zA-Z][\w+.-]*:|//", ref):
+                continue  # a URL, e.g. http: or data:
+
+            resources.add(path.parent / unquote(ref.split("?")[0]))
+
+    return sorted(resources)
+
+
+def _copy_from_cache(key: str, output: Path) -> bool:
+    """Copy a cached export to output.
+
+    Returns:
+        True if the export was found in the cache and copied.
+    """
+
+    cached = _cache_dir() / f"{key}{output.suffix}"
+
+    try:
+        shutil.copyfile(cached, output)
+        # mark as recently used, the cache is pruned by modification time
+        os.utime(cached)
+    except OSError:
+        return False
+
+    logger.debug("  Copied from cache: %s", cached)
+    return True
 
-    async with async_playwright() as p:
-        try:
-            logger.debug("    Launching async Chromium instance")
 
-            browser = await p.chromium.launch(headless=True)
-        except Exception as e:
-            raise RuntimeError(
-                "    No suitable chromium executable found. "
-                "Install using 'playwright install chromium'."
-            ) from e
+def _save_to_cache(key: str, output: Path) -> None:
+    """Save an export to the cache. A failure to write to the cache
+    does not fail the export.
+    """
+
+    cached = _cache_dir() / f"{key}{output.suffix}"
+
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+
+        # write atomically, parallel exports may share the cache
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        shutil.copyfile(output, tmp)
+        os.replace(tmp, cached)
+    except OSError as e:
+        logger.debug("  Could not save to cache: %s", e)
+        return
+
+    logger.debug("  Saved to cache: %s", cached)
+
+    try:
+        _prune_cache(cached.parent, _CACHE_MAX_SIZE)
+    except OSError as e:
+        logger.debug("  Could not prune the cache: %s", e)
 
+
+def _prune_cache(cache_dir: Path, max_size: int) -> None:
+    """Delete the least recently used exports of the cache until it is
+    no larger than max_size bytes.
+    """
+
+    entries = []
+    for file in cache_dir.iterdir():
         try:
-            url = f"file:///{path.resolve().as_posix()}"
+            stat = file.stat()
+        except OSError:
+            continue  # deleted by a parallel export
+        if file.suffix != ".tmp":
+            entries.append((stat.st_mtime, stat.st_size, file))
 
-            logger.debug("    Opening URL: %s", url)
+    size = sum(entry[1] for entry in entries)
+    for _, file_size, file in sorted(entries):
+        if size <= max_size:
+            break
 
-            page = await browser.new_page()
-            page.set_default_timeout(0)  # Large notebooks might load for >30s
-            await page.emulate_media(media="print")
-            await page.wait_for_timeout(100)
-            await page.goto(url, wait_until="networkidle")
+        file.unlink(missing_ok=True)
+        size -= file_size
 
-            logger.debug("    Waiting %d ms for page rendering", render_timeout)
+        logger.debug("  Pruned from cache: %s", file)
 
-            await page.wait_for_timeout(render_timeout)
 
-            logger.debug("    Generating PDF")
+def clear_export_cache() -> int:
+    """Delete all exports in the export cache of
+    `export_notebook_to_pdf()`.
 
-            await page.pdf(path=output, prefer_css_page_size=True, outline=True)
-        finally:
-            logger.debug("    Closing browser")
+    Returns:
+        The number of deleted exports.
+    """
 
-            await browser.close()
+    cache_dir = _cache_dir()
+    if not cache_dir.is_dir():
+        return 0
+
+    count = 0
+    for file in cache_dir.iterdir():
+        if file.is_file():
+            file.unlink(missing_ok=True)
+            count += 1
+
+    logger.info("Cleared %d exports from the cache: %s", count, cache_dir)
+    return count
@@ -43,12 +43,30 @@ class ExportMagics(Magics):
         "--render-timeout",
         type=int,
         metavar="INT",
-        default=100,
+        default=10000,
         help=(
-            "Time to wait for the page to render before PDF conversion, in "
-            "milliseconds (default: %(default)s). Increase this value if the "
-            "notebook has a lot of complex JavaScript output that needs more "
-            "time to load."
+            "Maximum time to wait for MathJax and fonts to finish rendering "
+            "before PDF conversion, in milliseconds (default: %(default)s). "
+            "The page is printed as soon as it is ready."
+        ),
+    )
+    @argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        default=1,
+        help=(
+            "Number of notebooks to export in parallel when the input path is "
+            "a directory (default: %(default)s)."
+        ),
+    )
+    @argument(
+        "--force",
+        action="store_true",
+        help=(
+            "If given, export PDFs again even if they are unchanged in the "
+            "export cache."
         ),
     )
     @argument(
@@ -69,4 +87,6 @@ class ExportMagics(Magics):
             fmt=args.to,
             show_input=args.show_input,
             render_timeout=args.render_timeout,
+            jobs=args.jobs,
+            force=args.force,
         )
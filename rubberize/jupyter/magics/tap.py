@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import cast, TYPE_CHECKING
+from typing import cast
 
 from IPython.core.interactiveshell import InteractiveShell
 from IPython.core.magic import (
@@ -22,12 +22,13 @@ from IPython.utils.capture import capture_output
 import rubberize.vendor.ast_comments as ast_c
 from rubberize._exceptions import RubberizeRuntimeError
 from rubberize.config import config, parse_modifiers
-from rubberize.latexer import latex_from_ast
+from rubberize.jupyter.cells import (
+    compute_block_starts as _compute_block_starts,
+    group_blocks as _group_blocks,
+)
+from rubberize.latexer import latex_from_ast, parse_code
 from rubberize.render import render
 
-if TYPE_CHECKING:
-    from rubberize.latexer import StmtLatex
-
 
 @magics_class
 class TapMagics(Magics):
@@ -78,8 +79,8 @@ class TapMagics(Magics):
         else:
             local_ns = None
 
-        tree = cast(ast_c.Module, ast_c.parse(cell, mode="exec"))
-        with config.override(**cfg):
+        tree = cast(ast_c.Module, parse_code(cell, mode="exec"))
+        with config.override_validated(cfg):
             latexes = latex_from_ast(tree, local_ns)
         block_starts = _compute_block_starts(cell)
         blocks = _group_blocks(latexes, tree.body, block_starts)
@@ -168,58 +169,3 @@ class TapMagics(Magics):
             )
 
             print(dump)
-
-
-def _compute_block_starts(cell: str) -> set[int]:
-    lines = cell.splitlines()
-
-    starts: set[int] = set()
-    saw_code = False
-    saw_blank = False
-
-    for i, line in enumerate(lines):
-        # ignore leading blank lines
-        if not saw_code and line.strip() == "":
-            continue
-
-        # ignore magics or commented magics
-        if line.lstrip().startswith(("%", "# %")):
-            continue
-
-        if line.strip() == "":
-            saw_blank = True
-            continue
-
-        if (
-            saw_code
-            and saw_blank
-            and line == line.lstrip(" ")
-            and not line.lstrip().startswith(
-                ("elif ", "else", "except", "finally")
-            )
-        ):
-            starts.add(i)
-
-        saw_code = True
-        saw_blank = False
-
-    return starts
-
-
-def _group_blocks(
-    latexes: list[StmtLatex], stmts: list[ast_c.stmt], block_starts: set[int]
-) -> list[list[StmtLatex]]:
-    blocks: list[list[StmtLatex]] = []
-    current: list[StmtLatex] = []
-
-    for stmt, latex in zip(stmts, latexes):
-        if stmt.lineno - 1 in block_starts and current:
-            blocks.append(current)
-            current = []
-
-        current.append(latex)
-
-    if current:
-        blocks.append(current)
-
-    return blocks
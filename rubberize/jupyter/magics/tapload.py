@@ -21,6 +21,7 @@ from IPython.core.magics.code import (
 from IPython.utils.text import get_text_list
 
 from rubberize._exceptions import RubberizeRuntimeError
+from rubberize.jupyter.cells import split_percent_fmt as _split_percent_fmt
 
 
 @magics_class
@@ -240,32 +241,3 @@ def _render_taploads_chunk(
 
     args = marker[3:].strip() if marker.startswith("tap") else global_args
     return f"%%tap {args}\n# {provenance}\n{body.rstrip()}"
-
-
-def _split_percent_fmt(src: str) -> list[tuple[str, str]]:
-    lines = src.splitlines()
-    chunks: list[tuple[str, list[str]]] = []
-    cur_marker = ""
-    cur_body: list[str] = []
-    saw_percent = False
-
-    for line in lines:
-        # ignore leading blank lines
-        if not cur_body and line.strip() == "":
-            continue
-
-        stripped = line.lower().lstrip()
-        if stripped.startswith("# %%"):
-            # commit previous chunk
-            if cur_body or saw_percent:
-                chunks.append((cur_marker, cur_body))
-                cur_body = []
-
-            # parse marker: remove `# %%` and trim the rest
-            cur_marker = stripped.removeprefix("# %%").strip()
-            saw_percent = True
-        else:
-            cur_body.append(line)
-    chunks.append((cur_marker, cur_body))
-
-    return [(m, "\n".join(b).rstrip()) for m, b in chunks]
@@ -1,6 +1,11 @@
 """Latexer"""
 
-from rubberize.latexer.latexer import latexer, latex_from_ast
+from rubberize.latexer.latexer import (
+    LatexTemplate,
+    latexer,
+    latex_from_ast,
+    parse_code,
+)
 
 from rubberize.latexer.expr_latex import ExprLatex
 from rubberize.latexer.stmt_latex import StmtLatex
@@ -9,8 +14,12 @@ from rubberize.latexer.blocks import register_block_converter
 from rubberize.latexer.calls import register_call_converter
 from rubberize.latexer.objects import register_object_converter
 
-try:
-    # requires Pint
-    from rubberize.latexer.objects import register_units_latex
-except ImportError:
-    pass
+
+def __getattr__(name: str) -> object:
+    if name == "register_units_latex":
+        # requires Pint, imported on first access
+        from rubberize.latexer import objects
+
+        return getattr(objects, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
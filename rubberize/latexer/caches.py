@@ -0,0 +1,68 @@
+"""Bounded caches used to skip repeated work across renders."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from typing import Hashable
+
+_T = TypeVar("_T")
+
+
+class LRUCache(Generic[_T]):
+    """A mapping that keeps at most `maxsize` entries, evicting the
+    least recently used entry first.
+
+    Attributes:
+        maxsize: Maximum number of entries. If 0, nothing is stored.
+        hits: Number of successful lookups since the last clear().
+        misses: Number of failed lookups since the last clear().
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, _T] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable) -> _T | None:
+        """Return the entry for key and mark it as recently used, or
+        None if there is no entry.
+        """
+
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: _T) -> None:
+        """Store value under key, evicting old entries if needed."""
+
+        if self.maxsize <= 0:
+            return
+
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
@@ -1,19 +1,12 @@
-"""Call converters."""
+"""Call converters.
+
+The NumPy and Pint converters are registered on first use, see
+`rubberize.latexer.optional_deps`.
+"""
 
 from rubberize.latexer.calls.convert_call import (
     convert_call,
+    has_call_converter,
     register_call_converter,
 )
 from rubberize.latexer.calls import builtin_calls
-
-try:
-    # requires NumPy
-    from rubberize.latexer.calls import numpy_calls
-except ImportError:
-    pass
-
-try:
-    # requires Pint
-    from rubberize.latexer.calls import pint_calls
-except ImportError:
-    pass
@@ -7,7 +7,7 @@ import warnings
 from typing import TYPE_CHECKING
 
 from rubberize._exceptions import RubberizeUserWarning
-from rubberize.latexer import helpers
+from rubberize.latexer import helpers, optional_deps
 from rubberize.latexer.expr_latex import ExprLatex
 
 if TYPE_CHECKING:
@@ -40,16 +40,23 @@ def register_call_converter(
             when the callable is undefined.
     """
 
+    # a lazily loaded built-in converter never replaces the user's
+    keep_existing = optional_deps.is_loading_converters()
+
     if isinstance(call, str):
         name = call
     else:
-        _call_converters[call] = func
+        if not (keep_existing and call in _call_converters):
+            _call_converters[call] = func
         name = call.__name__ if syntactic else None
 
     if name is None:
         return
 
     existing = _call_converters_by_name.get(name)
+    if keep_existing and existing is not None:
+        return
+
     if existing is not None and existing is not func:
         warnings.warn(
             f"Syntactic converter for '{name}' is being overwritten.",
@@ -68,6 +75,8 @@ def convert_call(visitor: ExprVisitor, node: ast.Call) -> ExprLatex | None:
         node: The ast.Call node to be converted.
     """
 
+    optional_deps.load_converters()
+
     if visitor.ns is not None:
         key = helpers.get_func_object(node, visitor.ns)
 
@@ -81,7 +90,60 @@ def convert_call(visitor: ExprVisitor, node: ast.Call) -> ExprLatex | None:
 
     if name is not None:
         converter = _call_converters_by_name.get(name)
+        if converter is None and _load_converters_for_call(node, visitor.ns):
+            converter = _call_converters_by_name.get(name)
         if converter:
             return converter(visitor, node)
 
     return None
+
+
+def has_call_converter(node: ast.Call, ns: dict[str, object] | None) -> bool:
+    """Check if convert_call() may find a converter for the call node.
+
+    Args:
+        node: The ast.Call node to investigate.
+        ns: Name and object mapping.
+    """
+
+    optional_deps.load_converters()
+
+    if ns is not None:
+        key = helpers.get_func_object(node, ns)
+        if key is not None and key in _call_converters:
+            return True
+
+    name = helpers.get_id(node.func)
+    if name is None:
+        return False
+    if name not in _call_converters_by_name:
+        _load_converters_for_call(node, ns)
+
+    return name in _call_converters_by_name
+
+
+def _load_converters_for_call(
+    node: ast.Call, ns: dict[str, object] | None
+) -> bool:
+    """Load the converters of a package that has not been imported yet
+    but may be the one called.
+
+    Without a namespace, the converters of all installed packages are
+    loaded. Otherwise, only those of the package named by the base of
+    the called attribute chain, by its module in ns or by its alias.
+
+    Returns:
+        True if converters may have been loaded.
+    """
+
+    if ns is None:
+        optional_deps.load_converters(import_packages=True)
+        return True
+
+    base = node.func
+    while isinstance(base, ast.Attribute):
+        base = base.value
+    if base is node.func or not isinstance(base, ast.Name):
+        return False
+
+    return optional_deps.load_converters_for(base.id, ns.get(base.id))
@@ -13,10 +13,14 @@ all_modes: Gather all three modes as a list, excluding repeated forms if
 """
 
 import ast
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from rubberize.config import config
 from rubberize.latexer import helpers
+from rubberize.latexer.caches import LRUCache
 from rubberize.latexer.objects import convert_object
+from rubberize.latexer.render_cache import get_definition_key
 from rubberize.latexer.visitors import ExprVisitor
 
 
@@ -26,12 +30,56 @@ def definition(node: ast.expr, ns: dict[str, object] | None = None) -> str:
     ns can be supplied to apply special conversions to specific object
         types if defined in rubberize.latexer.objects.
 
+    Inside a `definition_scope()`, the result is memoized per node, so
+    renders of the same tree with other namespaces reuse it.
+
     Args:
         node: The node to investigate.
         ns: Name and object mapping.
     """
 
-    return ExprVisitor(ns).visit(node).latex
+    memo = _definition_memo.get()
+    if memo is None or not ns:
+        return ExprVisitor(ns).visit(node).latex
+
+    key = get_definition_key(node, ns)
+    if key is None:
+        return ExprVisitor(ns).visit(node).latex
+
+    entry = memo.get(key)
+    if entry is not None and entry[0] is node:
+        return entry[1]
+
+    latex = ExprVisitor(ns).visit(node).latex
+    # the entry keeps the node alive, so its id is not reused
+    memo.put(key, (node, latex))
+
+    return latex
+
+
+_definition_memo: ContextVar[LRUCache[tuple[ast.expr, str]] | None] = (
+    ContextVar("_definition_memo", default=None)
+)
+
+
+@contextmanager
+def definition_scope(memo: LRUCache[tuple[ast.expr, str]]):
+    """Memoize `definition()` results in memo within the context.
+
+    Keep the memo, and the tree whose nodes it is keyed by, to render
+    the same tree with many namespaces: the definition form of an
+    expression is then built once for all namespaces whose referenced
+    objects match (see `render_cache.get_definition_key()`).
+
+    Args:
+        memo: The cache to store the definitions in.
+    """
+
+    token = _definition_memo.set(memo)
+    try:
+        yield
+    finally:
+        _definition_memo.reset(token)
 
 
 def substitution(node: ast.expr, ns: dict[str, object] | None = None) -> str:
@@ -1,10 +1,14 @@
 """Functions to format source strings to LaTeX."""
 
+from __future__ import annotations
+
 import re
 import textwrap
+from dataclasses import dataclass
 
 from rubberize.config import config
 from rubberize.latexer import rules
+from rubberize.latexer.caches import LRUCache
 
 
 def format_name(name: str, *, call: bool = False) -> str:
@@ -13,12 +17,43 @@ def format_name(name: str, *, call: bool = False) -> str:
     Applies various transformations to format the name according to
     latex conventions.
 
+    Results are cached, keyed by the name and the config values that
+    affect formatting, so alternating between configs (e.g., with
+    per-statement modifiers) keeps the entries of each.
+
     Args:
         name: The name to format.
         call: If true, treat the name as a function call, applying
             `\\operatorname{}` to the base of the name.
     """
 
+    # pylint: disable-next=global-statement
+    global _name_options_version, _name_options
+
+    # the options are only gathered again when the config changed
+    if config.version != _name_options_version:
+        _name_options_version = config.version
+        _name_options = (
+            config.use_symbols,
+            config.use_subscripts,
+            frozenset(config.greek_starts),
+        )
+
+    key = (name, call, _name_options)
+    latex = name_cache.get(key)
+    if latex is None:
+        latex = _format_name(name, call)
+        name_cache.put(key, latex)
+
+    return latex
+
+
+name_cache: LRUCache[str] = LRUCache(maxsize=4096)
+_name_options_version = -1
+_name_options: tuple[bool, bool, frozenset[str]] | None = None
+
+
+def _format_name(name: str, call: bool) -> str:
     if config.use_symbols and name == "lambda_":
         # special case: a name "lambda" conflicts with the Python keyword
         return _wrap_part(r"\lambda", call)
@@ -201,6 +236,12 @@ def format_array(
     """Format a nested list of strings into a LaTeX representation of an
     array.
 
+    The nested list is laid out in one pass into blocks and inline
+    strings, and the blocks are written to a single buffer. Each line
+    is indented once for its nesting depth, instead of re-indenting the
+    whole text at every level as nested `format_delims()` calls would.
+    The output is the same.
+
     Args:
         array: The array to format.
         is_elt: Whether the input is an element of an array.
@@ -211,28 +252,105 @@ def format_array(
     if not isinstance(array, list):
         return array
 
-    elts = [format_array(a, is_elt=True) for a in array]
+    layout = _layout_array(array, is_elt, env)
+    if isinstance(layout, str):
+        return layout
+
+    parts: list[tuple[int, str]] = []
+    _write_block(layout, 0, parts)
+
+    return _join_indented(parts, 4)
+
+
+@dataclass
+class _Block:
+    """A delimited array whose text is laid out on multiple lines."""
 
+    left: str
+    sep: str
+    elts: list[str | _Block]
+    right: str
+
+
+def _layout_array(array: list, is_elt: bool, env: str | None) -> str | _Block:
     key = config.array_delimiter
 
     if all(not isinstance(a, list) for a in array):
         # 1D
         if is_elt:
             _, sep, _ = rules.ARRAY_ROW_SYNTAX[key]
-            return sep.join(elts)
+            return sep.join(array)
 
         # 2D
         if config.show_1d_as_col:
             prefix, sep, suffix = rules.ARRAY_COL_SYNTAX[key]
         else:
             prefix, sep, suffix = rules.ARRAY_ROW_SYNTAX[key]
+        elts: list[str | _Block] = array
 
     # <2D
     else:
         prefix, sep, suffix = rules.ARRAY_COL_SYNTAX[key]
+        elts = [
+            _layout_array(a, True, None) if isinstance(a, list) else a
+            for a in array
+        ]
 
     if env and not is_elt:
         prefix = r"\begin{" + env + "}"
         suffix = r"\end{" + env + "}"
 
-    return format_delims(prefix, sep.join(elts), suffix)
+    # same condition as format_delims(), without joining the text
+    is_block = (len(elts) > 1 and (r"\\" in sep or "\n" in sep)) or any(
+        isinstance(e, _Block) or r"\\" in e or "\n" in e for e in elts
+    )
+
+    if is_block:
+        return _Block(prefix, sep, elts, suffix)
+    return format_delims(prefix, sep.join(elts), suffix)  # type: ignore
+
+
+def _write_block(block: _Block, depth: int, parts: list[tuple[int, str]]):
+    parts.append((depth, block.left + "\n"))
+
+    for i, elt in enumerate(block.elts):
+        if i:
+            parts.append((depth + 1, block.sep))
+        if isinstance(elt, _Block):
+            _write_block(elt, depth + 1, parts)
+        else:
+            parts.append((depth + 1, elt))
+
+    parts.append((depth, "\n" + block.right))
+
+
+def _join_indented(parts: list[tuple[int, str]], indent: int) -> str:
+    """Join (depth, text) parts, indenting each non-blank line like
+    `textwrap.indent()` by the depth of the part where it starts.
+    """
+
+    text = "".join([t for _, t in parts])
+
+    # offsets where the depth changes, and the depth from there on
+    starts: list[int] = []
+    depths: list[int] = []
+    pos = 0
+    for depth, t in parts:
+        if not depths or depths[-1] != depth:
+            starts.append(pos)
+            depths.append(depth)
+        pos += len(t)
+
+    lines: list[str] = []
+    pos = 0
+    i = 0
+    for line in text.splitlines(True):
+        while i + 1 < len(starts) and starts[i + 1] <= pos:
+            i += 1
+        if depths[i] and line.strip():
+            lines.append(" " * (depths[i] * indent) + line)
+        else:
+            lines.append(line)
+        pos += len(line)
+
+    return "".join(lines)
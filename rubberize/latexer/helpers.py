@@ -3,16 +3,26 @@
 from __future__ import annotations
 
 import ast
+import builtins
 import copy
+import dataclasses
+import enum
 import inspect
 import re
-from types import ModuleType
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from fractions import Fraction
+from types import BuiltinFunctionType, CodeType, FunctionType, ModuleType
 from typing import TYPE_CHECKING, overload
 
 import rubberize.vendor.ast_comments as ast_c
 from rubberize._exceptions import RubberizeTypeError
 from rubberize.config import config, parse_modifiers
-from rubberize.latexer import rules
+from rubberize.latexer import optional_deps, rules
+from rubberize.latexer.caches import LRUCache
 
 if TYPE_CHECKING:
     from typing import Any, Callable, Mapping, Literal, Iterable, TypeVar
@@ -43,7 +53,12 @@ def get_object(node: ast.expr, ns: dict[str, object] | None) -> Any | None:
     locals.
 
     Deepcopy is needed to prevent changing mutable types when eval is
-    run.
+    run. It is skipped for objects that cannot be mutated, and for all
+    objects if the expression only makes calls known to be pure (see
+    `may_mutate()`).
+
+    Inside a `render_scope()`, the result is memoized per (node, ns)
+    pair, so the node is evaluated at most once during a render.
 
     Args:
         node: The ast.expr node to investigate.
@@ -54,6 +69,23 @@ def get_object(node: ast.expr, ns: dict[str, object] | None) -> Any | None:
         object cannot be retrieved or eval() fails.
     """
 
+    memo = _render_memo.get()
+    if memo is None:
+        return _get_object(node, ns)
+
+    key = (id(node), id(ns))
+    entry = memo.get(key)
+    if entry is not None and entry[0] is node and entry[1] is ns:
+        return entry[2]
+
+    obj = _get_object(node, ns)
+    # the entry keeps node and ns alive, so their ids are not reused
+    memo[key] = (node, ns, obj)
+
+    return obj
+
+
+def _get_object(node: ast.expr, ns: dict[str, object] | None) -> Any | None:
     if ns and isinstance(node, ast.Attribute):
         module = get_object(node.value, ns)
         if module is not None:
@@ -69,9 +101,10 @@ def get_object(node: ast.expr, ns: dict[str, object] | None) -> Any | None:
 
     try:
         if ns is None:
-            return eval(ast.unparse(node))  # pylint: disable=eval-used
+            return eval(compile_expr(node))  # pylint: disable=eval-used
 
         ref_names = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+        mutating = may_mutate(node, ns)
 
         ns_copy = {}
         for n in ref_names:
@@ -80,26 +113,226 @@ def get_object(node: ast.expr, ns: dict[str, object] | None) -> Any | None:
 
             n_obj = ns[n]
 
-            if isinstance(n_obj, ModuleType):
+            if not mutating or is_immutable(n_obj):
                 continue
 
-            try:
-                import pint  # pylint: disable=import-outside-toplevel
-
-                if isinstance(n_obj, (pint.UnitRegistry, pint.Quantity)):
-                    # Pint quantities use the same unit registry
-                    continue
-            except ImportError:
-                pass
+            # Pint quantities use the same unit registry
+            is_quantity = optional_deps.is_quantity(n_obj)
+            if is_quantity or optional_deps.is_unit_registry(n_obj):
+                continue
 
-            ns_copy[n] = copy.deepcopy(n_obj)
+            try:
+                ns_copy[n] = copy.deepcopy(n_obj)
+            except TypeError:
+                # e.g. a generator, which eval would consume
+                return None
 
-        return eval(ast.unparse(node), ns, ns_copy)  # pylint: disable=eval-used
+        return eval(compile_expr(node), ns, ns_copy)  # pylint: disable=eval-used
 
     except NameError:
         return None
 
 
+_render_memo: ContextVar[dict[tuple[int, int], tuple] | None] = ContextVar(
+    "_render_memo", default=None
+)
+
+
+@contextmanager
+def render_scope():
+    """Memoize `get_object()` results within the context.
+
+    A render inspects the same node several times (e.g., to check if it
+    is a unit, an array, and to get its value), and each inspection
+    would otherwise evaluate the node again. Nested scopes share the
+    outermost memo, which is discarded on exit.
+    """
+
+    if _render_memo.get() is not None:
+        yield
+        return
+
+    token = _render_memo.set({})
+    try:
+        yield
+    finally:
+        _render_memo.reset(token)
+
+
+_code_by_node: weakref.WeakKeyDictionary[ast.expr, CodeType] = (
+    weakref.WeakKeyDictionary()
+)
+_code_by_source: LRUCache[CodeType] = LRUCache(maxsize=1024)
+
+
+def compile_expr(node: ast.expr) -> CodeType:
+    """Compile the ast.expr node for eval().
+
+    The node is compiled directly, without unparsing it to source, and
+    the code object is cached for as long as the node is alive. Nodes
+    that cannot be compiled directly (e.g., targets with a Store
+    context, or nodes built without locations) are compiled from their
+    unparsed source, which is cached by the source string.
+
+    Args:
+        node: The ast.expr node to compile.
+    """
+
+    code = _code_by_node.get(node)
+    if code is not None:
+        return code
+
+    try:
+        code = compile(ast.Expression(body=node), "<rubberize>", "eval")
+    except (TypeError, ValueError):
+        source = ast.unparse(node)
+        code = _code_by_source.get(source)
+
+        if code is None:
+            code = compile(source, "<rubberize>", "eval")
+            _code_by_source.put(source, code)
+
+    _code_by_node[node] = code
+
+    return code
+
+
+_IMMUTABLE_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    range,
+    Decimal,
+    Fraction,
+    enum.Enum,
+    type,
+    FunctionType,
+    BuiltinFunctionType,
+    ModuleType,
+)
+
+_PURE_BUILTINS = frozenset(
+    getattr(builtins, f)
+    for f in (
+        "abs", "all", "any", "bin", "bool", "chr", "complex", "divmod",
+        "float", "format", "frozenset", "hash", "hex", "int", "isinstance",
+        "len", "max", "min", "oct", "ord", "pow", "range", "repr", "round",
+        "sorted", "str", "sum", "tuple",
+    )
+)  # fmt: skip
+
+
+def is_immutable(obj: object) -> bool:
+    """Check if the object cannot be changed in place, so that eval
+    can safely reference it without a copy.
+
+    Tuples, frozensets and frozen dataclasses are immutable only if all
+    their items are. Read-only NumPy arrays are immutable.
+
+    Args:
+        obj: The object to investigate.
+    """
+
+    if isinstance(obj, _IMMUTABLE_TYPES):
+        return True
+
+    if isinstance(obj, (tuple, frozenset)):
+        return all(is_immutable(o) for o in obj)
+
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # pylint: disable-next=protected-access
+        if not obj.__dataclass_params__.frozen:  # type: ignore[attr-defined]
+            return False
+        return all(
+            is_immutable(getattr(obj, f.name)) for f in dataclasses.fields(obj)
+        )
+
+    if optional_deps.is_np_generic(obj):
+        return True
+    if optional_deps.is_ndarray(obj):
+        return not obj.flags.writeable  # type: ignore[attr-defined]
+
+    return False
+
+
+def may_mutate(node: ast.expr, ns: dict[str, object]) -> bool:
+    """Check if evaluating the ast.expr node could change an object it
+    references.
+
+    Operators, subscripts and attribute access are assumed to be free
+    of side effects. A call is only considered pure if it calls a
+    builtin from a fixed allowlist, a `math` or `cmath` function, or a
+    NumPy ufunc without an `out` argument, by keyword or by position.
+    A builtin call is not pure if its arguments reference an iterator,
+    which it would consume, or if a keyword argument is a callable
+    (e.g., the `key` of `max()`).
+
+    Args:
+        node: The ast.expr node to investigate.
+        ns: Name and object mapping.
+    """
+
+    return any(
+        isinstance(n, ast.Call) and not _is_pure_call(n, ns)
+        for n in ast.walk(node)
+    )
+
+
+def _is_pure_call(node: ast.Call, ns: dict[str, object]) -> bool:
+    if any(kw.arg in (None, "out") for kw in node.keywords):
+        return False
+
+    func = _resolve_dotted(node.func, ns)
+    if func is None:
+        return False
+
+    try:
+        if func in _PURE_BUILTINS:
+            return _has_safe_builtin_args(node, ns)
+    except TypeError:  # unhashable
+        return False
+
+    if getattr(func, "__module__", None) in ("math", "cmath"):
+        return isinstance(func, BuiltinFunctionType)
+
+    if not optional_deps.is_ufunc(func):
+        return False
+
+    # outputs may also be given as positional arguments after the inputs
+    return len(node.args) <= func.nin and not any(  # type: ignore
+        isinstance(a, ast.Starred) for a in node.args
+    )
+
+
+def _has_safe_builtin_args(node: ast.Call, ns: dict[str, object]) -> bool:
+    for kw in node.keywords:
+        if isinstance(kw.value, ast.Lambda):
+            return False
+        if callable(_resolve_dotted(kw.value, ns)):
+            return False
+
+    args = [*node.args, *(kw.value for kw in node.keywords)]
+    return not any(
+        isinstance(n, ast.Name) and isinstance(ns.get(n.id), Iterator)
+        for a in args
+        for n in ast.walk(a)
+    )
+
+
+def _resolve_dotted(node: ast.expr, ns: dict[str, object]) -> object | None:
+    # only names and attribute chains, so nothing is called on the way
+    if isinstance(node, ast.Name):
+        return ns.get(node.id, getattr(builtins, node.id, None))
+    if isinstance(node, ast.Attribute):
+        value = _resolve_dotted(node.value, ns)
+        return getattr(value, node.attr, None) if value is not None else None
+    return None
+
+
 def get_func_object(
     node: ast.Call, ns: dict[str, object] | None
 ) -> Callable | None:
@@ -225,20 +458,18 @@ def is_class(node: ast.expr, cls: type, ns: dict[str, object] | None) -> bool:
 def is_unit(node: ast.expr, ns: dict[str, object] | None) -> bool:
     """Check if the ast.expr node references a Pint unit.
 
-    If Pint is not installed, returns False.
+    If Pint has not been imported, returns False.
 
     Args:
         node: The ast.expr node to investigate.
         ns: Name and object mapping.
     """
 
-    try:
-        import pint  # pylint: disable=import-outside-toplevel
-
-        return is_class(node, pint.Unit, ns)
-    except ImportError:
+    if ns is None or not optional_deps.pint.resolve():
         return False
 
+    return optional_deps.is_unit(get_object(node, ns))
+
 
 def is_unit_assignment(node: ast.BinOp, ns: dict[str, object] | None) -> bool:
     """Check if the ast.BinOp node represents an assignment of a Pint
@@ -255,20 +486,18 @@ def is_unit_assignment(node: ast.BinOp, ns: dict[str, object] | None) -> bool:
 def is_ndarray(node: ast.expr, ns: dict[str, object] | None) -> bool:
     """Check if the ast.expr node references a NumPy ndarray.
 
-    If NumPy is not installed, returns False.
+    If NumPy has not been imported, returns False.
 
     Args:
         node: The ast.expr node to investigate.
         ns: Name and object mapping.
     """
 
-    try:
-        import numpy as np  # pylint: disable=import-outside-toplevel
-
-        return is_class(node, np.ndarray, ns)
-    except ImportError:
+    if ns is None or not optional_deps.numpy.resolve():
         return False
 
+    return optional_deps.is_ndarray(get_object(node, ns))
+
 
 def get_mult_infix(node: ast.BinOp, left_latex: str, right_latex: str) -> str:
     """Get the appropriate sign for a multiplication ast.BinOp node.
@@ -326,6 +555,61 @@ def get_mult_infix(node: ast.BinOp, left_latex: str, right_latex: str) -> str:
     return rules.BIN_OPS[ast.Mult].infix
 
 
+_CALL_RE = (
+    r"(?:\\\w+ \\?\w+(?: \\?\w+)*"
+    # r"|\\sqrt(?:\[\d+\])?\{.*?\}"
+    r"|(?:\\operatorname\{[^}]+\}(?:_\{.*?\})?|\\\w+)"
+    r" \\left\([\s\S]*?\\right\))"
+)
+_CALL_PATTERNS = {
+    True: re.compile(f"{_CALL_RE}$"),
+    False: re.compile(f"^{_CALL_RE}"),
+}
+
+_BRACKET_PATTERNS = {
+    True: re.compile(r"(?:\\right[^ ,]+|\\end\{[^ },]+\})$"),
+    False: re.compile(r"^(?:\\left[^ ,]+|\\begin\{[^ },]+\})"),
+}
+
+_NUMBER_RE = (
+    r"-?\d{1,3}(?:(?:\\,|\{[,.]\}|\\text\{’\})?\d{3})*"
+    r"(?:(?:\.|\{,\})?\d+)?"
+)
+_NUMBER_PATTERNS = {
+    True: re.compile(f"{_NUMBER_RE}$"),
+    False: re.compile(f"^{_NUMBER_RE}"),
+}
+
+_word_patterns_cache: tuple[int, frozenset[str] | None, dict[bool, re.Pattern]]
+_word_patterns_cache = (-1, None, {})
+
+
+def _get_word_patterns() -> dict[bool, re.Pattern]:
+    """Return the word operand patterns, which depend on
+    `config.greek_starts`. They are rebuilt only when it changes.
+    """
+
+    global _word_patterns_cache  # pylint: disable=global-statement
+
+    version, greek_starts, patterns = _word_patterns_cache
+    if version == config.version:
+        return patterns
+    if greek_starts == config.greek_starts:
+        _word_patterns_cache = (config.version, greek_starts, patterns)
+        return patterns
+
+    greek_starts = frozenset(config.greek_starts)
+    greek_start_re = "|".join(map(re.escape, sorted(greek_starts)))
+    word_re = rf"(?:\\(?:{greek_start_re}) )?" + r"\\mathrm\{.+\}(_\{.*?\})?"
+    patterns = {
+        True: re.compile(rf"(?:^|\ |\\\,){word_re}$"),
+        False: re.compile(f"^{word_re}"),
+    }
+    _word_patterns_cache = (config.version, greek_starts, patterns)
+
+    return patterns
+
+
 # pylint: disable=too-many-return-statements,too-many-branches
 def get_operand_type(node: ast.expr, latex: str, is_left: bool) -> str:
     """Get the type of the ast.expr operand of an ast.BinOp node.
@@ -353,38 +637,6 @@ def get_operand_type(node: ast.expr, latex: str, is_left: bool) -> str:
     if latex == r"\mathrm{i}":
         return "L"
 
-    call_re = (
-        r"(?:\\\w+ \\?\w+(?: \\?\w+)*"
-        # r"|\\sqrt(?:\[\d+\])?\{.*?\}"
-        r"|(?:\\operatorname\{[^}]+\}(?:_\{.*?\})?|\\\w+)"
-        r" \\left\([\s\S]*?\\right\))"
-    )
-    call_patterns = {
-        True: re.compile(f"{call_re}$"),
-        False: re.compile(f"^{call_re}"),
-    }
-
-    bracket_patterns = {
-        True: re.compile(r"(?:\\right[^ ,]+|\\end\{[^ },]+\})$"),
-        False: re.compile(r"^(?:\\left[^ ,]+|\\begin\{[^ },]+\})"),
-    }
-
-    greek_start_re = "|".join(map(re.escape, config.greek_starts))
-    word_re = rf"(?:\\(?:{greek_start_re}) )?" + r"\\mathrm\{.+\}(_\{.*?\})?"
-    word_patterns = {
-        True: re.compile(rf"(?:^|\ |\\\,){word_re}$"),
-        False: re.compile(f"^{word_re}"),
-    }
-
-    number_re = (
-        r"-?\d{1,3}(?:(?:\\,|\{[,.]\}|\\text\{’\})?\d{3})*"
-        r"(?:(?:\.|\{,\})?\d+)?"
-    )
-    number_patterns = {
-        True: re.compile(f"{number_re}$"),
-        False: re.compile(f"^{number_re}"),
-    }
-
     while True:
         if isinstance(node, ast.BinOp):
             if isinstance(node.op, (ast.Div, ast.FloorDiv)):
@@ -410,14 +662,14 @@ def get_operand_type(node: ast.expr, latex: str, is_left: bool) -> str:
     if isinstance(node, ast.Call):
         if get_id(node.func) == "sqrt":
             return "B"
-        if call_patterns[is_left].search(latex):
+        if _CALL_PATTERNS[is_left].search(latex):
             return "C"
-    if bracket_patterns[is_left].search(latex):
+    if _BRACKET_PATTERNS[is_left].search(latex):
         return "B"
-    if word_patterns[is_left].search(latex):
+    if _get_word_patterns()[is_left].search(latex):
         return "W"
 
-    number_search = number_patterns[is_left].search(latex)
+    number_search = _NUMBER_PATTERNS[is_left].search(latex)
     if number_search:
         return "-N" if number_search.group(0).startswith("-") else "N"
 
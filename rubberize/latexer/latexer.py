@@ -2,15 +2,51 @@
 
 from __future__ import annotations
 
+import hashlib
+import pickle
 from typing import TYPE_CHECKING
 
 import rubberize.vendor.ast_comments as ast_c
+from rubberize.latexer.caches import LRUCache
+from rubberize.latexer.displays import definition_scope
 from rubberize.latexer.visitors import ModVisitor
 
 if TYPE_CHECKING:
+    from typing import Literal
     from rubberize.latexer.stmt_latex import StmtLatex
 
 
+# Trees are stored pickled: the bytes cannot be mutated by a visitor,
+# and unpickling a fresh tree is several times cheaper than a deepcopy.
+parse_cache: LRUCache[bytes] = LRUCache(maxsize=128)
+
+
+def parse_code(
+    code: str, mode: Literal["exec", "eval", "single"] = "exec"
+) -> ast_c.AST:
+    """Parse Python source code into an AST with comment nodes.
+
+    Parsed trees are cached by a hash of the source, so re-rendering
+    unchanged code skips both parsing and comment enrichment. Each call
+    returns a new tree that the caller is free to modify.
+
+    Args:
+        code: The code to parse.
+        mode: The mode passed to ast.parse().
+    """
+
+    key = (mode, hashlib.sha1(code.encode("utf-8")).digest())
+
+    cached = parse_cache.get(key)
+    if cached is not None:
+        return pickle.loads(cached)
+
+    tree = ast_c.parse(code, mode=mode)
+    parse_cache.put(key, pickle.dumps(tree, pickle.HIGHEST_PROTOCOL))
+
+    return tree
+
+
 def latex_from_ast(
     tree: ast_c.AST, ns: dict[str, object] | None
 ) -> list[StmtLatex]:
@@ -31,5 +67,40 @@ def latexer(code: str, ns: dict[str, object] | None) -> list[StmtLatex]:
         ns: Name and object mapping.
     """
 
-    tree = ast_c.parse(code)
+    tree = parse_code(code)
     return latex_from_ast(tree, ns)
+
+
+class LatexTemplate:
+    """Python source code parsed once, to be converted into LaTeX with
+    many namespaces.
+
+    `latexer()` parses the code and builds every display mode for each
+    call. A template keeps one tree and memoizes the definition form of
+    its expressions, so converting it with another namespace only
+    builds the substitution and result forms. A definition is reused
+    for a namespace whose referenced objects have the same types, for
+    plain numbers, arrays and quantities, or are the same, for other
+    objects and for the arguments of calls.
+
+    Args:
+        code: The code to convert.
+        maxsize: Maximum number of definitions to keep.
+    """
+
+    def __init__(self, code: str, *, maxsize: int = 4096) -> None:
+        self.code = code
+        self.tree = parse_code(code)
+        self.definitions: LRUCache[tuple[ast_c.expr, str]] = LRUCache(
+            maxsize=maxsize
+        )
+
+    def latex(self, ns: dict[str, object] | None) -> list[StmtLatex]:
+        """Get LaTeX for each stmt of the code.
+
+        Args:
+            ns: Name and object mapping.
+        """
+
+        with definition_scope(self.definitions):
+            return latex_from_ast(self.tree, ns)
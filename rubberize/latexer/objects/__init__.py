@@ -1,4 +1,8 @@
-"""Object converters."""
+"""Object converters.
+
+The NumPy and Pint converters are registered on first use, see
+`rubberize.latexer.optional_deps`.
+"""
 
 from rubberize.latexer.objects.convert_object import (
     convert_object,
@@ -6,15 +10,15 @@ from rubberize.latexer.objects.convert_object import (
 )
 from rubberize.latexer.objects import builtin_objects
 
-try:
-    # requires NumPy
-    from rubberize.latexer.objects import numpy_objects
-except ImportError:
-    pass
 
-try:
-    # requires Pint
-    from rubberize.latexer.objects import pint_objects
-    from rubberize.latexer.objects.pint_objects import register_units_latex
-except ImportError:
-    pass
+def __getattr__(name: str) -> object:
+    if name == "register_units_latex":
+        # requires Pint
+        try:
+            from rubberize.latexer.objects import pint_objects
+        except ImportError:
+            pass
+        else:
+            return pint_objects.register_units_latex
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
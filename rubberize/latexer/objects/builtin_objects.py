@@ -79,23 +79,33 @@ def convert_float(obj: float) -> ExprLatex:
     else:
         float_format = config.float_format
 
+    return _format_number_latex(format_float(obj, float_format))
+
+
+def format_float(obj: float, float_format: str) -> str:
+    """Format a finite float to a string with Python format specs,
+    before the thousands separator and decimal marker are applied.
+
+    Args:
+        obj: The float to format.
+        float_format: One of "FIX", "SCI", "GEN" or "ENG".
+    """
+
     if float_format == "FIX":
-        latex = f"{obj:,.{config.float_prec}f}"
-    elif float_format == "SCI":
-        latex = f"{obj:,.{config.float_prec}E}"
-    elif float_format == "GEN":
-        latex = f"{obj:,.{config.float_prec}G}"
-    elif float_format == "ENG":
+        return f"{obj:,.{config.float_prec}f}"
+    if float_format == "SCI":
+        return f"{obj:,.{config.float_prec}E}"
+    if float_format == "GEN":
+        return f"{obj:,.{config.float_prec}G}"
+    if float_format == "ENG":
         if obj != 0:
             exp = 3 * (math.floor(math.log10(abs(float(obj)))) // 3)
         else:
             exp = 0
         base = obj / 10**exp
-        latex = f"{base:,.{config.float_prec}f}E{int(exp):+03d}"
-    else:
-        raise RubberizeSyntaxError(f"Invalid format: {config.float_format}")
+        return f"{base:,.{config.float_prec}f}E{int(exp):+03d}"
 
-    return _format_number_latex(latex)
+    raise RubberizeSyntaxError(f"Invalid format: {config.float_format}")
 
 
 def _normalize_zero(num: float) -> float:
@@ -115,19 +125,10 @@ def _convert_special_float(obj: float | Decimal) -> ExprLatex | None:
 
 
 def _format_number_latex(latex: str) -> ExprLatex:
-    thousands = rules.THOUSANDS_SEPARATOR[config.thousands_separator]
-    decimal = rules.DECIMAL_MARKER[config.decimal_marker]
-    latex = latex.replace(".", "ddd").replace(",", "ttt")
-    latex = latex.replace("ddd", decimal).replace("ttt", thousands)
+    latex = localize_number(latex)
 
     if "E" in latex:
-        base, exp = latex.split("E")
-
-        if config.use_e_not:
-            latex = base + r"\mathrm{E}" + "{" + exp + "}"
-        else:
-            latex = base + r" \times 10^{" + str(int(exp)) + "}"
-
+        latex = format_e_notation(latex)
         rank = ranks.BELOW_MULT_RANK
         return ExprLatex(latex, rank)
 
@@ -136,6 +137,34 @@ def _format_number_latex(latex: str) -> ExprLatex:
     return ExprLatex(latex, rank)
 
 
+def localize_number(text: str) -> str:
+    """Replace "." and "," in formatted numbers with the configured
+    decimal marker and thousands separator.
+    """
+
+    thousands = rules.THOUSANDS_SEPARATOR[config.thousands_separator]
+    decimal = rules.DECIMAL_MARKER[config.decimal_marker]
+
+    if decimal != ".":
+        text = text.replace(".", "\ue000")
+    if thousands != ",":
+        text = text.replace(",", thousands)
+    if decimal != ".":
+        text = text.replace("\ue000", decimal)
+
+    return text
+
+
+def format_e_notation(latex: str) -> str:
+    """Convert the E part of a formatted number to LaTeX."""
+
+    base, exp = latex.split("E")
+
+    if config.use_e_not:
+        return base + r"\mathrm{E}" + "{" + exp + "}"
+    return base + r" \times 10^{" + str(int(exp)) + "}"
+
+
 def _complex(obj: complex) -> ExprLatex:
     """Converter for complex."""
 
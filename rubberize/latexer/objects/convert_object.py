@@ -4,11 +4,14 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from rubberize.latexer import optional_deps
+
 if TYPE_CHECKING:
     from typing import Any, Callable
     from rubberize.latexer.expr_latex import ExprLatex
 
 _object_converters: dict[type, Callable[[Any], ExprLatex | None]] = {}
+_dispatch_cache: dict[type, Callable[[Any], ExprLatex | None] | None] = {}
 
 
 def register_object_converter(
@@ -21,16 +24,41 @@ def register_object_converter(
         func: The converter function.
     """
 
+    if optional_deps.is_loading_converters() and cls in _object_converters:
+        # a lazily loaded built-in converter never replaces the user's
+        return
+
     _object_converters[cls] = func
+    _dispatch_cache.clear()
 
 
 def convert_object(obj: object) -> ExprLatex | None:
     """Convert an object to LaTex using a matching converter function."""
 
-    for cls in type(obj).__mro__:
+    obj_type = type(obj)
+
+    try:
+        converter = _dispatch_cache[obj_type]
+    except KeyError:
+        # an unseen type may come from a package imported since the
+        # last lookup
+        optional_deps.load_converters()
+        converter = _resolve_converter(obj_type)
+        _dispatch_cache[obj_type] = converter
+
+    if converter:
+        return converter(obj)
+
+    return None
+
+
+def _resolve_converter(
+    obj_type: type,
+) -> Callable[[Any], ExprLatex | None] | None:
+    for cls in obj_type.__mro__:
         converter = _object_converters.get(cls)
 
         if converter:
-            return converter(obj)
+            return converter
 
     return None
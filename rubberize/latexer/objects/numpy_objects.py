@@ -4,42 +4,350 @@ from __future__ import annotations
 
 import numpy as np
 
-from rubberize.latexer import formatters, ranks
+from rubberize.config import config
+from rubberize.latexer import formatters, ranks, rules
 from rubberize.latexer.expr_latex import ExprLatex
+from rubberize.latexer.objects import builtin_objects
+from rubberize.latexer.objects.builtin_objects import convert_str
 from rubberize.latexer.objects.convert_object import (
     register_object_converter,
     convert_object,
 )
 
 
-def _ndarray(obj: np.ndarray) -> ExprLatex | None:
-    """Converter for np.ndarray."""
+def _ndarray(
+    obj: np.ndarray, mask: np.ndarray | None = None
+) -> ExprLatex | None:
+    """Converter for np.ndarray.
 
-    def build(arr: np.ndarray):
-        if arr.ndim == 1:
-            parts: list = []
+    Arrays larger than `config.max_array_rows` or `config.max_array_cols`
+    are elided: only the first and last elements along each such axis
+    are converted, and the hidden elements are replaced by dots.
 
-            for a in arr:
-                elt = convert_object(a)
-                if elt is None:
-                    return None
+    Args:
+        obj: The array to convert.
+        mask: Optional boolean array of the same shape. Elements where
+            the mask is True are left blank.
+    """
 
-                parts.append(elt.latex)
+    if obj.dtype.names is not None and obj.ndim == 1:
+        if all(obj.dtype[n].shape == () for n in obj.dtype.names):
+            return _structured(obj, mask)
 
-            return parts
+    limits = _get_axis_limits(obj)
+    splits = [_get_split(n, limit) for n, limit in zip(obj.shape, limits)]
 
-        return [build(sub) for sub in arr]
+    shown = obj
+    for axis, split in enumerate(splits):
+        if split is not None:
+            index = _get_shown_index(obj.shape[axis], split)
+            shown = shown.take(index, axis=axis)
+            if mask is not None:
+                mask = mask.take(index, axis=axis)
 
-    arr = build(obj)
+    arr = _build_vectorized(shown)
+    if arr is None:
+        arr = _build(shown)
     if arr is None:
         return None
 
+    if mask is not None:
+        arr = _blank_masked(arr, _collapse_mask(mask).tolist())
+
+    if any(splits):
+        col = obj.ndim == 1 and config.show_1d_as_col
+        arr = _insert_dots(arr, splits, r"\vdots" if col else r"\cdots")
+
     latex = formatters.format_array(arr)
     rank = ranks.COLLECTIONS_RANK
 
     return ExprLatex(latex, rank)
 
 
+def _structured(
+    obj: np.ndarray, mask: np.ndarray | None = None
+) -> ExprLatex | None:
+    """Convert a 1D structured array to a table with a header row of
+    field names. Each field is formatted as one column.
+    """
+
+    names = list(obj.dtype.names)
+    row_split = _get_split(len(obj), config.max_array_rows)
+    col_split = _get_split(len(names), config.max_array_cols)
+
+    if row_split is not None:
+        index = _get_shown_index(len(obj), row_split)
+        obj = obj.take(index)
+        if mask is not None:
+            mask = mask.take(index)
+    if col_split is not None:
+        names = [names[i] for i in _get_shown_index(len(names), col_split)]
+
+    cols: list[list[str]] = []
+    for name in names:
+        col = _build_vectorized(obj[name])
+        if col is None:
+            col = _build(obj[name])
+        if col is None:
+            return None
+
+        if mask is not None:
+            col = _blank_masked(col, _collapse_mask(mask[name]).tolist())
+        cols.append(col)
+
+    header = [_get_field_label(n) for n in names]
+    rows = [list(row) for row in zip(*cols)]
+
+    if row_split is not None or col_split is not None:
+        rows = _insert_dots(rows, [row_split, col_split], r"\cdots")
+        header = _insert_dots(header, [col_split], r"\cdots")
+
+    _, row_sep, _ = rules.ARRAY_ROW_SYNTAX[config.array_delimiter]
+    _, col_sep, _ = rules.ARRAY_COL_SYNTAX[config.array_delimiter]
+
+    text = row_sep.join(header) + r" \\ \hline"
+    if rows:
+        text += " " + col_sep.join(row_sep.join(row) for row in rows)
+
+    prefix = r"\begin{array}{" + "c" * len(header) + "}"
+    latex = formatters.format_delims(prefix, text, r"\end{array}")
+    rank = ranks.COLLECTIONS_RANK
+
+    return ExprLatex(latex, rank)
+
+
+def _get_field_label(name: str) -> str:
+    if name.isidentifier():
+        return formatters.format_name(name)
+
+    with config.override(str_quotes=""):
+        return convert_str(name).latex
+
+
+def _masked_array(obj: np.ma.MaskedArray) -> ExprLatex | None:
+    """Converter for np.ma.MaskedArray. Masked elements are blank."""
+
+    mask = np.ma.getmaskarray(obj)
+
+    if obj.ndim == 0:
+        if _collapse_mask(mask):
+            return ExprLatex("")
+        return convert_object(obj.data[()])
+
+    return _ndarray(obj.data, mask)
+
+
+def _get_shown_index(n: int, split: tuple[int, int]) -> np.ndarray:
+    head, tail = split
+    return np.r_[0:head, n - tail : n]
+
+
+def _collapse_mask(mask: np.ndarray) -> np.ndarray:
+    """Collapse a structured mask to a boolean array of the same shape.
+    An element is masked only if all of its fields are masked.
+    """
+
+    if mask.dtype.names is None:
+        return mask
+
+    fields = [
+        _collapse_mask(mask[n]).reshape(mask.shape + (-1,)).all(axis=-1)
+        for n in mask.dtype.names
+    ]
+    return np.logical_and.reduce(fields)
+
+
+def _blank_masked(arr: list, mask: list) -> list:
+    """Replace the elements of the nested list where mask is True with
+    blanks.
+    """
+
+    return [
+        _blank_masked(a, m) if isinstance(a, list) else ("" if m else a)
+        for a, m in zip(arr, mask)
+    ]
+
+
+def _get_axis_limits(arr: np.ndarray) -> list[int]:
+    """Return the maximum number of displayed elements for each axis.
+    The last axis is displayed as columns, except for 1D arrays shown
+    as a column.
+    """
+
+    rows, cols = config.max_array_rows, config.max_array_cols
+
+    if arr.ndim == 1:
+        return [rows if config.show_1d_as_col else cols]
+    return [rows] * (arr.ndim - 1) + [cols]
+
+
+def _get_split(n: int, limit: int) -> tuple[int, int] | None:
+    """Return the number of leading and trailing elements to display
+    for an axis of length n, or None if the whole axis is displayed.
+    """
+
+    if limit <= 0 or n <= limit:
+        return None
+
+    tail = limit // 2
+    return limit - tail, tail
+
+
+def _insert_dots(
+    arr: list, splits: list[tuple[int, int] | None], col_dots: str
+) -> list:
+    """Insert dots into the nested list of the displayed elements where
+    elements were hidden.
+
+    Args:
+        arr: Nested list of the displayed elements.
+        splits: The (head, tail) split of each axis, or None if the
+            whole axis is displayed.
+        col_dots: Dots for the hidden elements of the last axis.
+    """
+
+    split, *sub_splits = splits
+
+    if sub_splits:
+        arr = [_insert_dots(a, sub_splits, col_dots) for a in arr]
+
+    if split is None:
+        return arr
+
+    dots: str | list
+    if not sub_splits:
+        dots = col_dots
+    elif len(sub_splits) == 1:
+        # a row of dots, with \ddots where it crosses the hidden columns
+        dots = [r"\vdots"] * len(arr[0])
+        if sub_splits[0] is not None:
+            dots[sub_splits[0][0]] = r"\ddots"
+    else:
+        # a block of the shape of the displayed subarrays
+        dots = _fill_like(arr[0], r"\vdots")
+
+    head = split[0]
+    return arr[:head] + [dots] + arr[head:]
+
+
+def _fill_like(arr: list, fill: str) -> list:
+    """Return a nested list of the shape of arr filled with fill."""
+
+    return [_fill_like(a, fill) if isinstance(a, list) else fill for a in arr]
+
+
+def _build(arr: np.ndarray) -> list | None:
+    """Convert each element of the array with `convert_object()` into a
+    nested list of LaTeX strings.
+    """
+
+    if arr.ndim == 1:
+        parts: list = []
+
+        for a in arr:
+            elt = convert_object(a)
+            if elt is None:
+                return None
+
+            parts.append(elt.latex)
+
+        return parts
+
+    return [_build(sub) for sub in arr]
+
+
+def _build_vectorized(arr: np.ndarray) -> list | None:
+    """Format a real numeric array in one pass into a nested list of
+    LaTeX strings, or return None if the array is not supported.
+
+    The output is the same as `_build()`, which formats each element
+    with `convert_int()` or `convert_float()`.
+    """
+
+    if arr.ndim == 0 or arr.size == 0:
+        return None
+
+    if arr.dtype.kind in "iu":
+        elts = _format_ints(arr.ravel())
+    elif (
+        arr.dtype.kind == "f"
+        and arr.dtype.itemsize <= 8
+        and config.float_format in ("FIX", "SCI", "GEN", "ENG")
+    ):
+        elts = _format_floats(arr.ravel().astype(np.float64))
+    else:
+        return None
+
+    for n in reversed(arr.shape[1:]):
+        elts = [elts[i : i + n] for i in range(0, len(elts), n)]
+
+    return elts
+
+
+def _format_ints(flat: np.ndarray) -> list[str]:
+    thousands = rules.THOUSANDS_SEPARATOR[config.thousands_separator]
+    text = "\n".join([f"{v:,d}" for v in flat.tolist()])
+
+    return text.replace(",", thousands).split("\n")
+
+
+_FORMAT_TYPES = {"FIX": "f", "SCI": "E", "GEN": "G"}
+
+
+def _format_floats(flat: np.ndarray) -> list[str]:
+    # pylint: disable=too-many-locals
+
+    # normalize zero (and negative zero) like convert_float()
+    absolute = np.abs(flat)
+    flat = np.where(absolute <= config.zero_float_threshold, 0.0, flat) + 0.0
+    absolute = np.abs(flat)
+
+    finite = np.isfinite(flat)
+    groups = {config.float_format: finite}
+
+    if config.float_format == "FIX":
+        prec = config.float_prec
+        tiny = finite & (absolute > 0.0) & (absolute < 10 ** (-prec))
+        sci = finite & (absolute >= 10**config.float_max_digits)
+
+        # np.round() is not correctly rounded, so check with round()
+        tiny_idx = np.flatnonzero(tiny)
+        tiny_zero = [round(v, prec) == 0.0 for v in flat[tiny_idx].tolist()]
+        sci[tiny_idx[tiny_zero]] = True
+
+        groups = {"FIX": finite & ~sci, "SCI": sci}
+
+    values = flat.tolist()
+    strs: list[str] = [""] * len(values)
+
+    for float_format, mask in groups.items():
+        if float_format == "ENG":
+            for i in np.flatnonzero(mask).tolist():
+                strs[i] = builtin_objects.format_float(values[i], "ENG")
+        elif mask.all():
+            spec = f",.{config.float_prec}{_FORMAT_TYPES[float_format]}"
+            strs = [format(v, spec) for v in values]
+        else:
+            spec = f",.{config.float_prec}{_FORMAT_TYPES[float_format]}"
+            for i in np.flatnonzero(mask).tolist():
+                strs[i] = format(values[i], spec)
+
+    strs = builtin_objects.localize_number("\n".join(strs)).split("\n")
+
+    for i, s in enumerate(strs):
+        if "E" in s:
+            strs[i] = builtin_objects.format_e_notation(s)
+
+    for i in np.flatnonzero(~finite).tolist():
+        v = values[i]
+        if np.isnan(v):
+            strs[i] = r"\text{NaN}"
+        else:
+            strs[i] = r"-\infty" if v < 0 else r"\infty"
+
+    return strs
+
+
 def _generic(obj: np.generic) -> ExprLatex | None:
     """Converter for np.generic, which is the base class for all NumPy
     scalars.
@@ -49,4 +357,5 @@ def _generic(obj: np.generic) -> ExprLatex | None:
 
 
 register_object_converter(np.ndarray, _ndarray)
+register_object_converter(np.ma.MaskedArray, _masked_array)
 register_object_converter(np.generic, _generic)
@@ -1,6 +1,10 @@
 """Converters for Pint objects.
 
 Custom units LaTeX can be registered using register_units_latex.
+
+The LaTeX of each unit is cached by its unit container, its registry
+and the config options that affect it. Call `units_latex_cache.clear()`
+after changing the formatter settings of a registry.
 """
 
 from __future__ import annotations
@@ -12,6 +16,7 @@ import pint
 
 from rubberize.config import config
 from rubberize.latexer import formatters, ranks, rules
+from rubberize.latexer.caches import LRUCache
 from rubberize.latexer.expr_latex import ExprLatex
 from rubberize.latexer.objects.convert_object import (
     convert_object,
@@ -20,6 +25,7 @@ from rubberize.latexer.objects.convert_object import (
 
 
 _custom_units_latex: dict[frozenset[tuple[str, object]], str] = {}
+units_latex_cache: LRUCache[str] = LRUCache(maxsize=1024)
 
 
 def register_units_latex(latex: str, **kwargs: object) -> None:
@@ -37,6 +43,7 @@ def register_units_latex(latex: str, **kwargs: object) -> None:
     """
 
     _custom_units_latex[frozenset(kwargs.items())] = latex
+    units_latex_cache.clear()
 
 
 def _quantity(obj: pint.Quantity) -> ExprLatex | None:
@@ -47,14 +54,16 @@ def _quantity(obj: pint.Quantity) -> ExprLatex | None:
     if mag is None:
         return None
 
-    if config.use_fif_units and obj.units in ("foot", "inch"):
+    # array magnitudes are converted at once, so only scalars can use
+    # the compound foot-inch and degree-minute-second formats
+    is_scalar = getattr(obj.magnitude, "ndim", 0) == 0
+
+    if is_scalar and config.use_fif_units and obj.units in ("foot", "inch"):
         return _foot_inch_fraction(obj)
-    if config.use_dms_units and obj.units == "degree":
+    if is_scalar and config.use_dms_units and obj.units == "degree":
         return _degree_minute_second(obj)
 
-    units = frozenset((u, p) for u, p in obj.unit_items())
-    units_latex = _custom_units_latex.get(units, f"{obj.units:~L}")
-    units_latex = _format_units_latex(units_latex)
+    units_latex = _get_units_latex(obj.units)
 
     if mag.rank <= ranks.BELOW_MULT_RANK:
         prefix, suffix = rules.OPERAND_SYNTAX
@@ -69,6 +78,30 @@ def _quantity(obj: pint.Quantity) -> ExprLatex | None:
     return mag
 
 
+def _get_units_latex(units: pint.Unit) -> str:
+    """Return the formatted LaTeX of the units, using the cache."""
+
+    key = (
+        units._units,  # pylint: disable=protected-access
+        units._REGISTRY,  # pylint: disable=protected-access
+        config.use_contextual_mult,
+        config.use_inline_units,
+    )
+
+    latex = units_latex_cache.get(key)
+    if latex is None:
+        # pylint: disable-next=protected-access
+        items = frozenset(dict(units._units).items())
+        latex = _custom_units_latex.get(items)
+        if latex is None:
+            latex = f"{units:~L}"
+
+        latex = _format_units_latex(latex)
+        units_latex_cache.put(key, latex)
+
+    return latex
+
+
 def _format_units_latex(latex: str) -> str:
     if config.use_contextual_mult:
         latex = latex.replace(r" \cdot ", r"\,")
@@ -189,11 +222,7 @@ def _degree_minute_second(obj: pint.Quantity) -> ExprLatex:
 def _unit(obj: pint.Unit) -> ExprLatex:
     """Converter for pint Quantity type object."""
 
-    # pylint: disable-next=protected-access
-    units = frozenset((u, p) for u, p in dict(obj._units).items())
-    latex = _custom_units_latex.get(units, f"{obj:~L}")
-
-    latex = _format_units_latex(latex)
+    latex = _get_units_latex(obj)
     rank = ranks.VALUE_RANK
 
     return ExprLatex(latex, rank)
@@ -0,0 +1,247 @@
+"""Registry of optional dependencies.
+
+NumPy and Pint are optional. Instead of importing them in every helper
+call, their key classes are resolved once and shared by the `is_*()`
+probes below.
+
+A probe never imports a package. An object can only be an instance of
+a NumPy or Pint class if the package has already been imported, so
+until then the probe is a single `sys.modules` lookup that returns
+False, with no exception handling for a missing package.
+
+The modules that register the NumPy and Pint object and call converters
+are not imported with `rubberize` either. `load_converters()` imports
+them on first use, once the package has been imported by the user. A
+namespace cannot contain a NumPy or Pint object before that. A call
+written with the module alias of a package that is not imported yet
+(e.g., `np.cross(a, b)`) loads the package's converters with
+`load_converters_for()`. As they
+may be registered after the user's own converters, a converter
+registered while they are being loaded does not replace an existing
+one (see `is_loading_converters()`).
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from types import ModuleType
+
+
+class _OptionalDependency:
+    """An optional package whose classes are resolved once it has been
+    imported.
+
+    Args:
+        name: Name of the top-level package.
+        attrs: Names of the classes to resolve from the package.
+        converters: Names of the modules that register converters for
+            the package.
+        aliases: Names the package is commonly imported as.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *attrs: str,
+        converters: tuple[str, ...] = (),
+        aliases: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.converters = converters
+        self.aliases = frozenset((name, *aliases))
+        self.module: ModuleType | None = None
+        self.classes: dict[str, type] = {}
+        self.converters_loaded = False
+
+    def resolve(self) -> bool:
+        """Resolve the classes if the package has been imported.
+
+        Returns:
+            True if the package is imported and its classes resolved.
+        """
+
+        if self.module is not None:
+            return True
+
+        module = sys.modules.get(self.name)
+        if module is None:
+            return False
+
+        try:
+            classes = {a: getattr(module, a) for a in self.attrs}
+        except AttributeError:
+            # the package is still being imported
+            return False
+
+        self.classes = classes
+        self.module = module
+        return True
+
+    def is_instance(self, obj: object, attr: str) -> bool:
+        """Check if obj is an instance of the named class."""
+
+        if self.module is None and not self.resolve():
+            return False
+
+        return isinstance(obj, self.classes[attr])
+
+    def load_converters(self, *, import_package: bool = False) -> bool:
+        """Import the converter modules if the package has been imported.
+
+        Args:
+            import_package: If True, import the package if it is
+                installed but not imported yet.
+
+        Returns:
+            True if there is nothing left to load for the package.
+        """
+
+        if self.converters_loaded:
+            return True
+
+        if not import_package and not self.resolve():
+            return False
+
+        # pylint: disable-next=global-statement
+        global _loading_converters
+
+        loading = _loading_converters
+        _loading_converters = True
+        try:
+            for converter in self.converters:
+                importlib.import_module(converter)
+        except ImportError:
+            # the package is not installed
+            pass
+        finally:
+            _loading_converters = loading
+
+        self.converters_loaded = True
+        return True
+
+
+numpy = _OptionalDependency(
+    "numpy",
+    "ndarray",
+    "generic",
+    "ufunc",
+    converters=(
+        "rubberize.latexer.objects.numpy_objects",
+        "rubberize.latexer.calls.numpy_calls",
+    ),
+    aliases=("np",),
+)
+pint = _OptionalDependency(
+    "pint",
+    "Quantity",
+    "Unit",
+    "UnitRegistry",
+    converters=(
+        "rubberize.latexer.objects.pint_objects",
+        "rubberize.latexer.calls.pint_calls",
+    ),
+)
+
+_all_converters_loaded = False
+_loading_converters = False
+
+
+def is_loading_converters() -> bool:
+    """Check if the NumPy or Pint converters are being registered by
+    `load_converters()`. The registration functions then keep the
+    converters that are already registered, e.g. by the user.
+    """
+
+    return _loading_converters
+
+
+def load_converters(*, import_packages: bool = False) -> None:
+    """Register the NumPy and Pint converters for the packages that have
+    been imported.
+
+    After all converters are loaded, this is a single global lookup.
+
+    Args:
+        import_packages: If True, also import the installed packages
+            that have not been imported yet.
+    """
+
+    # pylint: disable-next=global-statement
+    global _all_converters_loaded
+
+    if _all_converters_loaded:
+        return
+
+    loaded = [
+        dep.load_converters(import_package=import_packages)
+        for dep in (numpy, pint)
+    ]
+    _all_converters_loaded = all(loaded)
+
+
+def load_converters_for(alias: str, obj: object = None) -> bool:
+    """Register the converters of the package a call is made through,
+    importing the package if needed.
+
+    Args:
+        alias: The leftmost name of the called attribute chain, e.g.,
+            `np` of `np.linalg.det`.
+        obj: The object alias refers to in the namespace, if any. A
+            module names its package, whatever its alias.
+
+    Returns:
+        True if converters were loaded.
+    """
+
+    if isinstance(obj, ModuleType):
+        package = obj.__name__.partition(".")[0]
+        deps = [dep for dep in (numpy, pint) if dep.name == package]
+    elif obj is None:
+        deps = [dep for dep in (numpy, pint) if alias in dep.aliases]
+    else:
+        return False
+
+    loaded = False
+    for dep in deps:
+        if not dep.converters_loaded:
+            loaded = dep.load_converters(import_package=True)
+
+    return loaded
+
+
+def is_ndarray(obj: object) -> bool:
+    """Check if obj is a NumPy ndarray."""
+
+    return numpy.is_instance(obj, "ndarray")
+
+
+def is_np_generic(obj: object) -> bool:
+    """Check if obj is a NumPy scalar."""
+
+    return numpy.is_instance(obj, "generic")
+
+
+def is_ufunc(obj: object) -> bool:
+    """Check if obj is a NumPy ufunc."""
+
+    return numpy.is_instance(obj, "ufunc")
+
+
+def is_unit(obj: object) -> bool:
+    """Check if obj is a Pint unit."""
+
+    return pint.is_instance(obj, "Unit")
+
+
+def is_quantity(obj: object) -> bool:
+    """Check if obj is a Pint quantity."""
+
+    return pint.is_instance(obj, "Quantity")
+
+
+def is_unit_registry(obj: object) -> bool:
+    """Check if obj is a Pint unit registry."""
+
+    return pint.is_instance(obj, "UnitRegistry")
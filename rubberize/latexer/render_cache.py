@@ -0,0 +1,279 @@
+"""Opt-in cache of generated StmtLatex.
+
+When `config.use_render_cache` is enabled, StmtVisitor.visit_body()
+looks up each statement in `render_cache` before visiting it. The key
+combines three parts:
+
+1.  A dump of the statement node. Unlike ast.unparse(), the dump keeps
+    comment nodes, which carry descriptions and config modifiers.
+2.  A snapshot of the config values in effect.
+3.  A fingerprint of every namespace object the statement references by
+    name.
+
+Scalars are fingerprinted by value, the buffers of NumPy arrays and
+containers by a hash of their contents, and long-lived objects (e.g.,
+modules, functions and Pint unit registries) by identity. Other
+objects are pickled and hashed.
+
+Any change to the source, the config, or a referenced value is a miss.
+A value reached only indirectly (e.g., a global read inside a called
+function) is not part of the key, so clear the cache with
+`render_cache.clear()` if such a value changes.
+
+`get_definition_key()` builds the looser key of the definition memo of
+a `displays.definition_scope()`, which is shared by the renders of one
+statement with many namespaces.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import pickle
+import weakref
+from decimal import Decimal
+from fractions import Fraction
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import TYPE_CHECKING
+
+from rubberize.config import config
+from rubberize.latexer import optional_deps
+from rubberize.latexer.caches import LRUCache
+from rubberize.latexer.calls import has_call_converter
+
+if TYPE_CHECKING:
+    from typing import Hashable
+    from rubberize.latexer.stmt_latex import StmtLatex
+
+
+render_cache: LRUCache[StmtLatex] = LRUCache(maxsize=1024)
+
+_SCALAR_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    Decimal,
+    Fraction,
+)
+_IDENTITY_TYPES = (
+    type,
+    ModuleType,
+    FunctionType,
+    BuiltinFunctionType,
+    MethodType,
+)
+_MISSING = object()
+
+
+class _Unfingerprintable(Exception):
+    """Raised when a referenced object cannot be fingerprinted."""
+
+
+class _Ref:
+    """Identity key of an object. Keeping a reference prevents the id
+    from being reused.
+    """
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: object) -> None:
+        self.obj = obj
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Ref) and other.obj is self.obj
+
+    def __hash__(self) -> int:
+        return id(self.obj)
+
+
+def get_stmt_key(
+    node: ast.stmt, ns: dict[str, object] | None
+) -> Hashable | None:
+    """Return the render cache key for the ast.stmt node, or None if the
+    statement references an object that cannot be fingerprinted.
+
+    Args:
+        node: The ast.stmt node to investigate.
+        ns: Name and object mapping.
+    """
+
+    names = sorted({n.id for n in ast.walk(node) if isinstance(n, ast.Name)})
+
+    try:
+        values = tuple(
+            (n, _fingerprint(ns.get(n, _MISSING) if ns else _MISSING))
+            for n in names
+        )
+    except (_Unfingerprintable, RecursionError):
+        return None
+
+    return (ast.dump(node), config.snapshot(), ns is None, values)
+
+
+def _fingerprint(obj: object) -> Hashable:
+    if obj is _MISSING:
+        return _MISSING
+    if isinstance(obj, _SCALAR_TYPES):
+        return (type(obj), obj)
+    if isinstance(obj, _IDENTITY_TYPES) or optional_deps.is_unit_registry(
+        obj
+    ):
+        return (type(obj), _Ref(obj))
+
+    if isinstance(obj, (list, tuple)):
+        return (type(obj), tuple(_fingerprint(o) for o in obj))
+    if isinstance(obj, dict):
+        return (
+            type(obj),
+            tuple((_fingerprint(k), _fingerprint(v)) for k, v in obj.items()),
+        )
+
+    if optional_deps.is_ndarray(obj) or optional_deps.is_np_generic(obj):
+        return _array_fingerprint(obj)
+    if optional_deps.is_unit(obj):
+        return (type(obj), _Ref(obj._REGISTRY), obj._units)  # type: ignore
+    if optional_deps.is_quantity(obj):
+        return (
+            type(obj),
+            _fingerprint(obj.magnitude),  # type: ignore[attr-defined]
+            _fingerprint(obj.units),  # type: ignore[attr-defined]
+        )
+
+    try:
+        data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        raise _Unfingerprintable from e
+
+    return (type(obj), hashlib.blake2b(data, digest_size=16).digest())
+
+
+def _array_fingerprint(obj: object) -> Hashable:
+    """Hash the buffer of a NumPy array or scalar without copying it,
+    unless it is not contiguous. Arrays of objects are fingerprinted by
+    element.
+    """
+
+    # pylint: disable-next=import-outside-toplevel
+    import numpy as np
+
+    arr = np.asarray(obj)
+    if arr.dtype.hasobject:
+        elements = tuple(_fingerprint(o) for o in arr.flat)
+        return (type(obj), arr.shape, elements)
+
+    data = hashlib.blake2b(np.ascontiguousarray(arr).data, digest_size=16)
+    return (type(obj), arr.dtype.str, arr.shape, data.digest())
+
+
+def get_definition_key(
+    node: ast.expr, ns: dict[str, object]
+) -> Hashable | None:
+    """Return the key of the definition LaTeX of the ast.expr node, or
+    None if the node references an object that cannot be fingerprinted.
+
+    The definition form never shows the value of a plain number, array
+    or quantity, only whether a name is bound to one. These are keyed
+    by their type, so the definition is shared by namespaces that only
+    differ in such values. Other objects (e.g., functions, modules,
+    units and unit registries), arrays of objects, the base of every
+    attribute access (e.g., `q` of `q.units`, which is rendered if it
+    is a unit), and every name in the arguments of a call with a
+    converter, which may look at their values, are keyed by their
+    fingerprint. A unit registry is keyed by identity, so a template
+    of unit expressions reuses its definitions.
+
+    Args:
+        node: The ast.expr node to investigate.
+        ns: Name and object mapping.
+    """
+
+    names = _names_by_node.get(node)
+    if names is None:
+        names = _get_names(node)
+        _names_by_node[node] = names
+
+    all_names, attr_names, calls = names
+
+    value_names = set(attr_names)
+    for call, arg_names in calls:
+        if arg_names and has_call_converter(call, ns):
+            value_names.update(arg_names)
+
+    try:
+        values = tuple(
+            (
+                n,
+                (
+                    _fingerprint(ns.get(n, _MISSING))
+                    if n in value_names
+                    else _data_fingerprint(ns.get(n, _MISSING))
+                ),
+            )
+            for n in all_names
+        )
+    except (_Unfingerprintable, RecursionError):
+        return None
+
+    return (id(node), config.snapshot(), values)
+
+
+_Names = tuple[
+    tuple[str, ...],
+    frozenset[str],
+    tuple[tuple[ast.Call, frozenset[str]], ...],
+]
+
+_names_by_node: weakref.WeakKeyDictionary[ast.expr, _Names] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_names(node: ast.expr) -> _Names:
+    """Get the names referenced by the node, the names referenced by
+    the bases of its attribute accesses, and the calls of the node with
+    the names referenced by their arguments.
+    """
+
+    names = sorted({n.id for n in ast.walk(node) if isinstance(n, ast.Name)})
+
+    attr_names = frozenset(
+        n.id
+        for attr in ast.walk(node)
+        if isinstance(attr, ast.Attribute)
+        for n in ast.walk(attr.value)
+        if isinstance(n, ast.Name)
+    )
+
+    calls = []
+    for call in ast.walk(node):
+        if isinstance(call, ast.Call):
+            args = [*call.args, *(k.value for k in call.keywords)]
+            arg_names = frozenset(
+                n.id
+                for a in args
+                for n in ast.walk(a)
+                if isinstance(n, ast.Name)
+            )
+            calls.append((call, arg_names))
+
+    return tuple(names), attr_names, tuple(calls)
+
+
+def _data_fingerprint(obj: object) -> Hashable:
+    if optional_deps.is_ndarray(obj):
+        # an array of objects may hold units
+        if obj.dtype.hasobject:  # type: ignore[attr-defined]
+            return _fingerprint(obj)
+        return type(obj)
+
+    if isinstance(obj, _SCALAR_TYPES) or (
+        optional_deps.is_np_generic(obj)
+        or optional_deps.is_quantity(obj)
+    ):
+        return type(obj)
+
+    return _fingerprint(obj)
@@ -6,6 +6,7 @@ import ast
 from typing import TYPE_CHECKING
 
 from rubberize._exceptions import RubberizeNotImplementedError
+from rubberize.latexer import helpers
 from rubberize.latexer.visitors import StmtVisitor
 
 if TYPE_CHECKING:
@@ -23,9 +24,9 @@ class ModVisitor(ast.NodeVisitor):
         super().__init__()
         self.ns = ns
 
-    # pylint: disable-next=useless-parent-delegation
     def visit(self, node: ast.AST) -> list[StmtLatex]:
-        return super().visit(node)
+        with helpers.render_scope():
+            return super().visit(node)
 
     def generic_visit(self, node: ast.AST) -> list[StmtLatex]:
         """Called if no visitor method is defined for a node."""
@@ -1,6 +1,7 @@
 """Node visitor for stmt nodes."""
 
 import ast
+import copy
 from typing import TYPE_CHECKING
 
 from rubberize._exceptions import (
@@ -10,6 +11,7 @@ from rubberize._exceptions import (
 from rubberize.config import config
 from rubberize.latexer import displays, formatters, helpers, rules
 from rubberize.latexer.blocks import convert_block
+from rubberize.latexer.render_cache import get_stmt_key, render_cache
 from rubberize.latexer.stmt_latex import StmtLatex
 import rubberize.vendor.ast_comments as ast_c
 
@@ -66,7 +68,7 @@ class StmtVisitor(ast.NodeVisitor):
         else:
             desc, cfg = None, {}
 
-        with config.override(**cfg):
+        with config.override_validated(cfg):
             name = formatters.format_name(node.name, call=True)
             args = self.visit_arguments(node.args)
 
@@ -99,7 +101,7 @@ class StmtVisitor(ast.NodeVisitor):
         if "hide" in cfg:
             return StmtLatex(None, desc)
 
-        with config.override(**cfg):
+        with config.override_validated(cfg):
             if self.ns:
                 special = convert_block(node, self.ns)
                 if special is not None:
@@ -122,7 +124,7 @@ class StmtVisitor(ast.NodeVisitor):
         if "hide" in cfg:
             return StmtLatex(None, desc)
 
-        with config.override(**cfg):
+        with config.override_validated(cfg):
             if self.ns:
                 special = convert_block(node, self.ns)
                 if special is not None:
@@ -156,7 +158,7 @@ class StmtVisitor(ast.NodeVisitor):
             if "hide" in cur_cfg:
                 return StmtLatex(None, cur_desc)
 
-            with config.override(**cur_cfg):
+            with config.override_validated(cur_cfg):
                 test_cond = helpers.get_object(cur.test, self.ns)
 
                 if test_cond is None or not config.show_substitution:
@@ -202,7 +204,7 @@ class StmtVisitor(ast.NodeVisitor):
                 else:
                     orelse_desc, orelse_cfg = None, {}
 
-                with config.override(**orelse_cfg):
+                with config.override_validated(orelse_cfg):
                     orelse_body = self.visit_body(orelse)
 
                 return StmtLatex(None, orelse_desc, orelse_body)
@@ -236,7 +238,7 @@ class StmtVisitor(ast.NodeVisitor):
         if "hide" in cfg:
             return StmtLatex(None, desc)
 
-        with config.override(**cfg):
+        with config.override_validated(cfg):
             if self.ns:
                 special = convert_block(node, self.ns)
                 if special is not None:
@@ -324,7 +326,7 @@ class StmtVisitor(ast.NodeVisitor):
 
         body = helpers.strip_body_comments(node.body)
 
-        with config.override(**cfg):
+        with config.override_validated(cfg):
             name = formatters.format_name(node.name, call=True)
             args = self.visit_arguments(node.args)
 
@@ -349,14 +351,14 @@ class StmtVisitor(ast.NodeVisitor):
                     assert len(cur_orelse) < 2
 
                     if "hide" not in cur_cfg:
-                        with config.override(**cur_cfg):
+                        with config.override_validated(cur_cfg):
                             ret = cur_body[0]
 
                             _, ret_cfg = helpers.get_desc(ret)
 
                             assert ret.value is not None
 
-                            with config.override(**ret_cfg):
+                            with config.override_validated(ret_cfg):
                                 value = displays.definition(ret.value, ns)
                                 sub = displays.substitution(ret.value, ns)
                                 test = displays.definition(cur.test, ns)
@@ -375,7 +377,7 @@ class StmtVisitor(ast.NodeVisitor):
                     _, cur_cfg = helpers.get_desc(cur)
 
                     if "hide" not in cur_cfg:
-                        with config.override(**cur_cfg):
+                        with config.override_validated(cur_cfg):
                             value = displays.definition(cur.value, ns)
                             sub = displays.substitution(cur.value, ns)
 
@@ -441,12 +443,12 @@ class StmtVisitor(ast.NodeVisitor):
             assert len(cur_orelse) < 2
 
             if "hide" not in cur_cfg:
-                with config.override(**cur_cfg):
+                with config.override_validated(cur_cfg):
                     assign = cur_body[0]
 
                     _, assign_cfg = helpers.get_desc(assign)
 
-                    with config.override(**assign_cfg):
+                    with config.override_validated(assign_cfg):
                         if not lhs:
                             lhs = self.visit_assign_targets(assign.targets)
                             if self.ns:
@@ -470,7 +472,7 @@ class StmtVisitor(ast.NodeVisitor):
             _, cur_cfg = helpers.get_desc(cur)
 
             if "hide" not in cur_cfg:
-                with config.override(**cur_cfg):
+                with config.override_validated(cur_cfg):
                     value = displays.definition(cur.value, self.ns)
 
                 defs.append(else_syntax(value))
@@ -506,7 +508,7 @@ class StmtVisitor(ast.NodeVisitor):
             cur_desc, cur_cfg = helpers.get_desc(cur.test)
 
             if "hide" not in cur_cfg:
-                with config.override(**cur_cfg):
+                with config.override_validated(cur_cfg):
                     test = displays.definition(cur.test, self.ns)
                     if_ = "If" if not stmt_latex_body else "Else, if"
 
@@ -527,7 +529,7 @@ class StmtVisitor(ast.NodeVisitor):
                     orelse_desc, orelse_cfg = None, {}
 
                 if "hide" not in orelse_cfg:
-                    with config.override(**orelse_cfg):
+                    with config.override_validated(orelse_cfg):
                         orelse_latex = r"\text{Otherwise:}"
                         orelse_body = self.visit_body(orelse)
 
@@ -547,6 +549,29 @@ class StmtVisitor(ast.NodeVisitor):
 
         return StmtLatex(None, body=stmt_latex_body)
 
+    def visit_cached(self, node: ast.stmt) -> StmtLatex:
+        """Visit a statement, reusing the StmtLatex from a previous
+        render if `config.use_render_cache` is enabled and neither the
+        statement, the config, nor its referenced values have changed.
+        """
+
+        if not config.use_render_cache:
+            return self.visit(node)
+
+        key = get_stmt_key(node, self.ns)
+        if key is None:
+            return self.visit(node)
+
+        # the cached StmtLatex is copied, as callers may modify it
+        cached = render_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        stmt_latex = self.visit(node)
+        render_cache.put(key, copy.deepcopy(stmt_latex))
+
+        return stmt_latex
+
     def visit_body(self, body: list[ast.stmt]) -> list[StmtLatex]:
         """Visit each ast.stmt in an ast.stmt body."""
 
@@ -577,8 +602,8 @@ class StmtVisitor(ast.NodeVisitor):
                 latexes.append(StmtLatex(None, "\n".join(desc_block)))
                 desc_block.clear()
 
-            with config.override(**body_cfg):
-                latexes.append(self.visit(b))
+            with config.override_validated(body_cfg):
+                latexes.append(self.visit_cached(b))
 
         if desc_block:
             latexes.append(StmtLatex(None, "\n".join(desc_block)))
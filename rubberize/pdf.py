@@ -0,0 +1,319 @@
+"""Functions to print HTML pages to PDF with a headless Chromium.
+
+Playwright is optional and imported on first use. The sync API is used
+where possible. Inside a running event loop, as in Jupyter, the async
+API is run with `run_coroutine()`.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from typing import Any, Coroutine, Iterator
+    from playwright.async_api import Browser as AsyncBrowser
+    from playwright.async_api import Playwright as AsyncPlaywright
+    from playwright.sync_api import Browser, Playwright
+
+_T = TypeVar("_T")
+
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def shared_browser() -> Iterator[Browser | None]:
+    """Launch one headless Chromium for all pages of a batch export or
+    build, to be printed with `print_page()`.
+
+    Yields None if the sync Playwright API cannot be used, e.g. when it
+    is not installed or when an event loop is already running, as in
+    Jupyter. Each page is then printed by `html_to_pdf()`, which
+    launches its own browser, unless the caller shares an async
+    browser (see `launch_chromium_async()`).
+    """
+
+    p = None
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from playwright.sync_api import sync_playwright
+
+        p = sync_playwright().start()
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.debug("Sync Playwright unavailable, not sharing a browser")
+
+    if p is None:
+        yield None
+        return
+
+    try:
+        browser = _launch_chromium(p)
+
+        try:
+            yield browser
+        finally:
+            logger.debug("Closing shared browser")
+
+            browser.close()
+    finally:
+        p.stop()
+
+
+def html_to_pdf(
+    path: str | Path, output: str | Path | None, render_timeout: int
+) -> bool:
+    """Export an HTML file to PDF in its own headless Chromium.
+
+    Args:
+        path: The path to the HTML file.
+        output: Optional output path. If None, uses the input path but
+            with file extension changed to .pdf.
+        render_timeout: Maximum time to wait for MathJax and the fonts
+            to finish rendering before printing, in milliseconds.
+
+    Returns:
+        False if the page was printed after the render timeout, and may
+        be incomplete.
+    """
+
+    path = Path(path)
+    output = Path(output) if output else path.with_suffix(".pdf")
+
+    logger.debug("Converting HTML to PDF")
+    logger.debug("  Input HTML: %s", path)
+    logger.debug("  Output PDF: %s", output)
+    logger.debug("  Render timeout: %d ms", render_timeout)
+
+    try:
+        logger.debug("  Attempting synchronous Playwright conversion")
+
+        return _html_to_pdf_sync(path, output, render_timeout)
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.debug("  Sync Playwright failed, falling back to async path")
+
+        return run_coroutine(
+            _html_to_pdf_async(path, output, render_timeout)
+        )
+
+
+def run_coroutine(coro: Coroutine[Any, Any, _T]) -> _T:
+    """Run a coroutine to completion, also when an event loop is already
+    running, as in Jupyter.
+    """
+
+    # only needed here, and slow to import
+    # pylint: disable-next=import-outside-toplevel
+    import asyncio
+
+    if sys.platform.startswith("win"):
+        # fix for windows (probably)
+        asyncio.set_event_loop_policy(
+            asyncio.WindowsSelectorEventLoopPolicy()  # type: ignore
+        )
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    if loop.is_running():
+        logger.debug("  Existing event loop detected")
+
+        # Use nest_asyncio to allow nested loops (e.g. in Jupyter)
+        try:
+            # pylint: disable-next=import-outside-toplevel
+            import nest_asyncio
+        except ImportError as e:
+            coro.close()
+            raise RuntimeError(
+                "Running PDF export inside Jupyter requires nest_asyncio"
+            ) from e
+
+        nest_asyncio.apply()
+
+        new_loop = asyncio.new_event_loop()
+        try:
+            return new_loop.run_until_complete(coro)
+        finally:
+            new_loop.close()
+
+    return loop.run_until_complete(coro)
+
+
+def _html_to_pdf_sync(
+    path: Path, output: str | Path, render_timeout: int
+) -> bool:
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from playwright.sync_api import sync_playwright
+    except ImportError as e:
+        raise RuntimeError("Playwright is required for PDF export") from e
+
+    with sync_playwright() as p:
+        browser = _launch_chromium(p)
+
+        try:
+            return print_page(browser, path, output, render_timeout)
+        finally:
+            logger.debug("    Closing browser")
+
+            browser.close()
+
+
+def _launch_chromium(p: Playwright) -> Browser:
+    try:
+        logger.debug("    Launching headless Chromium")
+
+        return p.chromium.launch(headless=True)
+    except Exception as e:
+        raise RuntimeError(
+            "    No suitable chromium executable found. "
+            "Install using 'playwright install chromium'."
+        ) from e
+
+
+# Resolves to true once MathJax has typeset the page and the fonts are
+# loaded, or to false after the timeout (ms) given as argument. MathJax 3
+# chains every typeset call on startup.promise; MathJax 2, as used by
+# nbconvert, runs queued callbacks after the typesetting before them.
+_RENDER_READY_JS = """
+async (timeout) => {
+    const ready = (async () => {
+        const mathjax = window.MathJax;
+        if (mathjax && mathjax.startup && mathjax.startup.promise) {
+            await mathjax.startup.promise;
+        } else if (mathjax && mathjax.Hub) {
+            await new Promise((resolve) => mathjax.Hub.Queue(resolve));
+        }
+        if (document.fonts) {
+            await document.fonts.ready;
+        }
+        return true;
+    })();
+    const deadline = new Promise((resolve) => {
+        setTimeout(() => resolve(false), timeout);
+    });
+    return Promise.race([ready, deadline]);
+}
+"""
+
+
+def print_page(
+    browser: Browser, path: Path, output: str | Path, render_timeout: int
+) -> bool:
+    """Print an HTML file to PDF in a new page of a running browser. The
+    page has its own browser context, closed with the page.
+
+    Args:
+        browser: The browser, e.g. from `shared_browser()`.
+        path: The path to the HTML file.
+        output: The output path.
+        render_timeout: Maximum time to wait for MathJax and the fonts
+            to finish rendering before printing, in milliseconds.
+
+    Returns:
+        True if the page finished rendering before the timeout.
+    """
+
+    url = f"file:///{path.resolve().as_posix()}"
+
+    logger.debug("    Opening URL: %s", url)
+
+    page = browser.new_page()
+
+    try:
+        page.set_default_timeout(0)  # Large notebooks might load for >30s
+        page.emulate_media(media="print")
+        page.wait_for_timeout(100)
+        page.goto(url, wait_until="networkidle")
+
+        logger.debug(
+            "    Waiting up to %d ms for page rendering", render_timeout
+        )
+
+        ready = bool(page.evaluate(_RENDER_READY_JS, render_timeout))
+        if not ready:
+            logger.debug("    Render timeout reached, printing anyway")
+
+        logger.debug("    Generating PDF")
+
+        page.pdf(path=output, prefer_css_page_size=True, outline=True)
+        return ready
+    finally:
+        page.close()
+
+
+async def _html_to_pdf_async(
+    path: Path, output: str | Path, render_timeout: int
+) -> bool:
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from playwright.async_api import async_playwright
+    except ImportError as e:
+        raise RuntimeError("PDF export requires Playwright") from e
+
+    async with async_playwright() as p:
+        browser = await launch_chromium_async(p)
+
+        try:
+            return await print_page_async(
+                browser, path, output, render_timeout
+            )
+        finally:
+            logger.debug("    Closing browser")
+
+            await browser.close()
+
+
+async def launch_chromium_async(p: AsyncPlaywright) -> AsyncBrowser:
+    """Launch a headless Chromium with the async Playwright API, to be
+    shared by the pages printed with `print_page_async()`.
+    """
+
+    try:
+        logger.debug("    Launching async Chromium instance")
+
+        return await p.chromium.launch(headless=True)
+    except Exception as e:
+        raise RuntimeError(
+            "    No suitable chromium executable found. "
+            "Install using 'playwright install chromium'."
+        ) from e
+
+
+async def print_page_async(
+    browser: AsyncBrowser, path: Path, output: str | Path, render_timeout: int
+) -> bool:
+    """Async version of `print_page()`."""
+
+    url = f"file:///{path.resolve().as_posix()}"
+
+    logger.debug("    Opening URL: %s", url)
+
+    page = await browser.new_page()
+
+    try:
+        page.set_default_timeout(0)  # Large notebooks might load for >30s
+        await page.emulate_media(media="print")
+        await page.wait_for_timeout(100)
+        await page.goto(url, wait_until="networkidle")
+
+        logger.debug(
+            "    Waiting up to %d ms for page rendering", render_timeout
+        )
+
+        ready = bool(await page.evaluate(_RENDER_READY_JS, render_timeout))
+        if not ready:
+            logger.debug("    Render timeout reached, printing anyway")
+
+        logger.debug("    Generating PDF")
+
+        await page.pdf(path=output, prefer_css_page_size=True, outline=True)
+        return ready
+    finally:
+        await page.close()
@@ -2,4 +2,4 @@
 StmtLatex.
 """
 
-from rubberize.render.render import render
+from rubberize.render.render import render, render_markdown
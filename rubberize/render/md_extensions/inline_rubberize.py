@@ -9,7 +9,7 @@ from markdown.inlinepatterns import (
     InlineProcessor,
 )
 
-import rubberize.vendor.ast_comments as ast_c
+from rubberize.latexer.latexer import parse_code
 from rubberize.latexer.stmt_latex import StmtLatex
 
 from rubberize.latexer.visitors import ModVisitor
@@ -26,7 +26,7 @@ class InlineRubberizeProcessor(InlineProcessor):
 
     def handleMatch(self, m, data):
         text = m.group(1).strip()
-        text_ast = ast_c.parse(text)
+        text_ast = parse_code(text)
         text_latex: StmtLatex = ModVisitor(self.ns).visit(text_ast)[0]
 
         text_str = ""
@@ -6,14 +6,7 @@ import re
 import textwrap
 from typing import TYPE_CHECKING
 
-from markdown import markdown
-
-from rubberize.render.md_extensions import (
-    Alert,
-    InlineRubberize,
-    LatexLinebreak,
-    Small,
-)
+from rubberize.latexer.caches import LRUCache
 
 if TYPE_CHECKING:
     from rubberize.latexer.stmt_latex import StmtLatex
@@ -123,8 +116,29 @@ def _html_tag(
     return html
 
 
+# Descriptions without inline code are the same for every namespace, so
+# their HTML is kept for the renders of the same code with other values.
+desc_cache: LRUCache[tuple[str | None, set[str], set[str]]] = LRUCache(
+    maxsize=1024
+)
+
+
 def _desc_html_and_flags(
     desc: str, ns: dict[str, object] | None
+) -> tuple[str | None, set[str], set[str]]:
+    if "{{" in desc:
+        return _build_desc_html_and_flags(desc, ns)
+
+    cached = desc_cache.get(desc)
+    if cached is None:
+        cached = _build_desc_html_and_flags(desc, None)
+        desc_cache.put(desc, cached)
+
+    return cached
+
+
+def _build_desc_html_and_flags(
+    desc: str, ns: dict[str, object] | None
 ) -> tuple[str | None, set[str], set[str]]:
     flag_re = r"(?:(?<=\s)|^)\!(\w[\w_]*)"
     npflag_re = r"(?:(?<=\s)|^)\?(\w[\w_]*)"
@@ -135,7 +149,32 @@ def _desc_html_and_flags(
     npflags = {m.group(1) for m in re.finditer(npflag_re, desc)}
     desc = re.sub(npflag_re, "", desc)
 
-    ext = ["tables", Alert(), InlineRubberize(ns), LatexLinebreak(), Small()]
-    desc = markdown(desc, extensions=ext)
+    desc = render_markdown(desc, ns)
 
     return desc, flags - npflags, npflags
+
+
+def render_markdown(text: str, ns: dict[str, object] | None = None) -> str:
+    """Render Markdown to HTML, with the extensions used for
+    descriptions.
+
+    Args:
+        text: The Markdown text to render.
+        ns: A dictionary of identifier and object pairs, used for code
+            in inline comments.
+    """
+
+    # imported on first use, to keep markdown out of `import rubberize`
+    # pylint: disable-next=import-outside-toplevel
+    from markdown import markdown
+
+    # pylint: disable-next=import-outside-toplevel
+    from rubberize.render.md_extensions import (
+        Alert,
+        InlineRubberize,
+        LatexLinebreak,
+        Small,
+    )
+
+    ext = ["tables", Alert(), InlineRubberize(ns), LatexLinebreak(), Small()]
+    return markdown(text, extensions=ext)
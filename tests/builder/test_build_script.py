@@ -0,0 +1,225 @@
+# pylint: disable=all
+
+import contextlib
+import importlib
+import sys
+import textwrap
+
+import pytest
+
+from rubberize import pdf
+from rubberize._exceptions import RubberizeRuntimeError, RubberizeValueError
+
+build = importlib.import_module("rubberize.builder.build_script")
+
+
+def _script(tmp_path, src, name="calc.py"):
+    path = tmp_path / name
+    path.write_text(textwrap.dedent(src), encoding="utf-8")
+    return path
+
+
+# -----------
+# build_html
+# -----------
+
+
+def test_build_html_renders_tap_chunks(tmp_path):
+    path = _script(
+        tmp_path,
+        """\
+        # %%
+        b = 300  # Width
+
+        A = b * 2
+        """,
+    )
+
+    page = build.build_html(path)
+
+    assert page.startswith("<!DOCTYPE html>")
+    assert "mathjax" in page
+    assert ".jp-RenderedHTMLCommon" in page  # styles.css
+    assert page.count('<div class="jp-RenderedHTMLCommon">') == 2
+    assert r"b = 300" in page
+    assert "Width" in page
+    assert r"A = b \cdot 2 = 300 \times 2 = 600" in page
+
+
+def test_build_html_chunk_kinds(tmp_path):
+    path = _script(
+        tmp_path,
+        """\
+        # %% [markdown]
+        Some **text**.
+
+        # %% py
+        x = 2
+        print("not shown")
+
+        # %% tap @hide
+        y = 1
+
+        # %% tap -g
+        z = x * 3
+        """,
+    )
+
+    page = build.build_html(path)
+
+    assert "<strong>text</strong>" in page
+    assert "not shown" not in page
+    assert "x = 2" not in page
+    assert "y = 1" not in page
+    assert "rz-grid-container" in page
+    assert "= 6" in page
+
+
+def test_build_html_dead_chunk(tmp_path):
+    path = _script(
+        tmp_path,
+        """\
+        # %% tap -d
+        a = undefined
+        """,
+    )
+
+    page = build.build_html(path)
+
+    assert r"a = \mathrm{undefined}" in page
+
+
+def test_build_html_imports_from_script_dir(tmp_path):
+    (tmp_path / "helper_for_build.py").write_text("VALUE = 5\n")
+    path = _script(
+        tmp_path,
+        """\
+        # %% py
+        from helper_for_build import VALUE
+
+        # %%
+        c = VALUE
+        """,
+    )
+
+    assert r"c = \mathrm{VALUE} = 5" in build.build_html(path)
+    assert str(tmp_path) not in sys.path
+
+
+def test_build_html_chunk_error(tmp_path):
+    path = _script(
+        tmp_path,
+        """\
+        # %%
+        a = 1
+
+        # %%
+        b = 1 / 0
+        """,
+    )
+
+    with pytest.raises(RubberizeRuntimeError, match="Chunk 2 of calc.py"):
+        build.build_html(path)
+
+
+def test_build_html_inlines_local_mathjax(tmp_path):
+    path = _script(tmp_path, "# %%\na = 1\n")
+    mathjax = tmp_path / "tex-svg-full.js"
+    mathjax.write_text("window.MathJax = '</script>';", encoding="utf-8")
+
+    page = build.build_html(path, mathjax=mathjax)
+
+    assert "<script>\nwindow.MathJax = '<\\/script>';\n</script>" in page
+    assert "cdn.jsdelivr.net" not in page
+
+
+def test_build_html_mathjax_url(monkeypatch, tmp_path):
+    path = _script(tmp_path, "# %%\na = 1\n")
+    monkeypatch.setenv("RUBBERIZE_MATHJAX", "https://example.com/mj.js")
+
+    page = build.build_html(path)
+
+    assert '<script src="https://example.com/mj.js" async></script>' in page
+
+
+def test_build_html_mathjax_from_env(monkeypatch, tmp_path):
+    path = _script(tmp_path, "# %%\na = 1\n")
+    mathjax = tmp_path / "mj.js"
+    mathjax.write_text("MATHJAX_SOURCE", encoding="utf-8")
+    monkeypatch.setenv("RUBBERIZE_MATHJAX", str(mathjax))
+
+    assert "MATHJAX_SOURCE" in build.build_html(path)
+
+
+def test_build_html_missing_mathjax(tmp_path):
+    path = _script(tmp_path, "# %%\na = 1\n")
+
+    with pytest.raises(RubberizeValueError, match="MathJax script"):
+        build.build_html(path, mathjax=tmp_path / "missing.js")
+
+
+# -------------
+# build_script
+# -------------
+
+
+def test_build_script_html(tmp_path):
+    path = _script(tmp_path, "# %%\na = 1\n")
+
+    build.build_script(path, fmt="html")
+
+    assert "a = 1" in (tmp_path / "calc.html").read_text("utf-8")
+
+
+def test_build_script_pdf(monkeypatch, tmp_path):
+    path = _script(tmp_path, "# %%\na = 1\n")
+    (tmp_path / "calc.html").write_text("previous build", encoding="utf-8")
+    calls = {}
+
+    def fake_html_to_pdf(html_path, output, render_timeout):
+        calls["html"] = html_path.read_text("utf-8")
+        calls["html_path"] = html_path
+        calls["timeout"] = render_timeout
+        output.write_bytes(b"%PDF")
+
+    monkeypatch.setattr(pdf, "html_to_pdf", fake_html_to_pdf)
+
+    build.build_script(path, render_timeout=500)
+
+    assert (tmp_path / "calc.pdf").read_bytes() == b"%PDF"
+    assert (tmp_path / "calc.html").read_text("utf-8") == "previous build"
+    assert "a = 1" in calls["html"]
+    assert not calls["html_path"].exists()
+    assert calls["timeout"] == 500
+
+
+def test_build_script_dir_shares_browser(monkeypatch, tmp_path):
+    src = tmp_path / "scripts"
+    src.mkdir()
+    _script(src, "# %%\na = 1\n", "one.py")
+    _script(src, "# %%\nb = 1 / 0\n", "two.py")
+    _script(src, "# %%\nc = 3\n", "three.py")
+    browser = object()
+    printed = []
+
+    @contextlib.contextmanager
+    def fake_shared_browser():
+        yield browser
+
+    def fake_print_page(b, html_path, output, render_timeout):
+        assert b is browser
+        printed.append(output.name)
+
+    monkeypatch.setattr(pdf, "shared_browser", fake_shared_browser)
+    monkeypatch.setattr(pdf, "print_page", fake_print_page)
+
+    with pytest.raises(RubberizeRuntimeError, match="1 of 3 .* two.py"):
+        build.build_script(src)
+
+    assert printed == ["one.pdf", "three.pdf"]
+    assert (tmp_path / "scripts_pdf").is_dir()
+
+
+def test_build_script_invalid_format(tmp_path):
+    with pytest.raises(RubberizeValueError):
+        build.build_script(tmp_path / "calc.py", fmt="docx")
@@ -19,7 +19,14 @@ def test_export_pdf_default(monkeypatch):
         calls["verbose"] = verbose
 
     def fake_export(
-        input_path, output_path, *, fmt, show_input, render_timeout
+        input_path,
+        output_path,
+        *,
+        fmt,
+        show_input,
+        render_timeout,
+        jobs,
+        force,
     ):
         calls["export"] = (
             input_path,
@@ -37,7 +44,7 @@ def test_export_pdf_default(monkeypatch):
     m.export("notebook.ipynb")
 
     assert calls["verbose"] is False
-    assert calls["export"] == ("notebook.ipynb", None, "pdf", False, 100)
+    assert calls["export"] == ("notebook.ipynb", None, "pdf", False, 10000)
 
 
 def test_export_html(monkeypatch):
@@ -47,7 +54,14 @@ def test_export_html(monkeypatch):
         calls["verbose"] = verbose
 
     def fake_export(
-        input_path, output_path, *, fmt, show_input, render_timeout
+        input_path,
+        output_path,
+        *,
+        fmt,
+        show_input,
+        render_timeout,
+        jobs,
+        force,
     ):
         calls["fmt"] = fmt
 
@@ -68,7 +82,14 @@ def test_export_with_output_path(monkeypatch):
         pass
 
     def fake_export(
-        input_path, output_path, *, fmt, show_input, render_timeout
+        input_path,
+        output_path,
+        *,
+        fmt,
+        show_input,
+        render_timeout,
+        jobs,
+        force,
     ):
         calls["paths"] = (input_path, output_path)
 
@@ -89,7 +110,14 @@ def test_export_show_input(monkeypatch):
         pass
 
     def fake_export(
-        input_path, output_path, *, fmt, show_input, render_timeout
+        input_path,
+        output_path,
+        *,
+        fmt,
+        show_input,
+        render_timeout,
+        jobs,
+        force,
     ):
         calls["show"] = show_input
 
@@ -110,7 +138,14 @@ def test_export_render_timeout(monkeypatch):
         pass
 
     def fake_export(
-        input_path, output_path, *, fmt, show_input, render_timeout
+        input_path,
+        output_path,
+        *,
+        fmt,
+        show_input,
+        render_timeout,
+        jobs,
+        force,
     ):
         calls["timeout"] = render_timeout
 
@@ -124,6 +159,33 @@ def test_export_render_timeout(monkeypatch):
     assert calls["timeout"] == 500
 
 
+def test_export_jobs(monkeypatch):
+    calls = {}
+
+    def fake_export(
+        input_path,
+        output_path,
+        *,
+        fmt,
+        show_input,
+        render_timeout,
+        jobs,
+        force,
+    ):
+        calls["jobs"] = jobs
+
+    monkeypatch.setattr(export, "configure_logger", lambda verbose: None)
+    monkeypatch.setattr(export, "export_notebook", fake_export)
+
+    m = export.ExportMagics(shell=None)
+
+    m.export("nbs --jobs 4")
+    assert calls["jobs"] == 4
+
+    m.export("nbs")
+    assert calls["jobs"] == 1
+
+
 def test_export_verbose(monkeypatch):
     calls = {}
 
@@ -1,13 +1,29 @@
 # pylint: disable=all
 
 import asyncio
+import contextlib
+import json
+import os
 import subprocess
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
 
 import rubberize.jupyter.export_notebook as export
+from rubberize import pdf
+from rubberize._exceptions import RubberizeRuntimeError, RubberizeValueError
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(monkeypatch, tmp_path):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("RUBBERIZE_CACHE_DIR", str(cache_dir))
+    return cache_dir
 
 
 # -----------------
@@ -44,7 +60,7 @@ def test_export_notebook_dispatch_html(monkeypatch):
 def test_export_notebook_dispatch_pdf(monkeypatch):
     called = {}
 
-    def fake(path, output, *, show_input, render_timeout):
+    def fake(path, output, *, show_input, render_timeout, jobs, force):
         called["ok"] = True
 
     monkeypatch.setattr(export, "export_notebook_to_pdf", fake)
@@ -60,6 +76,7 @@ def test_export_notebook_dispatch_pdf(monkeypatch):
 
 
 def test_export_html_requires_jupyter(monkeypatch):
+    monkeypatch.setattr(export, "_html_exporter", lambda show_input: None)
     monkeypatch.setattr(export.shutil, "which", lambda x: None)
 
     with pytest.raises(RuntimeError):
@@ -67,6 +84,7 @@ def test_export_html_requires_jupyter(monkeypatch):
 
 
 def test_export_html_runs_nbconvert(monkeypatch, tmp_path):
+    monkeypatch.setattr(export, "_html_exporter", lambda show_input: None)
     monkeypatch.setattr(export.shutil, "which", lambda x: "/usr/bin/jupyter")
 
     proc = MagicMock()
@@ -92,6 +110,7 @@ def test_export_html_runs_nbconvert(monkeypatch, tmp_path):
 
 
 def test_export_html_failure(monkeypatch, tmp_path):
+    monkeypatch.setattr(export, "_html_exporter", lambda show_input: None)
     monkeypatch.setattr(export.shutil, "which", lambda x: "/usr/bin/jupyter")
 
     proc = MagicMock()
@@ -117,6 +136,77 @@ def test_export_html_failure(monkeypatch, tmp_path):
         export.export_notebook_to_html(nb)
 
 
+class _FakeHTMLExporter:
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.exported = []
+        self.instances.append(self)
+
+    def from_filename(self, filename):
+        self.exported.append(Path(filename).name)
+        return f"<html>{Path(filename).name}</html>", {}
+
+
+@pytest.fixture
+def fake_nbconvert(monkeypatch):
+    module = types.ModuleType("nbconvert")
+    module.HTMLExporter = _FakeHTMLExporter
+    monkeypatch.setitem(sys.modules, "nbconvert", module)
+    monkeypatch.setattr(export, "_html_exporters", {})
+    monkeypatch.setattr(_FakeHTMLExporter, "instances", [])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ran jupyter nbconvert")
+
+    monkeypatch.setattr(subprocess, "Popen", fail)
+
+    return _FakeHTMLExporter
+
+
+def test_export_html_in_process(fake_nbconvert, tmp_path):
+    for name in "ab":
+        export.export_notebook_to_html(tmp_path / f"{name}.ipynb")
+
+    (exporter,) = fake_nbconvert.instances
+    assert exporter.exported == ["a.ipynb", "b.ipynb"]
+    assert exporter.kwargs["exclude_input"]
+    assert (tmp_path / "b.html").read_text() == "<html>b.ipynb</html>"
+
+
+def test_export_html_in_process_per_show_input(fake_nbconvert, tmp_path):
+    nb = tmp_path / "a.ipynb"
+    export.export_notebook_to_html(nb, show_input=True)
+    export.export_notebook_to_html(nb, show_input=False)
+    export.export_notebook_to_html(nb, show_input=True)
+
+    assert [e.kwargs for e in fake_nbconvert.instances] == [
+        {},
+        {
+            "exclude_input": True,
+            "exclude_input_prompt": True,
+            "exclude_output_prompt": True,
+        },
+    ]
+
+
+def test_export_html_in_process_output_suffix(fake_nbconvert, tmp_path):
+    export.export_notebook_to_html(tmp_path / "a.ipynb", tmp_path / "out.htm")
+    assert (tmp_path / "out.html").exists()
+
+
+def test_export_html_falls_back_without_nbconvert(monkeypatch):
+    monkeypatch.setitem(sys.modules, "nbconvert", None)
+    monkeypatch.setattr(export, "_html_exporters", {})
+    monkeypatch.setattr(export.shutil, "which", lambda x: None)
+
+    with pytest.raises(RuntimeError, match="nbconvert is required"):
+        export.export_notebook_to_html("a.ipynb")
+
+    assert export._html_exporters == {False: None}
+
+
 # ----------------------------------------
 # export_notebook_to_pdf directory export
 # ----------------------------------------
@@ -138,13 +228,245 @@ def test_pdf_export_directory(monkeypatch, tmp_path):
         calls.append(output)
 
     monkeypatch.setattr(export, "export_notebook_to_html", fake_html)
-    monkeypatch.setattr(export, "_html_to_pdf", fake_pdf)
+    monkeypatch.setattr(pdf, "html_to_pdf", fake_pdf)
+    monkeypatch.setattr(pdf, "shared_browser", contextlib.nullcontext)
 
     export.export_notebook_to_pdf(d)
 
     assert len(calls) == 2
 
 
+def _fake_sync_playwright(monkeypatch, start_error=None):
+    playwright = MagicMock()
+    if start_error is not None:
+        playwright.start.side_effect = start_error
+
+    module = types.ModuleType("playwright.sync_api")
+    module.sync_playwright = lambda: playwright
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("x"))
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", module)
+
+    return playwright.start.return_value
+
+
+def test_pdf_export_directory_shares_browser(monkeypatch, tmp_path):
+    d = tmp_path / "nbs"
+    d.mkdir()
+
+    for name in "abc":
+        (d / f"{name}.ipynb").write_text("{}")
+
+    def fake_html(nb, tmp, *, show_input):
+        Path(tmp).write_text("<html></html>")
+
+    def fail(*args):
+        raise AssertionError("launched a browser per notebook")
+
+    p = _fake_sync_playwright(monkeypatch)
+    browser = p.chromium.launch.return_value
+
+    monkeypatch.setattr(export, "export_notebook_to_html", fake_html)
+    monkeypatch.setattr(pdf, "html_to_pdf", fail)
+
+    export.export_notebook_to_pdf(d)
+
+    assert p.chromium.launch.call_count == 1
+    assert browser.new_page.call_count == 3
+    assert browser.new_page.return_value.close.call_count == 3
+    assert browser.close.call_count == 1
+    assert p.stop.call_count == 1
+
+
+def test_pdf_export_directory_reports_failures(monkeypatch, tmp_path, caplog):
+    d = tmp_path / "nbs"
+    d.mkdir()
+
+    for name in "abc":
+        (d / f"{name}.ipynb").write_text("{}")
+
+    calls = []
+
+    def fake_html(nb, tmp, *, show_input):
+        if Path(nb).name == "b.ipynb":
+            raise subprocess.CalledProcessError(1, "jupyter")
+        Path(tmp).write_text("<html></html>")
+
+    def fake_pdf(html, output, timeout):
+        calls.append(Path(output).name)
+
+    monkeypatch.setattr(export, "export_notebook_to_html", fake_html)
+    monkeypatch.setattr(pdf, "html_to_pdf", fake_pdf)
+    monkeypatch.setattr(pdf, "shared_browser", contextlib.nullcontext)
+
+    with pytest.raises(RubberizeRuntimeError, match="1 of 3.*b.ipynb"):
+        export.export_notebook_to_pdf(d)
+
+    assert calls == ["a.pdf", "c.pdf"]
+    assert "Export failed: CalledProcessError" in caplog.text
+
+
+def test_pdf_export_rejects_zero_jobs(tmp_path):
+    with pytest.raises(RubberizeValueError):
+        export.export_notebook_to_pdf(tmp_path, jobs=0)
+
+
+# -------------------------------------------------
+# export_notebook_to_pdf parallel directory export
+# -------------------------------------------------
+
+
+class _FakeAsyncPage:
+    def __init__(self, browser):
+        self.browser = browser
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def emulate_media(self, media):
+        pass
+
+    async def wait_for_timeout(self, timeout):
+        await asyncio.sleep(0)
+
+    async def goto(self, url, wait_until):
+        await asyncio.sleep(0.01)
+
+    async def evaluate(self, script, timeout):
+        return True
+
+    async def pdf(self, path, **kwargs):
+        Path(path).write_text("pdf")
+
+    async def close(self):
+        self.browser.open_pages -= 1
+
+
+class _FakeAsyncBrowser:
+    def __init__(self):
+        self.open_pages = 0
+        self.max_open_pages = 0
+        self.closed = False
+
+    async def new_page(self):
+        self.open_pages += 1
+        self.max_open_pages = max(self.max_open_pages, self.open_pages)
+        return _FakeAsyncPage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeAsyncPlaywright:
+    def __init__(self):
+        self.chromium = self
+        self.browser = _FakeAsyncBrowser()
+        self.launches = 0
+
+    async def launch(self, headless):
+        self.launches += 1
+        return self.browser
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+@pytest.fixture
+def parallel_export(monkeypatch, tmp_path):
+    playwright = _FakeAsyncPlaywright()
+    module = types.ModuleType("playwright.async_api")
+    module.async_playwright = lambda: playwright
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("x"))
+    monkeypatch.setitem(sys.modules, "playwright.async_api", module)
+
+    monkeypatch.setattr(export, "_html_pool", ThreadPoolExecutor)
+
+    d = tmp_path / "nbs"
+    d.mkdir()
+    names = [f"nb{i}" for i in range(6)]
+    for name in names:
+        (d / f"{name}.ipynb").write_text(f'{{"name": "{name}"}}')
+
+    def fake_html(nb, tmp, *, show_input):
+        # later notebooks finish first
+        index = names.index(Path(nb).stem)
+        time.sleep(0.01 * (len(names) - index))
+        if index == 2:
+            raise subprocess.CalledProcessError(1, "jupyter")
+        Path(tmp).write_text("<html></html>")
+
+    monkeypatch.setattr(export, "export_notebook_to_html", fake_html)
+
+    return playwright, d, names
+
+
+def test_parallel_export_shares_bounded_pages(parallel_export, tmp_path):
+    playwright, d, names = parallel_export
+
+    with pytest.raises(RubberizeRuntimeError, match="nb2.ipynb"):
+        export.export_notebook_to_pdf(d, jobs=3)
+
+    output = tmp_path / "nbs_pdf"
+    assert playwright.launches == 1
+    assert playwright.browser.closed
+    assert 1 <= playwright.browser.max_open_pages <= 3
+    assert sorted(p.stem for p in output.iterdir()) == [
+        n for n in names if n != "nb2"
+    ]
+
+
+def test_export_in_running_loop_shares_async_browser(
+    parallel_export, monkeypatch, tmp_path
+):
+    playwright, d, names = parallel_export
+    shared = []
+    monkeypatch.setattr(export, "_event_loop_running", lambda: True)
+    monkeypatch.setattr(pdf, "shared_browser", lambda: shared.append(1))
+
+    with pytest.raises(RubberizeRuntimeError, match="nb2.ipynb"):
+        export.export_notebook_to_pdf(d)
+
+    assert not shared
+    assert playwright.launches == 1
+    assert playwright.browser.closed
+    assert playwright.browser.max_open_pages == 1
+    assert len(list((tmp_path / "nbs_pdf").iterdir())) == len(names) - 1
+
+
+def test_event_loop_running():
+    async def check():
+        return export._event_loop_running()
+
+    assert export._event_loop_running() is False
+    assert asyncio.run(check()) is True
+
+
+def test_parallel_export_logs_in_order(parallel_export, caplog):
+    _, d, names = parallel_export
+    caplog.set_level("INFO", logger=export.logger.name)
+
+    with pytest.raises(RubberizeRuntimeError):
+        export.export_notebook_to_pdf(d, jobs=3)
+
+    messages = [
+        r.getMessage()
+        for r in caplog.records
+        if r.getMessage().startswith(("Exporting notebook", "PDF", "  Export"))
+    ]
+    error = subprocess.CalledProcessError(1, "jupyter")
+    expected = []
+    for name in names:
+        expected.append(f"Exporting notebook to PDF: {d / name}.ipynb")
+        if name == "nb2":
+            expected.append(f"  Export failed: CalledProcessError: {error}")
+        else:
+            expected.append(f"PDF saved as: {d.parent / 'nbs_pdf' / name}.pdf")
+
+    assert messages == expected
+
+
 # ----------------------------------------------
 # export_notebook_to_pdf single notebook export
 # ----------------------------------------------
@@ -163,50 +485,225 @@ def test_pdf_single_notebook(monkeypatch, tmp_path):
         calls.append(output)
 
     monkeypatch.setattr(export, "export_notebook_to_html", fake_html)
-    monkeypatch.setattr(export, "_html_to_pdf", fake_pdf)
+    monkeypatch.setattr(pdf, "html_to_pdf", fake_pdf)
 
     export.export_notebook_to_pdf(nb)
 
     assert len(calls) == 1
 
 
-# ----------------------
-# _html_to_pdf fallback
-# ----------------------
+# -------------
+# export cache
+# -------------
 
 
-def test_html_to_pdf_sync_path(monkeypatch, tmp_path):
-    called = {}
+@pytest.fixture
+def counted_export(monkeypatch, tmp_path):
+    nb = tmp_path / "a.ipynb"
+    nb.write_text('{"cells": []}')
+    calls = []
+
+    def fake_html(path, tmp, *, show_input):
+        Path(tmp).write_text("<html></html>")
+
+    def fake_pdf(path, output, timeout):
+        calls.append(timeout)
+        Path(output).write_text(f"pdf {len(calls)}")
+        return timeout > 0
+
+    monkeypatch.setattr(export, "export_notebook_to_html", fake_html)
+    monkeypatch.setattr(pdf, "html_to_pdf", fake_pdf)
+
+    return nb, calls
+
+
+def test_unchanged_notebook_copied_from_cache(counted_export, tmp_path):
+    nb, calls = counted_export
+    output = tmp_path / "a.pdf"
+
+    export.export_notebook_to_pdf(nb)
+    output.unlink()
+    export.export_notebook_to_pdf(nb)
+
+    assert len(calls) == 1
+    assert output.read_text() == "pdf 1"
+
+
+def test_cache_keyed_by_content_and_options(counted_export):
+    nb, calls = counted_export
+
+    export.export_notebook_to_pdf(nb)
+    export.export_notebook_to_pdf(nb, render_timeout=500)
+    nb.write_text('{"cells": [{}]}')
+    export.export_notebook_to_pdf(nb)
+
+    assert calls == [10000, 500, 10000]
+
+
+def test_cache_keyed_by_referenced_files(counted_export, tmp_path):
+    nb, calls = counted_export
+    nb.write_text(
+        json.dumps(
+            {"cells": [{"cell_type": "markdown", "source": ["![](fig.png)"]}]}
+        )
+    )
+    fig = tmp_path / "fig.png"
+
+    export.export_notebook_to_pdf(nb)
+    fig.write_text("v1")
+    export.export_notebook_to_pdf(nb)
+    export.export_notebook_to_pdf(nb)
+    fig.write_text("v2")
+    export.export_notebook_to_pdf(nb)
+
+    assert len(calls) == 3
+
+
+def test_cache_keyed_by_package_versions(counted_export, monkeypatch):
+    nb, calls = counted_export
+
+    export.export_notebook_to_pdf(nb)
+    monkeypatch.setattr(export, "_package_version", lambda name: "99")
+    export.export_notebook_to_pdf(nb)
+
+    assert len(calls) == 2
+
+
+def test_get_resources(tmp_path):
+    nb = {
+        "cells": [
+            {
+                "cell_type": "markdown",
+                "source": "![a](img/a%20b.png 'x') [b](http://x.com) [c](#s)",
+            },
+            {
+                "cell_type": "code",
+                "source": "![d](d.png)",
+                "outputs": [
+                    {"data": {"text/html": "<link href='s.css'>"}},
+                    {"text": "<img src='e.png'>"},
+                ],
+            },
+        ]
+    }
+    path = tmp_path / "a.ipynb"
+
+    resources = export._get_resources(path, json.dumps(nb).encode())
+
+    assert resources == [tmp_path / "img" / "a b.png", tmp_path / "s.css"]
+    assert export._get_resources(path, b"not json") == []
+
+
+def test_force_bypasses_cache(counted_export, tmp_path):
+    nb, calls = counted_export
+
+    export.export_notebook_to_pdf(nb)
+    export.export_notebook_to_pdf(nb, force=True)
+    assert len(calls) == 2
+
+    # the forced export refreshed the cache
+    export.export_notebook_to_pdf(nb)
+    assert (tmp_path / "a.pdf").read_text() == "pdf 2"
+
+
+def test_timed_out_export_not_cached(counted_export, tmp_path):
+    nb, calls = counted_export
+
+    # the fake printer reports a render timeout for a zero timeout
+    export.export_notebook_to_pdf(nb, render_timeout=0)
+    export.export_notebook_to_pdf(nb, render_timeout=0)
+
+    assert len(calls) == 2
+    assert (tmp_path / "a.pdf").read_text() == "pdf 2"
+
+
+def test_cache_write_failure_does_not_fail_export(
+    counted_export, monkeypatch, tmp_path
+):
+    nb, calls = counted_export
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    monkeypatch.setenv("RUBBERIZE_CACHE_DIR", str(blocker / "cache"))
+
+    export.export_notebook_to_pdf(nb)
+    export.export_notebook_to_pdf(nb)
+
+    assert len(calls) == 2
+
+
+def test_cache_pruned_to_max_size(counted_export, monkeypatch, tmp_path):
+    nb, calls = counted_export
+    cache_dir = export._cache_dir()
+    cache_dir.mkdir(parents=True)
+    for i, name in enumerate(["old", "used", "new"]):
+        file = cache_dir / f"{name}.pdf"
+        file.write_text("x" * 10)
+        os.utime(file, (i, i))
+
+    # a copy from the cache marks the export as recently used
+    assert export._copy_from_cache("old", tmp_path / "old.pdf")
+    monkeypatch.setattr(export, "_CACHE_MAX_SIZE", 25)
+
+    export.export_notebook_to_pdf(nb)  # saves a 5 byte PDF
+
+    assert sorted(f.stem for f in cache_dir.iterdir()) == [
+        export._cache_key(nb, "pdf", False, 10000),
+        "new",
+        "old",
+    ]
+
+
+def test_clear_export_cache(counted_export):
+    nb, calls = counted_export
+
+    assert export.clear_export_cache() == 0
+
+    export.export_notebook_to_pdf(nb)
+    assert export.clear_export_cache() == 1
+    assert not any(export._cache_dir().iterdir())
+
+    export.export_notebook_to_pdf(nb)
+    assert len(calls) == 2
 
-    def fake_sync(path, output, timeout):
-        called["sync"] = True
 
-    monkeypatch.setattr(export, "_html_to_pdf_sync", fake_sync)
+def test_parallel_export_uses_cache(parallel_export, monkeypatch):
+    playwright, d, names = parallel_export
+    exported = []
+    fake_html = export.export_notebook_to_html
 
-    html = tmp_path / "a.html"
-    html.write_text("x")
+    def spy(nb, tmp, *, show_input):
+        exported.append(Path(nb).stem)
+        fake_html(nb, tmp, show_input=show_input)
 
-    export._html_to_pdf(html, tmp_path / "a.pdf", 100)
+    monkeypatch.setattr(export, "export_notebook_to_html", spy)
 
-    assert called["sync"]
+    for _ in range(2):
+        with pytest.raises(RubberizeRuntimeError):
+            export.export_notebook_to_pdf(d, jobs=3)
 
+    # only the failed notebook is exported again
+    assert sorted(exported) == sorted(names + ["nb2"])
 
-def test_html_to_pdf_async_fallback(monkeypatch, tmp_path):
-    def fake_sync(*args, **kwargs):
-        raise Exception()
 
-    async def fake_async(path, output, timeout):
-        return
+def test_parallel_export_does_not_cache_timed_out_pages(
+    parallel_export, monkeypatch
+):
+    playwright, d, names = parallel_export
+    exported = []
+    fake_html = export.export_notebook_to_html
 
-    monkeypatch.setattr(export, "_html_to_pdf_sync", fake_sync)
-    monkeypatch.setattr(export, "_html_to_pdf_async", fake_async)
+    def spy(nb, tmp, *, show_input):
+        exported.append(Path(nb).stem)
+        fake_html(nb, tmp, show_input=show_input)
 
-    html = tmp_path / "a.html"
-    html.write_text("x")
+    async def evaluate(self, script, timeout):
+        return False
 
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    monkeypatch.setattr(export, "export_notebook_to_html", spy)
+    monkeypatch.setattr(_FakeAsyncPage, "evaluate", evaluate)
 
-    export._html_to_pdf(html, tmp_path / "a.pdf", 100)
+    for _ in range(2):
+        with pytest.raises(RubberizeRuntimeError):
+            export.export_notebook_to_pdf(d, jobs=3)
 
-    loop.close()
+    assert sorted(exported) == sorted(names * 2)
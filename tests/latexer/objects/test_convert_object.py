@@ -0,0 +1,57 @@
+# pylint: disable=all
+
+import importlib
+
+import pytest
+
+from rubberize.latexer.expr_latex import ExprLatex
+from rubberize.latexer.objects import convert_object, register_object_converter
+
+convert_object_mod = importlib.import_module(
+    "rubberize.latexer.objects.convert_object"
+)
+
+
+class _Base:
+    pass
+
+
+class _Child(_Base):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def _restore_converters():
+    converters = dict(convert_object_mod._object_converters)
+    yield
+    convert_object_mod._object_converters.clear()
+    convert_object_mod._object_converters.update(converters)
+    convert_object_mod._dispatch_cache.clear()
+
+
+# ---------------
+# convert_object
+# ---------------
+
+
+def test_convert_object_resolves_base_converter():
+    register_object_converter(_Base, lambda o: ExprLatex("base"))
+    assert convert_object(_Child()).latex == "base"
+    assert convert_object_mod._dispatch_cache[_Child] is not None
+
+
+def test_convert_object_caches_missing_converter():
+    class Unknown:
+        pass
+
+    assert convert_object(Unknown()) is None
+    assert convert_object_mod._dispatch_cache[Unknown] is None
+
+
+def test_register_invalidates_dispatch_cache():
+    register_object_converter(_Base, lambda o: ExprLatex("base"))
+    assert convert_object(_Child()).latex == "base"
+
+    register_object_converter(_Child, lambda o: ExprLatex("child"))
+    assert convert_object(_Child()).latex == "child"
+    assert convert_object(_Base()).latex == "base"
@@ -0,0 +1,273 @@
+# pylint: disable=all
+
+import importlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rubberize.config import config
+from rubberize.latexer.objects import convert_object
+
+numpy_objects = importlib.import_module(
+    "rubberize.latexer.objects.numpy_objects"
+)
+
+_FLOATS = [
+    0.0,
+    -0.0,
+    1e-13,
+    -1e-13,
+    0.004,
+    0.005,
+    0.0049999,
+    -0.005,
+    0.015,
+    0.025,
+    2.5e-5,
+    -0.5,
+    3.14159,
+    123456.789,
+    -9876543.21,
+    9.99e14,
+    1e15,
+    -1e16,
+    np.inf,
+    -np.inf,
+    np.nan,
+]
+
+
+# --------------------
+# vectorized ndarray
+# --------------------
+
+
+@pytest.mark.parametrize("float_format", ["FIX", "SCI", "GEN", "ENG"])
+@pytest.mark.parametrize("float_prec", [0, 3])
+@pytest.mark.parametrize("thousands_separator", ["", " ", ",", ".", "'"])
+@pytest.mark.parametrize("decimal_marker", [".", ","])
+def test_vectorized_floats_match_elementwise(
+    float_format, float_prec, thousands_separator, decimal_marker
+):
+    arr = np.array(_FLOATS).reshape(3, 7)
+    with config.override(
+        float_format=float_format,
+        float_prec=float_prec,
+        thousands_separator=thousands_separator,
+        decimal_marker=decimal_marker,
+    ):
+        assert numpy_objects._build_vectorized(arr) == numpy_objects._build(arr)
+
+
+@pytest.mark.parametrize("dtype", ["float16", "float32", "float64"])
+def test_vectorized_float_dtypes_match_elementwise(dtype):
+    arr = np.array([0.1, 2.5, -1024.75, 65000.0], dtype=dtype)
+    assert numpy_objects._build_vectorized(arr) == numpy_objects._build(arr)
+
+
+def test_vectorized_honors_zero_float_threshold():
+    arr = np.array([1e-6, -1e-6, 1.0])
+    with config.override(zero_float_threshold=1e-5, float_format="SCI"):
+        result = numpy_objects._build_vectorized(arr)
+        assert result == numpy_objects._build(arr)
+    assert result[0] == result[1] == r"0.00 \times 10^{0}"
+
+
+@pytest.mark.parametrize("dtype", ["int8", "int64", "uint32"])
+def test_vectorized_ints_match_elementwise(dtype):
+    arr = np.array([[0, 1, -12], [123, 1234, 100]]).astype(dtype)
+    assert numpy_objects._build_vectorized(arr) == numpy_objects._build(arr)
+
+
+@pytest.mark.parametrize(
+    "arr",
+    [
+        np.array([True, False]),
+        np.array([1 + 2j]),
+        np.array(["a"]),
+        np.array([], dtype=float),
+    ],
+)
+def test_vectorized_unsupported_returns_none(arr):
+    assert numpy_objects._build_vectorized(arr) is None
+
+
+def test_ndarray_uses_vectorized_path(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("converted elementwise")
+
+    monkeypatch.setattr(numpy_objects, "_build", fail)
+    latex = convert_object(np.array([[1.0, 2.0], [3.0, 4.0]])).latex
+
+    assert r"1.00 & 2.00 \\" in latex
+
+
+# ---------------
+# elided ndarray
+# ---------------
+
+
+def test_elided_matrix():
+    arr = np.arange(30).reshape(6, 5)
+    with config.override(max_array_rows=4, max_array_cols=3):
+        latex = convert_object(arr).latex
+
+    assert r"0 & 1 & \cdots & 4 \\ 5 & 6 & \cdots & 9" in latex
+    assert r"\vdots & \vdots & \ddots & \vdots" in latex
+    assert r"25 & 26 & \cdots & 29" in latex
+    assert "12" not in latex
+
+
+def test_elided_rows_only():
+    arr = np.arange(12).reshape(6, 2)
+    with config.override(max_array_rows=2, max_array_cols=3):
+        latex = convert_object(arr).latex
+
+    assert r"0 & 1 \\ \vdots & \vdots \\ 10 & 11" in latex
+
+
+@pytest.mark.parametrize(
+    "show_1d_as_col, expected",
+    [
+        (True, r"0 \\ 1 \\ \vdots \\ 9"),
+        (False, r"0 & 1 & \cdots & 9"),
+    ],
+)
+def test_elided_1d(show_1d_as_col, expected):
+    with config.override(
+        max_array_rows=3, max_array_cols=3, show_1d_as_col=show_1d_as_col
+    ):
+        assert expected in convert_object(np.arange(10)).latex
+
+
+def test_elided_zero_limit_shows_all():
+    with config.override(max_array_rows=0, max_array_cols=0):
+        latex = convert_object(np.arange(100)).latex
+
+    assert "dots" not in latex
+    assert latex.count(r"\\") == 99
+
+
+def test_elision_off_by_default():
+    latex = convert_object(np.zeros((30, 30))).latex
+    assert "dots" not in latex
+
+
+def test_elided_3d_shows_dots_block():
+    arr = np.arange(27).reshape(3, 3, 3)
+    with config.override(max_array_rows=2, max_array_cols=2):
+        latex = convert_object(arr).latex
+
+    # the hidden submatrices are one block of dots, like the others
+    assert latex.count(r"\begin{bmatrix}") == 4
+    assert r"\vdots & \vdots & \vdots \\ \vdots" in latex
+
+
+def test_elided_never_formats_hidden_elements(monkeypatch):
+    sizes = []
+    build_vectorized = numpy_objects._build_vectorized
+
+    def spy(arr):
+        sizes.append(arr.size)
+        return build_vectorized(arr)
+
+    monkeypatch.setattr(numpy_objects, "_build_vectorized", spy)
+    with config.override(max_array_rows=4, max_array_cols=4):
+        convert_object(np.ones((1000, 1000)))
+
+    assert sizes == [16]
+
+
+# ------------------
+# structured arrays
+# ------------------
+
+_RECORD_DTYPE = [("P_u", "i4"), ("M_x", "f8"), ("load case", "U5")]
+
+
+def test_structured_array_table():
+    arr = np.array([(1, 2.5, "D"), (3, 4.0, "L")], dtype=_RECORD_DTYPE)
+    latex = convert_object(arr).latex
+
+    assert latex.startswith(r"\begin{array}{ccc}")
+    assert r"P_{u} & M_{x} & \text{load case} \\ \hline" in latex
+    assert r"1 & 2.50 & \text{“D”} \\ 3 & 4.00 & \text{“L”}" in latex
+
+
+def test_record_array_same_as_structured():
+    arr = np.array([(1, 2.5, "D")], dtype=_RECORD_DTYPE)
+    rec = arr.view(np.recarray)
+    assert convert_object(rec).latex == convert_object(arr).latex
+
+
+def test_structured_array_elided():
+    dtype = [(f"f{i}", "f8") for i in range(30)]
+    with config.override(max_array_rows=2, max_array_cols=2):
+        latex = convert_object(np.zeros(1000, dtype=dtype)).latex
+
+    assert r"\mathrm{f0} & \cdots & \mathrm{f29} \\ \hline" in latex
+    assert r"\vdots & \ddots & \vdots" in latex
+    assert latex.count(r"\cdots") == 3
+
+
+# ---------------
+# masked arrays
+# ---------------
+
+
+def test_masked_array_blanks():
+    arr = np.ma.array([[1.0, 2.0], [3.0, 4.0]], mask=[[0, 1], [0, 0]])
+    latex = convert_object(arr).latex
+
+    assert r"1.00 &  \\ 3.00 & 4.00" in latex
+    assert "2.00" not in latex
+
+
+def test_masked_array_elided():
+    arr = np.ma.array(np.arange(10), mask=[0] * 9 + [1])
+    with config.override(max_array_rows=4):
+        latex = convert_object(arr).latex
+
+    assert r"0 \\ 1 \\ \vdots \\ 8 \\ " in latex
+
+
+def test_masked_structured_array():
+    arr = np.ma.array(
+        [(1, 2.5, "D"), (3, 4.0, "L")],
+        mask=[(0, 1, 0), (0, 0, 1)],
+        dtype=_RECORD_DTYPE,
+    )
+    latex = convert_object(arr).latex
+
+    assert r"\hline 1 &  & \text{“D”} \\ 3 & 4.00 & " in latex
+
+
+def test_masked_structured_array_2d():
+    arr = np.ma.array(
+        [[(1, 2), (3, 4)]],
+        mask=[[(True, False), (True, True)]],
+        dtype=[("a", "i4"), ("b", "i4")],
+    )
+    latex = convert_object(arr).latex
+
+    # an element is blank only if all of its fields are masked
+    assert latex == r"\begin{bmatrix} \left( 1,\, 2 \right) &  \end{bmatrix}"
+
+
+def test_masked_structured_array_nested_field():
+    arr = np.ma.array(
+        [(1, (1.0, 2.0)), (2, (3.0, 4.0))],
+        mask=[(False, (True, False)), (True, (True, True))],
+        dtype=[("id", "i4"), ("pt", [("x", "f8"), ("y", "f8")])],
+    )
+    latex = convert_object(arr).latex
+
+    # a nested field is blank only if all of its fields are masked
+    assert r"1 & \left( 1.00,\, 2.00 \right) \\  & " in latex
+    assert "3.00" not in latex
+
+
+def test_masked_scalar():
+    assert convert_object(np.ma.masked).latex == ""
+    assert convert_object(np.ma.array(2.0, mask=False)).latex == "2.00"
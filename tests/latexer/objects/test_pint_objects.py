@@ -0,0 +1,94 @@
+# pylint: disable=all
+
+import importlib
+
+import pytest
+
+pint = pytest.importorskip("pint")
+np = pytest.importorskip("numpy")
+
+from rubberize.config import config
+from rubberize.latexer.objects import convert_object
+
+pint_objects = importlib.import_module("rubberize.latexer.objects.pint_objects")
+
+ureg = pint.UnitRegistry()
+
+
+@pytest.fixture(autouse=True)
+def _clear_units_cache():
+    pint_objects.units_latex_cache.clear()
+    yield
+    pint_objects.units_latex_cache.clear()
+
+
+# -----------------
+# units LaTeX cache
+# -----------------
+
+
+def test_units_latex_formatted_once(monkeypatch):
+    q = 2.0 * ureg.kN / ureg.m**2
+    first = convert_object(q).latex
+
+    def fail(*args, **kwargs):
+        raise AssertionError("units formatted again")
+
+    monkeypatch.setattr(pint_objects, "_format_units_latex", fail)
+    assert convert_object(3.0 * ureg.kN / ureg.m**2).latex.endswith(
+        first.split(r"\ ", 1)[1]
+    )
+    assert pint_objects.units_latex_cache.hits == 1
+
+
+def test_units_latex_cache_follows_config():
+    q = 2.0 * ureg.kN / ureg.m**2
+    with config.override(use_inline_units=True):
+        inline = convert_object(q).latex
+    with config.override(use_inline_units=False):
+        frac = convert_object(q).latex
+
+    assert inline == r"2.00\ \mathrm{kN} / \mathrm{m}^{2}"
+    assert r"\frac" in frac
+
+
+def test_register_units_latex_clears_cache(monkeypatch):
+    custom = dict(pint_objects._custom_units_latex)
+    monkeypatch.setattr(pint_objects, "_custom_units_latex", custom)
+
+    q = 1.0 * ureg.kip * ureg.ft
+    convert_object(q)
+    assert len(pint_objects.units_latex_cache) == 1
+
+    latex = r"\mathrm{kip}\text{-}\mathrm{ft}"
+    pint_objects.register_units_latex(latex, kip=1, foot=1)
+    assert len(pint_objects.units_latex_cache) == 0
+    assert convert_object(q).latex == r"1.00\ \mathrm{kip}\text{-}\mathrm{ft}"
+
+
+def test_unit_uses_cache():
+    assert convert_object(ureg.kN).latex == r"\mathrm{kN}"
+    assert convert_object(2 * ureg.kN).latex == r"2\ \mathrm{kN}"
+    assert pint_objects.units_latex_cache.hits == 1
+
+
+# ------------------
+# array magnitudes
+# ------------------
+
+
+def test_array_quantity_units_once():
+    q = np.array([1.0, 2.5]) * ureg.kN
+    latex = convert_object(q).latex
+
+    assert latex.endswith(r"\end{bmatrix}\ \mathrm{kN}")
+    assert latex.count(r"\mathrm{kN}") == 1
+
+
+def test_array_quantity_ignores_fif_units():
+    q = np.array([1.5, 2.0]) * ureg.ft
+    with config.override(use_fif_units=True):
+        latex = convert_object(q).latex
+
+    assert r"1.50 \\ 2.00" in latex
+    assert latex.endswith(r"\ \mathrm{ft}")
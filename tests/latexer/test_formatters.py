@@ -151,6 +151,48 @@ def test_subscripts_disabled():
         assert formatters.format_name("x_y") == r"\mathrm{x\_y}"
 
 
+def test_format_name_cache_hit():
+    formatters.name_cache.clear()
+    first = formatters.format_name("sigma_max")
+    second = formatters.format_name("sigma_max")
+
+    assert first == second == r"\sigma_{\mathrm{max}}"
+    assert formatters.name_cache.hits == 1
+
+
+def test_format_name_cache_keyed_by_call():
+    assert formatters.format_name("f") == "f"
+    assert formatters.format_name("f", call=True) == r"\operatorname{f}"
+
+
+def test_format_name_cache_follows_config():
+    assert formatters.format_name("alpha_x") == r"\alpha_{x}"
+
+    with config.override(use_symbols=False):
+        assert formatters.format_name("alpha_x") == r"\mathrm{alpha}_{x}"
+    with config.override(use_subscripts=False):
+        assert formatters.format_name("alpha_x") == r"\mathrm{\alpha\_x}"
+
+    assert formatters.format_name("betaLoad") == r"\mathrm{betaLoad}"
+    config.add_greek_start("beta")
+    try:
+        assert formatters.format_name("betaLoad") == r"\beta \mathrm{Load}"
+    finally:
+        config.remove_greek_start("beta")
+    assert formatters.format_name("betaLoad") == r"\mathrm{betaLoad}"
+
+
+def test_format_name_cache_kept_across_configs():
+    formatters.name_cache.clear()
+    for _ in range(2):
+        formatters.format_name("alpha_x")
+        with config.override(use_symbols=False):
+            formatters.format_name("alpha_x")
+
+    assert formatters.name_cache.misses == 2
+    assert formatters.name_cache.hits == 2
+
+
 # --------------
 # format_delims
 # --------------
@@ -422,3 +464,49 @@ def test_irregular_nested_array(array):
     expected = formatters.format_delims(prefix, sep.join(rows), suffix)
 
     assert formatters.format_array(array) == expected
+
+
+def _nested_format_delims(array, is_elt=False):
+    # reference layout: format each level with format_delims()
+    if not isinstance(array, list):
+        return array
+
+    elts = [_nested_format_delims(a, is_elt=True) for a in array]
+    if is_elt and all(not isinstance(a, list) for a in array):
+        return rules.ARRAY_ROW_SYNTAX[config.array_delimiter][1].join(elts)
+
+    prefix, sep, suffix = rules.ARRAY_COL_SYNTAX[config.array_delimiter]
+    return formatters.format_delims(prefix, sep.join(elts), suffix)
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        [[["a", "b"], ["c", "d"]], [["e", "f"], ["g", "h"]]],
+        [[[["1"]], [["2", "3"]]], [[["4"], ["5"]]]],
+        [["p\nq", "r"], ["", "s\n\n  t"]],
+        [[["x"]], r"\vdots", [["y"]]],
+        [[], [[]]],
+    ],
+)
+def test_deep_array_matches_nested_delims(array):
+    assert formatters.format_array(array) == _nested_format_delims(array)
+
+
+def test_3d_array_indentation():
+    result = formatters.format_array([[["a", "b"], ["c", "d"]], [["e"]]])
+
+    assert result == dedent(
+        r"""
+        \begin{bmatrix}
+            \begin{bmatrix}
+                a & b \\ c & d
+            \end{bmatrix} \\ \begin{bmatrix} e \end{bmatrix}
+        \end{bmatrix}
+        """
+    ).strip()
+
+
+def test_array_env_replaces_outer_delims():
+    result = formatters.format_array([["a"], ["b"]], env="cases")
+    assert result == "\\begin{cases}\n    a \\\\ b\n\\end{cases}"
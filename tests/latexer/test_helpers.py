@@ -1,5 +1,6 @@
 # pylint: disable=all
 
+from dataclasses import dataclass
 from textwrap import dedent
 
 import ast
@@ -124,9 +125,242 @@ def test_get_object_name_error_returns_none():
 
 def test_get_object_deepcopy_protects_original():
     node = _get_expr_ast("lst.append(3)")
+    helpers.get_object(node, _object_ns)
     assert _object_ns["lst"] == [1, 2]
 
 
+def test_get_object_pure_expr_skips_deepcopy(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("deepcopy called")
+
+    monkeypatch.setattr(helpers.copy, "deepcopy", fail)
+
+    node = _get_expr_ast("lst + [len(lst), abs(-x)]")
+    assert helpers.get_object(node, _object_ns) == [1, 2, 2, 10]
+
+
+def test_get_object_ndarray_ufunc_skips_deepcopy(monkeypatch):
+    np = pytest.importorskip("numpy")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("deepcopy called")
+
+    monkeypatch.setattr(helpers.copy, "deepcopy", fail)
+
+    ns = {"np": np, "a": np.array([1.0, 4.0])}
+    node = _get_expr_ast("np.sqrt(a) * 2")
+    assert helpers.get_object(node, ns).tolist() == [2.0, 4.0]
+
+
+# -------------
+# render_scope
+# -------------
+
+
+def test_render_scope_memoizes_get_object():
+    calls = []
+
+    def f(x):
+        calls.append(x)
+        return x + 1
+
+    ns = {"f": f, "x": 1}
+    node = _get_expr_ast("f(x)")
+
+    with helpers.render_scope():
+        assert helpers.get_object(node, ns) == 2
+        assert helpers.get_object(node, ns) == 2
+    assert len(calls) == 1
+
+    helpers.get_object(node, ns)
+    assert len(calls) == 2
+
+
+def test_render_scope_keyed_by_node_and_ns():
+    node = _get_expr_ast("x * 2")
+    other = _get_expr_ast("x * 2")
+
+    with helpers.render_scope():
+        assert helpers.get_object(node, {"x": 1}) == 2
+        assert helpers.get_object(node, {"x": 2}) == 4
+        assert helpers.get_object(other, {"x": 3}) == 6
+
+
+def test_render_scope_nested_shares_memo():
+    calls = []
+    ns = {"f": lambda: calls.append(1)}
+    node = _get_expr_ast("f()")
+
+    with helpers.render_scope():
+        helpers.get_object(node, ns)
+        with helpers.render_scope():
+            helpers.get_object(node, ns)
+        helpers.get_object(node, ns)
+    assert len(calls) == 1
+
+
+def test_render_evaluates_attribute_once():
+    from rubberize.latexer import latexer
+
+    calls = []
+
+    class Beam:
+        @property
+        def area(self):
+            calls.append(1)
+            return 3.0
+
+    latexer("y = b.area", {"b": Beam(), "y": 3.0})
+    assert len(calls) == 1
+
+
+# -------------
+# compile_expr
+# -------------
+
+
+def test_compile_expr_cached_per_node(monkeypatch):
+    node = _get_expr_ast("x * 2")
+    code = helpers.compile_expr(node)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unparsed")
+
+    monkeypatch.setattr(helpers.ast, "unparse", fail)
+
+    assert helpers.compile_expr(node) is code
+    assert eval(code, {"x": 3}) == 6
+
+
+def test_compile_expr_store_context_falls_back_to_source():
+    node = _get_stmt_ast("a[0] = 1").targets[0]
+    code = helpers.compile_expr(node)
+
+    assert eval(code, {"a": [5]}) == 5
+    assert helpers.compile_expr(_get_stmt_ast("a[0] = 2").targets[0]) is code
+
+
+def test_compile_expr_synthetic_node():
+    node = ast.BinOp(ast.Name("x", ast.Load()), ast.Add(), ast.Constant(1))
+    assert eval(helpers.compile_expr(node), {"x": 1}) == 2
+
+
+# ----------------------------
+# is_immutable / may_mutate
+# ----------------------------
+
+
+@dataclass(frozen=True)
+class FrozenPoint:
+    x: float
+    y: float
+
+
+@dataclass(frozen=True)
+class FrozenHolder:
+    items: list
+
+
+@pytest.mark.parametrize(
+    "obj, expected",
+    [
+        (1, True),
+        (1.5, True),
+        ("a", True),
+        ((1, (2, "b")), True),
+        ((1, [2]), False),
+        (frozenset({1, 2}), True),
+        ([1], False),
+        ({"a": 1}, False),
+        (FrozenPoint(1, 2), True),
+        (FrozenHolder([1]), False),
+        (Dummy(), False),
+    ],
+)
+def test_is_immutable(obj, expected):
+    assert helpers.is_immutable(obj) is expected
+
+
+def test_is_immutable_ndarray():
+    np = pytest.importorskip("numpy")
+
+    a = np.arange(3)
+    assert helpers.is_immutable(a) is False
+    a.flags.writeable = False
+    assert helpers.is_immutable(a) is True
+    assert helpers.is_immutable(np.float64(1.0)) is True
+
+
+@pytest.mark.parametrize(
+    "src, expected",
+    [
+        ("x + y", False),
+        ("lst[0] * 2", False),
+        ("max(x, y)", False),
+        ("math.sqrt(y)", False),
+        ("lst.append(3)", True),
+        ("f(x)", True),
+        ("max(*lst)", False),
+        ("max(**kw)", True),
+        ("(lambda: lst.pop())()", True),
+    ],
+)
+def test_may_mutate(src, expected):
+    import math
+
+    ns = {**_object_ns, "math": math, "f": lambda v: v}
+    assert helpers.may_mutate(_get_expr_ast(src), ns) is expected
+
+
+def test_may_mutate_ufunc_out():
+    np = pytest.importorskip("numpy")
+
+    ns = {"np": np, "a": np.zeros(2)}
+
+    def may_mutate(src):
+        return helpers.may_mutate(_get_expr_ast(src), ns)
+
+    assert may_mutate("np.add(a, 1)") is False
+    assert may_mutate("np.add(a, 1, out=a)") is True
+    assert may_mutate("np.add(a, 1, a)") is True
+    assert may_mutate("np.add(*args)") is True
+    assert may_mutate("np.sqrt(a, a)") is True
+
+
+@pytest.mark.parametrize(
+    "src, expected",
+    [
+        ("sum(gen)", True),
+        ("tuple(x for x in gen)", True),
+        ("max(lst, key=f)", True),
+        ("max(lst, key=lambda v: v)", True),
+        ("round(x, ndigits=y)", False),
+    ],
+)
+def test_may_mutate_builtin_args(src, expected):
+    ns = {**_object_ns, "gen": iter([1, 2]), "f": lambda v: v}
+    assert helpers.may_mutate(_get_expr_ast(src), ns) is expected
+
+
+def test_get_object_does_not_consume_generator():
+    gen = (i for i in range(3))
+    ns = {"gen": gen}
+
+    helpers.get_object(_get_expr_ast("tuple(gen)"), ns)
+
+    assert list(gen) == [0, 1, 2]
+
+
+def test_get_object_ufunc_positional_out_keeps_array():
+    np = pytest.importorskip("numpy")
+
+    ns = {"np": np, "a": np.array([1, 2])}
+    node = _get_expr_ast("np.add(a, 1, a)")
+
+    assert helpers.get_object(node, ns).tolist() == [2, 3]
+    assert ns["a"].tolist() == [1, 2]
+
+
 def test_get_object_module_reference():
     import math
 
@@ -463,6 +697,23 @@ def test_get_operand_type(src, is_left, expected):
     assert result == expected
 
 
+def test_get_operand_type_follows_greek_starts():
+    from rubberize.config import config
+
+    node = _get_expr_ast("betaLoad")
+    latex = r"\beta \mathrm{Load}"
+    assert helpers.get_operand_type(node, latex, is_left=False) == "?"
+
+    with config.override(greek_starts={"beta"}):
+        assert helpers.get_operand_type(node, latex, is_left=False) == "W"
+
+    config.add_greek_start("beta")
+    try:
+        assert helpers.get_operand_type(node, latex, is_left=False) == "W"
+    finally:
+        config.remove_greek_start("beta")
+
+
 # ------------
 # is_str_expr
 # ------------
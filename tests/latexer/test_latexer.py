@@ -0,0 +1,201 @@
+# pylint: disable=all
+
+import importlib
+
+import pytest
+
+from rubberize.latexer.caches import LRUCache
+from rubberize.vendor import ast_comments as ast_c
+
+# the package re-exports the latexer() function under the module's name
+latexer_mod = importlib.import_module("rubberize.latexer.latexer")
+
+
+@pytest.fixture(autouse=True)
+def _clear_parse_cache():
+    latexer_mod.parse_cache.clear()
+    yield
+    latexer_mod.parse_cache.clear()
+
+
+# ---------
+# LRUCache
+# ---------
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache_zero_size_stores_nothing():
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_stats():
+    cache = LRUCache()
+    cache.get("missing")
+    cache.put("a", 1)
+    cache.get("a")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+# -----------
+# parse_code
+# -----------
+
+
+def test_parse_code_hit_skips_parse(monkeypatch):
+    src = "x = 1  # desc\ny = x + 1"
+    first = latexer_mod.parse_code(src)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(ast_c, "parse", fail)
+    second = latexer_mod.parse_code(src)
+
+    assert ast_c.dump(first) == ast_c.dump(second)
+    assert second.body[0].comment.value == "# desc"
+
+
+def test_parse_code_returns_independent_trees():
+    src = "def f(x):\n    '''doc'''\n    return x"
+    first = latexer_mod.parse_code(src)
+    first.body[0].body.clear()
+
+    second = latexer_mod.parse_code(src)
+
+    assert first is not second
+    assert len(second.body[0].body) == 2
+
+
+def test_parse_code_keyed_by_mode():
+    exec_tree = latexer_mod.parse_code("1 + 2")
+    eval_tree = latexer_mod.parse_code("1 + 2", mode="eval")
+
+    assert isinstance(exec_tree, ast_c.Module)
+    assert isinstance(eval_tree, ast_c.Expression)
+
+
+def test_latexer_uses_parse_cache():
+    latexer_mod.latexer("a = 1", None)
+    latexer_mod.latexer("a = 1", None)
+
+    assert latexer_mod.parse_cache.hits == 1
+
+
+# --------------
+# LatexTemplate
+# --------------
+
+_TEMPLATE_CODE = """\
+w_u = 1.2 * w_D + 1.6 * w_L  # Factored load
+M_u = w_u * L**2 / 8
+r = f(M_u, k)
+"""
+
+
+def _ratio(a, b):
+    return a / b
+
+
+def _template_ns(w_D, L, k=2):
+    ns = {"f": _ratio, "w_D": w_D, "w_L": 2.0, "L": L, "k": k}
+    exec(_TEMPLATE_CODE, ns)
+    ns.pop("__builtins__")
+    return ns
+
+
+def test_template_matches_latexer():
+    from rubberize.latexer import LatexTemplate, latexer
+
+    template = LatexTemplate(_TEMPLATE_CODE)
+    for ns in [_template_ns(1.0, 6.0), _template_ns(3, 8.5), None]:
+        assert template.latex(ns) == latexer(_TEMPLATE_CODE, ns)
+
+
+def test_template_reuses_definitions():
+    from rubberize.latexer import LatexTemplate
+
+    template = LatexTemplate(_TEMPLATE_CODE)
+    template.latex(_template_ns(1.0, 6.0))
+    misses = template.definitions.misses
+
+    template.latex(_template_ns(2.0, 7.0))
+
+    assert template.definitions.misses == misses
+    assert template.definitions.hits > 0
+
+
+def test_template_definition_keyed_by_converter_args():
+    from rubberize.latexer import LatexTemplate, latexer
+
+    code = "y = float(k)"
+    template = LatexTemplate(code)
+    template.latex({"k": 2, "y": 2.0})
+    misses = template.definitions.misses
+
+    # float() is converted to its result, so the value of k is part of
+    # the key
+    ns = {"k": 3, "y": 3.0}
+    assert template.latex(ns) == latexer(code, ns)
+    assert template.definitions.misses == misses + 1
+
+
+def test_template_definition_keyed_by_type():
+    from rubberize.latexer import LatexTemplate
+
+    template = LatexTemplate("y = x + 1")
+    template.latex({"x": 1.0, "y": 2.0})
+    misses = template.definitions.misses
+
+    template.latex({"x": 1, "y": 2.0})
+
+    assert template.definitions.misses == misses + 1
+
+
+def test_template_definition_keyed_by_attribute_base():
+    pint = pytest.importorskip("pint")
+    from rubberize.latexer import LatexTemplate, latexer
+
+    ureg = pint.UnitRegistry()
+    code = "u = q.units"
+    template = LatexTemplate(code)
+
+    for q in [5 * ureg.m, 5 * ureg.kN]:
+        ns = {"q": q, "u": q.units}
+        assert template.latex(ns) == latexer(code, ns)
+
+
+def test_template_reuses_pint_definitions():
+    pint = pytest.importorskip("pint")
+    from rubberize.latexer import LatexTemplate, latexer
+
+    ureg = pint.UnitRegistry()
+    code = "L = 5 * ureg.m\nF = w * L"
+    template = LatexTemplate(code)
+
+    for i in range(1, 4):
+        w = i * ureg.kN / ureg.m
+        ns = {"ureg": ureg, "L": 5 * ureg.m, "w": w, "F": w * 5 * ureg.m}
+        assert template.latex(ns) == latexer(code, ns)
+        if i == 1:
+            misses = template.definitions.misses
+
+    # the unit registry is keyed by identity
+    assert template.definitions.misses == misses
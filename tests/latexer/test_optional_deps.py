@@ -0,0 +1,228 @@
+# pylint: disable=all
+
+import subprocess
+import sys
+import textwrap
+import types
+
+import pytest
+
+from rubberize.latexer import helpers, optional_deps
+from rubberize.vendor import ast_comments as ast_c
+
+
+class _Foo:
+    pass
+
+
+def _fake_dependency(**kwargs):
+    dep = optional_deps._OptionalDependency("_rz_fake_pkg", "Foo", **kwargs)
+    module = types.ModuleType("_rz_fake_pkg")
+    module.Foo = _Foo
+    return dep, module
+
+
+def _run(code):
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+# ---------------------
+# _OptionalDependency
+# ---------------------
+
+
+def test_probe_false_until_imported(monkeypatch):
+    dep, module = _fake_dependency()
+
+    assert not dep.is_instance(_Foo(), "Foo")
+    assert dep.module is None
+
+    monkeypatch.setitem(sys.modules, "_rz_fake_pkg", module)
+    assert dep.is_instance(_Foo(), "Foo")
+    assert not dep.is_instance(object(), "Foo")
+
+
+def test_classes_resolved_once(monkeypatch):
+    dep, module = _fake_dependency()
+    monkeypatch.setitem(sys.modules, "_rz_fake_pkg", module)
+
+    assert dep.resolve()
+    monkeypatch.delitem(sys.modules, "_rz_fake_pkg")
+    assert dep.resolve()
+    assert dep.is_instance(_Foo(), "Foo")
+
+
+def test_partially_imported_package_not_resolved(monkeypatch):
+    dep = optional_deps._OptionalDependency("_rz_fake_pkg", "Foo")
+    monkeypatch.setitem(sys.modules, "_rz_fake_pkg", types.ModuleType("x"))
+
+    assert not dep.resolve()
+    assert not dep.is_instance(_Foo(), "Foo")
+
+
+# -------
+# probes
+# -------
+
+
+def test_numpy_probes():
+    np = pytest.importorskip("numpy")
+
+    assert optional_deps.is_ndarray(np.zeros(2))
+    assert optional_deps.is_np_generic(np.float64(1.0))
+    assert optional_deps.is_ufunc(np.sqrt)
+    assert not optional_deps.is_ndarray([1, 2])
+
+
+def test_pint_probes():
+    pint = pytest.importorskip("pint")
+    ureg = pint.UnitRegistry()
+
+    assert optional_deps.is_unit(ureg.m)
+    assert optional_deps.is_quantity(2 * ureg.m)
+    assert optional_deps.is_unit_registry(ureg)
+    assert not optional_deps.is_unit(2 * ureg.m)
+
+
+def test_is_unit_skips_eval_without_pint(monkeypatch):
+    dep = optional_deps._OptionalDependency("_rz_fake_pkg", "Unit")
+    monkeypatch.setattr(optional_deps, "pint", dep)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("evaluated")
+
+    monkeypatch.setattr(helpers, "get_object", fail)
+    node = ast_c.parse("m", mode="eval").body
+
+    assert not helpers.is_unit(node, {"m": 1})
+
+
+# ----------------
+# lazy converters
+# ----------------
+
+
+def test_converters_not_loaded_until_imported(monkeypatch):
+    dep, module = _fake_dependency(converters=("_rz_fake_converters",))
+    converters = types.ModuleType("_rz_fake_converters")
+
+    assert not dep.load_converters()
+    assert not dep.converters_loaded
+
+    monkeypatch.setitem(sys.modules, "_rz_fake_converters", converters)
+    monkeypatch.setitem(sys.modules, "_rz_fake_pkg", module)
+    assert dep.load_converters()
+    assert dep.converters_loaded
+
+
+def test_missing_package_converters_loaded_as_empty():
+    dep, _ = _fake_dependency(converters=("_rz_missing_converters",))
+
+    assert dep.load_converters(import_package=True)
+    assert dep.load_converters()
+
+
+def test_import_rubberize_skips_optional_packages():
+    loaded = _run(
+        """
+        import sys
+        import rubberize
+        for name in ("numpy", "pint", "markdown"):
+            print(name in sys.modules)
+        """
+    )
+    assert loaded == ["False", "False", "False"]
+
+
+def test_numpy_converters_registered_on_first_use():
+    pytest.importorskip("numpy")
+    out = _run(
+        """
+        import sys
+        import numpy as np
+        from rubberize import latexer
+        print("rubberize.latexer.objects.numpy_objects" in sys.modules)
+        latex = latexer("x = np.zeros(2)", {"np": np, "x": np.zeros(2)})
+        print("bmatrix" in latex[0].latex)
+        print("rubberize.latexer.objects.numpy_objects" in sys.modules)
+        """
+    )
+    assert out == ["False", "True", "True"]
+
+
+def test_syntactic_call_without_namespace_loads_converters():
+    pytest.importorskip("numpy")
+    out = _run(
+        """
+        from rubberize import latexer
+        print(latexer("y = np.cross(a, b)", None)[0].latex)
+        """
+    )
+    assert out == ["y", "=", "a", r"\times", "b"]
+
+
+def test_syntactic_call_with_namespace_loads_converters_by_alias():
+    pytest.importorskip("numpy")
+    out = _run(
+        """
+        import sys
+        from rubberize import latexer
+        ns = {"A": 1.0}
+        print(latexer("y = f(A)", ns)[0].latex.count("det"))
+        print("numpy" in sys.modules)
+        latex = latexer("y = np.linalg.det(A)", ns)[0].latex
+        print(latex.startswith(r"y = \\det \\left( A \\right)"))
+        """
+    )
+    assert out == ["0", "False", "True"]
+
+
+def test_load_converters_for_module_in_namespace(monkeypatch):
+    dep, module = _fake_dependency(converters=("_rz_fake_converters",))
+    monkeypatch.setattr(optional_deps, "numpy", dep)
+    imported = []
+    monkeypatch.setattr(
+        optional_deps.importlib, "import_module", imported.append
+    )
+
+    assert not optional_deps.load_converters_for("xp", 1.0)
+    assert not optional_deps.load_converters_for("xp", None)
+    assert optional_deps.load_converters_for("xp", module)
+    assert imported == ["_rz_fake_converters"]
+
+
+def test_user_converters_not_replaced_on_first_use():
+    pytest.importorskip("numpy")
+    out = _run(
+        """
+        import numpy as np
+        from rubberize import (
+            ExprLatex,
+            latexer,
+            register_call_converter,
+            register_object_converter,
+        )
+
+        register_object_converter(np.ndarray, lambda o: ExprLatex("MINE"))
+        register_call_converter(np.cross, lambda v, n: ExprLatex("CROSS"))
+
+        ns = {"np": np, "a": np.ones(3), "b": np.ones(3)}
+        ns["y"] = np.cross(ns["a"], ns["b"])
+        print(latexer("a", ns)[0].latex == "a = MINE")
+        print("CROSS" in latexer("y = np.cross(a, b)", ns)[0].latex)
+        """
+    )
+    assert out == ["True", "True"]
+
+
+def test_register_units_latex_importable():
+    pytest.importorskip("pint")
+    from rubberize import register_units_latex
+
+    assert callable(register_units_latex)
@@ -0,0 +1,142 @@
+# pylint: disable=all
+
+import pytest
+
+from rubberize.config import config
+from rubberize.latexer import latexer
+from rubberize.latexer.render_cache import get_stmt_key, render_cache
+from rubberize.vendor import ast_comments as ast_c
+
+
+@pytest.fixture(autouse=True)
+def _render_cache():
+    render_cache.clear()
+    with config.override(use_render_cache=True):
+        yield
+    render_cache.clear()
+
+
+def _get_stmt_ast(src: str):
+    return ast_c.parse(src).body[0]
+
+
+# -------------
+# get_stmt_key
+# -------------
+
+
+def test_key_changes_with_referenced_value():
+    node = _get_stmt_ast("y = x + 1")
+    assert get_stmt_key(node, {"x": 1}) != get_stmt_key(node, {"x": 2})
+
+
+def test_key_ignores_unreferenced_value():
+    node = _get_stmt_ast("y = x + 1")
+    assert get_stmt_key(node, {"x": 1, "z": 1}) == get_stmt_key(
+        node, {"x": 1, "z": 2}
+    )
+
+
+def test_key_changes_with_mutated_container():
+    node = _get_stmt_ast("y = lst")
+    lst = [1, 2]
+    before = get_stmt_key(node, {"lst": lst})
+    lst.append(3)
+    assert get_stmt_key(node, {"lst": lst}) != before
+
+
+def test_key_changes_with_comment():
+    a = _get_stmt_ast("y = x  # @sci")
+    b = _get_stmt_ast("y = x  # @fix")
+    assert get_stmt_key(a, {"x": 1}) != get_stmt_key(b, {"x": 1})
+
+
+def test_key_changes_with_config():
+    node = _get_stmt_ast("y = x")
+    before = get_stmt_key(node, {"x": 1})
+    with config.override(float_prec=4):
+        assert get_stmt_key(node, {"x": 1}) != before
+
+
+def test_key_changes_with_array_contents():
+    np = pytest.importorskip("numpy")
+    node = _get_stmt_ast("y = arr")
+    arr = np.arange(6.0)
+    before = get_stmt_key(node, {"arr": arr})
+    assert get_stmt_key(node, {"arr": arr.copy()}) == before
+
+    arr[2] = 10
+    assert get_stmt_key(node, {"arr": arr}) != before
+    assert get_stmt_key(node, {"arr": arr.reshape(2, 3)}) != before
+
+
+def test_key_for_unit_registry():
+    pint = pytest.importorskip("pint")
+    ureg = pint.UnitRegistry()
+    node = _get_stmt_ast("L = 5 * ureg.m")
+
+    key = get_stmt_key(node, {"ureg": ureg, "L": 5 * ureg.m})
+
+    assert key is not None
+    assert key == get_stmt_key(node, {"ureg": ureg, "L": 5 * ureg.m})
+    assert key != get_stmt_key(node, {"ureg": ureg, "L": 5 * ureg.ft})
+    other = pint.UnitRegistry()
+    assert key != get_stmt_key(node, {"ureg": other, "L": 5 * other.m})
+
+
+def test_key_none_for_unpicklable_value():
+    node = _get_stmt_ast("y = gen")
+    assert get_stmt_key(node, {"gen": (i for i in range(3))}) is None
+
+
+# ------------------
+# cached rendering
+# ------------------
+
+
+def test_render_cache_hit_returns_same_latex():
+    ns = {"a": 1.5, "b": 2.0}
+    first = latexer("c = a * b", ns)
+    second = latexer("c = a * b", ns)
+
+    assert render_cache.hits == 1
+    assert second[0] == first[0]
+
+
+def test_render_cache_hit_returns_copy():
+    ns = {"a": 1.5}
+    first = latexer("c = a", ns)
+    first[0].latex = "changed"
+    second = latexer("c = a", ns)
+
+    assert render_cache.hits == 1
+    assert second[0].latex != "changed"
+    assert second[0] is not latexer("c = a", ns)[0]
+
+
+def test_render_cache_hit_with_unit_registry():
+    pint = pytest.importorskip("pint")
+    ureg = pint.UnitRegistry()
+    ns = {"ureg": ureg, "L": 5 * ureg.m}
+
+    latexer("L = 5 * ureg.m", ns)
+    latexer("L = 5 * ureg.m", ns)
+
+    assert render_cache.hits == 1
+    assert len(render_cache) == 1
+
+
+def test_render_cache_miss_on_changed_input():
+    first = latexer("c = a * b", {"a": 1.5, "b": 2.0, "c": 3.0})
+    second = latexer("c = a * b", {"a": 2.5, "b": 2.0, "c": 5.0})
+
+    assert render_cache.hits == 0
+    assert first[0].latex != second[0].latex
+
+
+def test_render_cache_disabled_by_default():
+    with config.override(use_render_cache=False):
+        latexer("c = 1", {})
+        latexer("c = 1", {})
+
+    assert len(render_cache) == 0
@@ -0,0 +1,102 @@
+# pylint: disable=all
+
+import importlib
+
+import pytest
+
+from rubberize import latexer, render, render_batch
+from rubberize._exceptions import RubberizeValueError
+from rubberize.config import config
+
+render_mod = importlib.import_module("rubberize.render.render")
+
+_CODE = """\
+A = b * h  # Area
+r = math.sqrt(A)
+"""
+
+
+def _namespaces(n):
+    import math
+
+    namespaces = []
+    for i in range(n):
+        ns = {"math": math, "b": 100 + i, "h": 200.0}
+        exec(_CODE, ns)
+        del ns["__builtins__"], ns["math"]
+        namespaces.append(ns)
+    return namespaces
+
+
+def _expected(namespaces, **kwargs):
+    import math
+
+    results = []
+    for ns in namespaces:
+        ns = {"math": math, **ns}
+        results.append(render(latexer(_CODE, ns), ns, **kwargs))
+    return results
+
+
+# -------------
+# render_batch
+# -------------
+
+
+def test_render_batch_matches_render():
+    namespaces = _namespaces(3)
+
+    htmls = render_batch(_CODE, namespaces, setup="import math")
+
+    assert htmls == _expected(namespaces)
+    assert r"A = b\,h = 100 \times 200.00" in htmls[0]
+    assert r"A = b\,h = 102 \times 200.00" in htmls[2]
+
+
+def test_render_batch_grid():
+    namespaces = _namespaces(2)
+
+    htmls = render_batch(_CODE, namespaces, setup="import math", grid=True)
+
+    assert htmls == _expected(namespaces, grid=True)
+
+
+def test_render_batch_namespace_overrides_setup():
+    htmls = render_batch("x", [{"x": 5}, {}], setup="x = 1")
+
+    assert "5" in htmls[0]
+    assert "1" in htmls[1]
+
+
+def test_render_batch_jobs():
+    namespaces = _namespaces(4)
+
+    with config.override(float_prec=3):
+        expected = _expected(namespaces)
+        htmls = render_batch(_CODE, namespaces, setup="import math", jobs=2)
+
+    assert htmls == expected
+    assert "200.000" in htmls[0]
+
+
+def test_render_batch_reuses_descriptions():
+    render_mod.desc_cache.clear()
+
+    render_batch(_CODE, _namespaces(3), setup="import math")
+
+    assert len(render_mod.desc_cache) == 1
+    assert render_mod.desc_cache.hits == 2
+
+
+def test_render_batch_inline_code_per_namespace():
+    code = "y = 2 * x  # With {{ x }}"
+
+    htmls = render_batch(code, [{"x": 1, "y": 2}, {"x": 5, "y": 10}])
+
+    assert r"With \( \displaystyle x = 1 \)" in htmls[0]
+    assert r"With \( \displaystyle x = 5 \)" in htmls[1]
+
+
+def test_render_batch_invalid_jobs():
+    with pytest.raises(RubberizeValueError):
+        render_batch(_CODE, [], jobs=0)
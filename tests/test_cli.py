@@ -0,0 +1,193 @@
+# pylint: disable=all
+
+import importlib
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+# imported only once a command needs them
+_HEAVY_MODULES = [
+    "IPython",
+    "asyncio",
+    "markdown",
+    "numpy",
+    "pint",
+    "titlecase",
+]
+
+
+def _loaded_modules(code):
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+# --------------
+# startup time
+# --------------
+
+
+def test_export_help_imports_no_heavy_modules():
+    loaded = _loaded_modules(
+        """
+        import sys
+        from rubberize.cli import main
+
+        sys.argv = ["rubberize", "export", "--help"]
+        try:
+            main()
+        except SystemExit:
+            pass
+        print("\\n".join(sys.modules))
+        """
+    )
+
+    assert "usage:" in loaded
+    assert loaded.isdisjoint(_HEAVY_MODULES)
+    assert "rubberize.jupyter.export_notebook" not in loaded
+
+
+def test_export_imports_no_heavy_modules():
+    loaded = _loaded_modules(
+        """
+        import sys
+        import rubberize.jupyter.export_notebook
+
+        print("\\n".join(sys.modules))
+        """
+    )
+
+    assert loaded.isdisjoint(_HEAVY_MODULES)
+
+
+def test_lazy_package_attributes():
+    pytest.importorskip("IPython")
+    import rubberize
+    from rubberize.jupyter.export_notebook import export_notebook
+
+    assert rubberize.export_notebook is export_notebook
+    assert callable(rubberize.load_ipython_extension)
+    assert callable(rubberize.build_script)
+
+    with pytest.raises(AttributeError):
+        rubberize.not_an_attribute
+
+
+# ---------------
+# export command
+# ---------------
+
+
+def test_export_jobs(monkeypatch):
+    import rubberize.jupyter.export_notebook as export
+    from rubberize.cli import main
+
+    calls = {}
+
+    def fake_export(input_path, output_path, **kwargs):
+        calls.update(kwargs, input_path=input_path)
+
+    monkeypatch.setattr(export, "configure_logger", lambda verbose: None)
+    monkeypatch.setattr(export, "export_notebook", fake_export)
+    monkeypatch.setattr(sys, "argv", ["rubberize", "export", "nbs", "-j", "4"])
+
+    main()
+
+    assert calls["input_path"] == "nbs"
+    assert calls["jobs"] == 4
+    assert calls["force"] is False
+
+
+def test_export_force(monkeypatch):
+    import rubberize.jupyter.export_notebook as export
+    from rubberize.cli import main
+
+    calls = {}
+
+    def fake_export(input_path, output_path, **kwargs):
+        calls.update(kwargs)
+
+    monkeypatch.setattr(export, "configure_logger", lambda verbose: None)
+    monkeypatch.setattr(export, "export_notebook", fake_export)
+    monkeypatch.setattr(sys, "argv", ["rubberize", "export", "nbs", "--force"])
+
+    main()
+
+    assert calls["force"] is True
+
+
+def test_export_clear_cache(monkeypatch):
+    import rubberize.jupyter.export_notebook as export
+    from rubberize.cli import main
+
+    calls = []
+
+    monkeypatch.setattr(export, "configure_logger", lambda verbose: None)
+    monkeypatch.setattr(export, "clear_export_cache", lambda: calls.append(1))
+    monkeypatch.setattr(
+        export, "export_notebook", lambda *a, **k: calls.append(2)
+    )
+    monkeypatch.setattr(
+        sys, "argv", ["rubberize", "export", "nbs", "--clear-cache"]
+    )
+
+    main()
+
+    assert calls == [1, 2]
+
+
+# --------------
+# build command
+# --------------
+
+
+def test_build(monkeypatch):
+    build = importlib.import_module("rubberize.builder.build_script")
+    from rubberize.cli import main
+
+    calls = {}
+
+    def fake_build(input_path, output_path, **kwargs):
+        calls.update(kwargs, input_path=input_path, output_path=output_path)
+
+    monkeypatch.setattr(build, "configure_logger", lambda verbose: None)
+    monkeypatch.setattr(build, "build_script", fake_build)
+    monkeypatch.setattr(
+        sys, "argv", ["rubberize", "build", "calc.py", "--to", "html"]
+    )
+
+    main()
+
+    assert calls == {
+        "input_path": "calc.py",
+        "output_path": None,
+        "fmt": "html",
+        "render_timeout": 10000,
+        "mathjax": None,
+    }
+
+
+def test_build_help_imports_no_heavy_modules():
+    loaded = _loaded_modules(
+        """
+        import sys
+        from rubberize.cli import main
+
+        sys.argv = ["rubberize", "build", "--help"]
+        try:
+            main()
+        except SystemExit:
+            pass
+        print("\\n".join(sys.modules))
+        """
+    )
+
+    assert "usage:" in loaded
+    assert loaded.isdisjoint(_HEAVY_MODULES)
+    assert "rubberize.builder.build_script" not in loaded
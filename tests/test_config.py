@@ -0,0 +1,115 @@
+# pylint: disable=all
+
+import pytest
+
+from rubberize._exceptions import (
+    RubberizeAttributeError,
+    RubberizeKeyError,
+    RubberizeTypeError,
+)
+from rubberize.config import config, parse_modifiers
+
+
+# --------
+# version
+# --------
+
+
+def test_version_increases_on_set():
+    before = config.version
+    with config.override(float_prec=4):
+        assert config.version > before
+    assert config.version > before
+
+
+def test_version_increases_on_add_remove():
+    before = config.version
+    config.add_greek_start("beta")
+    config.remove_greek_start("beta")
+    assert config.version == before + 2
+
+
+# ---------
+# snapshot
+# ---------
+
+
+def test_snapshot_is_hashable_and_frozen():
+    snap = config.snapshot()
+    hash(snap)
+
+    values = dict(snap)
+    assert values["float_prec"] == config.float_prec
+    assert values["greek_starts"] == frozenset(config.greek_starts)
+    assert isinstance(values["greek_starts"], frozenset)
+
+
+def test_snapshot_reused_until_change():
+    snap = config.snapshot()
+    assert config.snapshot() is snap
+
+    with config.override(float_prec=5):
+        assert dict(config.snapshot())["float_prec"] == 5
+    assert config.snapshot() == snap
+
+
+def test_snapshot_tracks_add_greek_start():
+    snap = config.snapshot()
+    config.add_greek_start("beta")
+    try:
+        assert config.snapshot() != snap
+    finally:
+        config.remove_greek_start("beta")
+
+
+# ---------
+# override
+# ---------
+
+
+def test_override_restores_values():
+    with config.override(float_prec=6, greek_starts=["beta"]):
+        assert config.float_prec == 6
+        assert config.greek_starts == {"beta"}
+    assert config.float_prec == 2
+    assert config.greek_starts == {"Delta", "gamma", "phi", "psi"}
+
+
+def test_override_validates():
+    with pytest.raises(RubberizeAttributeError):
+        with config.override(foo=1):
+            pass
+    with pytest.raises(RubberizeTypeError):
+        with config.override(greek_starts="beta"):
+            pass
+
+
+def test_override_validated_empty_keeps_version():
+    before = config.version
+    with config.override_validated({}):
+        pass
+    assert config.version == before
+
+
+def test_override_validated_with_parse_modifiers():
+    cfg = parse_modifiers(["@sci", "@4", "greek_starts=['beta']"])
+    with config.override_validated(cfg):
+        assert config.float_format == "SCI"
+        assert config.float_prec == 4
+        assert config.greek_starts == {"beta"}
+    assert config.float_format == "FIX"
+
+
+# ----------------
+# parse_modifiers
+# ----------------
+
+
+def test_parse_modifiers_rejects_invalid_key():
+    with pytest.raises(RubberizeAttributeError):
+        parse_modifiers(["@foo=1"])
+
+
+def test_parse_modifiers_rejects_unknown_keyword():
+    with pytest.raises(RubberizeKeyError):
+        parse_modifiers(["@foo"])
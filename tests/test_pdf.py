@@ -0,0 +1,158 @@
+# pylint: disable=all
+
+import asyncio
+import sys
+import types
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from rubberize import pdf
+
+
+def _fake_sync_playwright(monkeypatch, start_error=None):
+    playwright = MagicMock()
+    if start_error is not None:
+        playwright.start.side_effect = start_error
+
+    module = types.ModuleType("playwright.sync_api")
+    module.sync_playwright = lambda: playwright
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("x"))
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", module)
+
+    return playwright.start.return_value
+
+
+# ---------------
+# shared_browser
+# ---------------
+
+
+def test_shared_browser_none_inside_event_loop(monkeypatch):
+    _fake_sync_playwright(monkeypatch, start_error=Exception("loop running"))
+
+    with pdf.shared_browser() as browser:
+        assert browser is None
+
+
+def test_shared_browser_closed_on_failure(monkeypatch):
+    p = _fake_sync_playwright(monkeypatch)
+
+    with pytest.raises(ValueError):
+        with pdf.shared_browser():
+            raise ValueError()
+
+    assert p.chromium.launch.return_value.close.call_count == 1
+    assert p.stop.call_count == 1
+
+
+# ---------------------
+# html_to_pdf fallback
+# ---------------------
+
+
+def test_html_to_pdf_sync_path(monkeypatch, tmp_path):
+    called = {}
+
+    def fake_sync(path, output, timeout):
+        called["sync"] = True
+        return False
+
+    monkeypatch.setattr(pdf, "_html_to_pdf_sync", fake_sync)
+
+    html = tmp_path / "a.html"
+    html.write_text("x")
+
+    assert pdf.html_to_pdf(html, tmp_path / "a.pdf", 100) is False
+    assert called["sync"]
+
+
+def test_html_to_pdf_async_fallback(monkeypatch, tmp_path):
+    def fake_sync(*args, **kwargs):
+        raise Exception()
+
+    async def fake_async(path, output, timeout):
+        return True
+
+    monkeypatch.setattr(pdf, "_html_to_pdf_sync", fake_sync)
+    monkeypatch.setattr(pdf, "_html_to_pdf_async", fake_async)
+
+    html = tmp_path / "a.html"
+    html.write_text("x")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    assert pdf.html_to_pdf(html, tmp_path / "a.pdf", 100) is True
+
+    loop.close()
+
+
+# ----------------
+# render readiness
+# ----------------
+
+
+class _FakeAsyncPage:
+    def __init__(self):
+        self.evaluated = []
+        self.closed = False
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def emulate_media(self, media):
+        pass
+
+    async def wait_for_timeout(self, timeout):
+        pass
+
+    async def goto(self, url, wait_until):
+        pass
+
+    async def evaluate(self, script, timeout):
+        self.evaluated.append((script, timeout))
+        return True
+
+    async def pdf(self, path, **kwargs):
+        Path(path).write_text("pdf")
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("ready", [True, False])
+def test_print_page_waits_for_render_ready(ready, tmp_path):
+    browser = MagicMock()
+    page = browser.new_page.return_value
+    page.evaluate.return_value = ready
+
+    result = pdf.print_page(
+        browser, tmp_path / "a.html", tmp_path / "a.pdf", 2500
+    )
+
+    assert result is ready
+    page.evaluate.assert_called_once_with(pdf._RENDER_READY_JS, 2500)
+    assert all(c.args != (2500,) for c in page.wait_for_timeout.call_args_list)
+    page.pdf.assert_called_once()
+    page.close.assert_called_once()
+
+
+def test_print_page_async_waits_for_render_ready(tmp_path):
+    page = _FakeAsyncPage()
+
+    async def new_page():
+        return page
+
+    browser = types.SimpleNamespace(new_page=new_page)
+    output = tmp_path / "a.pdf"
+
+    result = asyncio.run(
+        pdf.print_page_async(browser, tmp_path / "a.html", output, 50)
+    )
+
+    assert result is True
+    assert page.evaluated == [(pdf._RENDER_READY_JS, 50)]
+    assert page.closed
+    assert output.read_text() == "pdf"